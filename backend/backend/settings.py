@@ -38,6 +38,10 @@ INSTALLED_APPS = [
 
 # middleware configuration should be done here:
 MIDDLEWARE = [
+    'skill_verifier.middleware.RequestIdMiddleware',
+    'skill_verifier.middleware.ServerTimingMiddleware',
+    'skill_verifier.middleware.CacheGenerationMiddleware',
+    'skill_verifier.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
@@ -71,13 +75,42 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 
 
 #  using sqlite database:
+# SQLite tuned for concurrent request/batch workers: WAL lets readers run alongside the
+# single writer, BEGIN IMMEDIATE takes the write lock up front (instead of failing a
+# read-to-write upgrade), and busy timeout waits for the lock rather than erroring.
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')  # safe with WAL: only the last commits can be lost on power failure
+SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', 20))  # seconds
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 20000))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        # Keep connections (and their pragmas and page cache) across requests
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE};"
+                f"PRAGMA synchronous={SQLITE_SYNCHRONOUS};"
+                f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};"
+                f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB};"
+                "PRAGMA temp_store=MEMORY;"
+            ),
+        },
     }
 }
 
+# Verification inserts go through one writer thread that commits queued inserts
+# together (see skill_verifier/db_writer.py)
+DB_BATCHED_WRITES = os.getenv('DB_BATCHED_WRITES', 'true').lower() == 'true'
+DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', 50))
+DB_WRITE_BATCH_WAIT_MS = float(os.getenv('DB_WRITE_BATCH_WAIT_MS', 0))  # extra wait to grow a group
+
 
 # setting up CORS:
 CORS_ALLOWED_ORIGINS = [
@@ -85,6 +118,9 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:8000"
 ]
 
+# let the frontend read per-stage timings
+CORS_EXPOSE_HEADERS = ['Server-Timing', 'ETag', 'Last-Modified']
+
 
 
 
@@ -128,18 +164,201 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 OPENROUTER_API_KEY = os.getenv('DEEPSEEK_API_KEY')  # Using DEEPSEEK_API_KEY env var for backward compatibility
 
+# Upstream base URLs (overridden by the benchmark suite to point at local stub servers)
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
+
 # GitHub OAuth Configuration
 GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID', '')
 GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET', '')
 GITHUB_REDIRECT_URI = os.getenv('GITHUB_REDIRECT_URI', 'http://localhost:8000/api/auth/github/callback/')
 
+# Secret of the GitHub push/repository webhook (POST /api/webhooks/github/); unset disables it
+GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET', '')
+
+# Values are pickled and zlib-compressed above COMPRESS_MIN_BYTES (see skill_verifier/cache_backend.py).
+# Entries larger than their namespace cap (after compression) are not cached.
+# The cache is per process unless CACHE_DIR is set: then it is kept in files in that
+# directory, shared by all web workers and the prewarm_cache command.
+CACHE_DIR = os.getenv('CACHE_DIR', '')
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'trustchain-cache',
+        'BACKEND': (
+            'skill_verifier.cache_backend.CompressedFileBasedCache' if CACHE_DIR
+            else 'skill_verifier.cache_backend.CompressedLocMemCache'
+        ),
+        'LOCATION': CACHE_DIR or 'trustchain-cache',
+        'OPTIONS': {
+            'COMPRESS_MIN_BYTES': int(os.getenv('CACHE_COMPRESS_MIN_BYTES', 1024)),
+            'COMPRESS_LEVEL': int(os.getenv('CACHE_COMPRESS_LEVEL', 6)),
+            'MAX_ENTRY_BYTES': int(os.getenv('CACHE_MAX_ENTRY_BYTES', 256 * 1024)),
+            # None uses MAX_ENTRY_BYTES
+            'NAMESPACE_MAX_BYTES': {
+                'user_repos': None,
+                'repo_languages': None,
+                'repo_commits': None,
+                'repo_readme': None,
+                'repo_readme_meta': None,
+                'repo_topics': None,
+                'user_info': None,
+                'all_github_data': 1024 * 1024,
+                'account_languages': None,
+                'account_technologies': None,
+                'account_summary': None,
+                'github_username': None,
+                'resume_skills': None,
+                'resume_parsing': None,
+                'github_skills_analysis': None,
+                'verify_skills_llm': None,
+                'fused_skills_verification': None,
+                'full_verification': 512 * 1024,
+                'cache_generation': None,
+            },
+        },
     }
 }
+if CACHE_DIR:
+    # Files kept before culling; FileBasedCache's default of 300 is too few for per-repo entries
+    CACHES['default']['OPTIONS']['MAX_ENTRIES'] = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
 
 # Cache timeouts in seconds
 GITHUB_CACHE_TIMEOUT = 60 * 30  # 30 minutes
-VERIFICATION_CACHE_TIMEOUT = 6
\ No newline at end of file
+# Definitive negative answers: unknown users/repos (404) and repos without a README or commits
+GITHUB_NEGATIVE_CACHE_TIMEOUTS = {
+    'not_found': int(os.getenv('GITHUB_NOT_FOUND_CACHE_TIMEOUT', 60 * 5)),
+    'empty': int(os.getenv('GITHUB_EMPTY_CACHE_TIMEOUT', 60 * 10)),
+}
+# Bytes of README fetched and kept per repository; prompts use the first 500 characters
+GITHUB_README_MAX_BYTES = int(os.getenv('GITHUB_README_MAX_BYTES', 2048))
+# Per-call timeout of GitHub API requests (seconds)
+GITHUB_REQUEST_TIMEOUT = float(os.getenv('GITHUB_REQUEST_TIMEOUT', 10))
+VERIFICATION_CACHE_TIMEOUT = 6
+
+# End-to-end budget of one /api/verify-skills/ request (seconds). Each stage sizes its
+# upstream timeouts from the time left and, when short, returns a reduced result listed
+# in the response's "degraded" sections (see skill_verifier/deadline.py).
+VERIFY_DEADLINE = float(os.getenv('VERIFY_DEADLINE', 60))
+# Seconds each stage leaves for the stages after it
+DEADLINE_STAGE_RESERVES = {
+    'resume_parsing': 30,  # GitHub data + skill analysis + comparison
+    'github_data': 15,     # skill analysis + comparison
+    'github_skills': 8,    # comparison
+}
+# An LLM call is not started with less time than this; local fallbacks are used instead
+DEADLINE_MIN_LLM_SECONDS = 5
+# With less time than this for the GitHub stage, fetch fewer repositories and no READMEs
+DEADLINE_FULL_GITHUB_SECONDS = 20
+DEADLINE_REDUCED_MAX_REPOS = 2
+
+# Admission control for /api/verify-skills/, per worker process (see skill_verifier/admission.py).
+# Bulkhead pools: requests running at once, requests allowed to wait, and seconds they wait
+# before a 503.
+ADMISSION_POOLS = {
+    'verify': {
+        'limit': int(os.getenv('VERIFY_CONCURRENCY', 4)),
+        'queue_size': int(os.getenv('VERIFY_QUEUE_SIZE', 8)),
+        'queue_timeout': float(os.getenv('VERIFY_QUEUE_TIMEOUT', 10)),
+    },
+    # Each batch runs its own GitHub and LLM thread pools (BATCH_*_CONCURRENCY)
+    'batch': {
+        'limit': int(os.getenv('BATCH_CONCURRENCY', 1)),
+        'queue_size': int(os.getenv('BATCH_QUEUE_SIZE', 2)),
+        'queue_timeout': float(os.getenv('BATCH_QUEUE_TIMEOUT', 10)),
+    },
+}
+# Token buckets, (tokens per second, burst): per client address and per API key / bearer token,
+# shared by single and batch verifications
+ADMISSION_THROTTLE_RATES = {
+    'client': (float(os.getenv('VERIFY_CLIENT_RATE', 0.2)), int(os.getenv('VERIFY_CLIENT_BURST', 5))),
+    'api_key': (float(os.getenv('VERIFY_API_KEY_RATE', 0.5)), int(os.getenv('VERIFY_API_KEY_BURST', 10))),
+}
+
+# Browser/CDN max-age for stored verification reads (they never change once created)
+VERIFICATION_HTTP_MAX_AGE = 60 * 60 * 24 * 365
+
+# Reuse a stored verification of the same resume for the same user instead of recomputing it.
+# Max age in seconds (0 disables reuse); optionally also require the user's GitHub repos to be unchanged.
+VERIFICATION_REUSE_MAX_AGE = int(os.getenv('VERIFICATION_REUSE_MAX_AGE', 60 * 60 * 24))
+VERIFICATION_REUSE_CHECK_GITHUB_VERSION = os.getenv('VERIFICATION_REUSE_CHECK_GITHUB_VERSION', 'True').lower() in ('true', '1', 'yes')
+
+# Send GitHub skill extraction and resume verification to the LLM as a single
+# combined prompt instead of two serial calls
+LLM_FUSED_VERIFICATION = os.getenv('LLM_FUSED_VERIFICATION', 'False').lower() in ('true', '1', 'yes')
+
+# Batch verification limits
+BATCH_MAX_ITEMS = 200
+BATCH_MAX_ZIP_BYTES = int(os.getenv('BATCH_MAX_ZIP_BYTES', 100 * 1024 * 1024))  # uncompressed PDFs in resume_zip
+BATCH_GITHUB_CONCURRENCY = 4  # parallel GitHub fetches per batch
+BATCH_LLM_CONCURRENCY = 4  # parallel LLM calls per batch
+
+# Bulk account summary limits
+BULK_SUMMARY_MAX_USERNAMES = 50
+BULK_SUMMARY_CONCURRENCY = 8
+BULK_SUMMARY_TIMEOUT = 60  # seconds before slow users are reported as errors
+
+# Stop starting new bulk GitHub work when fewer requests than this remain in the quota
+GITHUB_RATE_LIMIT_RESERVE = 50
+# prewarm_cache command / login prefetch: account max_repos variants to warm and worker threads
+PREWARM_ACCOUNT_MAX_REPOS = [5, 20]  # defaults of the languages and summary/technologies endpoints
+PREWARM_CONCURRENCY = int(os.getenv('PREWARM_CONCURRENCY', 4))
+# Warm a user's GitHub data and GitHub skill analysis in the background when they log in
+LOGIN_PREFETCH = os.getenv('LOGIN_PREFETCH', 'true').lower() == 'true'
+LOGIN_PREFETCH_WORKERS = int(os.getenv('LOGIN_PREFETCH_WORKERS', 2))
+LOGIN_PREFETCH_MAX_PENDING = 20
+LOGIN_PREFETCH_COOLDOWN = 300  # seconds between prefetches for the same user
+
+# Use the OAuth token of the requester (a bearer JWT issued after GitHub login) for the GitHub
+# calls of their requests; anonymous requests use GITHUB_TOKEN. Tokens are stored encrypted with
+# GITHUB_TOKEN_ENCRYPTION_KEY (a Fernet key) or a key derived from SECRET_KEY. A user's token
+# is set aside for the shared GITHUB_TOKEN once its remaining budget drops below the reserve.
+GITHUB_USE_USER_TOKENS = os.getenv('GITHUB_USE_USER_TOKENS', 'true').lower() == 'true'
+GITHUB_TOKEN_ENCRYPTION_KEY = os.getenv('GITHUB_TOKEN_ENCRYPTION_KEY')
+GITHUB_USER_TOKEN_RESERVE = 10
+
+# Persisted account rollups older than this are refreshed (incrementally) on read
+ACCOUNT_ROLLUP_MAX_AGE = int(os.getenv('ACCOUNT_ROLLUP_MAX_AGE', 60 * 30))
+
+# Logging: one JSON object per line, tagged with the request id.
+# Large payload dumps (GitHub data, LLM results) are only serialized when
+# LOG_PAYLOADS is on, LOG_LEVEL is DEBUG and the request falls in the sample.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_PAYLOADS = os.getenv('LOG_PAYLOADS', 'False').lower() in ('true', '1', 'yes')
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', '0.01'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {
+            '()': 'skill_verifier.log.RequestIdFilter',
+        },
+    },
+    'formatters': {
+        'json': {
+            '()': 'skill_verifier.log.JsonFormatter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'filters': ['request_id'],
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'skill_verifier': {
+            'handlers': ['console'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}
+
+# Request profiling: a sample of requests (or any request sending PROFILING_HEADER,
+# in DEBUG or with PROFILING_TOKEN as its value) is run under cProfile and stored
+# in PROFILING_DIR. Inspect with `python manage.py show_profiles`.
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_HEADER = 'X-Profile'
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_MAX_FILES = 200
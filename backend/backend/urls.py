@@ -3,6 +3,8 @@ from django.contrib import admin
 from django.urls import path,include
 from django.http import JsonResponse
 
+from skill_verifier.views import metrics_view
+
 def api_root(request):
 
     return JsonResponse({
@@ -10,8 +12,11 @@ def api_root(request):
         "version": "1.0.0",
         "endpoints": {
             "admin": "/admin/",
+            "metrics": "/metrics",
             "api": {
                 "verify_skills": "/api/verify-skills/",
+                "verify_hash": "/api/verify-hash/<hash>/",
+                "github_webhook": "/api/webhooks/github/",
                 "documentation": "API endpoints available at /api/"
             }
         },
@@ -22,5 +27,6 @@ def api_root(request):
 urlpatterns = [
     path('', api_root, name='api-root'),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api/', include('skill_verifier.urls')),
 ]
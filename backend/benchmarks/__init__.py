@@ -0,0 +1,9 @@
+"""
+End-to-end benchmark suite for the SkillVerify API.
+
+GitHub and OpenRouter responses are recorded once into fixtures
+(`python -m benchmarks.record`) and replayed from local stub servers with
+configurable latency and error injection (`python -m benchmarks.run`).
+Results are written as JSON and can be diffed with `python -m benchmarks.compare`.
+Run all commands from the backend directory.
+"""
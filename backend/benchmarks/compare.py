@@ -0,0 +1,48 @@
+"""
+Compare two benchmark result files and flag latency regressions.
+
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def _index(report):
+    return {(result['scenario'], result['concurrency']): result for result in report['results']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--metric', default='p95', choices=['p50', 'p95', 'p99', 'mean', 'max'])
+    parser.add_argument('--threshold', type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    old_results, new_results = _index(baseline), _index(candidate)
+
+    print(f"{baseline['revision']} -> {candidate['revision']} ({args.metric})")
+    regressions = 0
+    for key in sorted(set(old_results) & set(new_results)):
+        old, new = old_results[key], new_results[key]
+        old_value, new_value = old['latency_ms'][args.metric], new['latency_ms'][args.metric]
+        change = ((new_value - old_value) / old_value * 100) if old_value else 0.0
+        old_calls = sum(stub['calls'] for stub in old['upstream'].values())
+        new_calls = sum(stub['calls'] for stub in new['upstream'].values())
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{key[0]:<22} c={key[1]:<3} {old_value:>10}ms -> {new_value:>10}ms ({change:+.1f}%)  "
+              f"upstream calls {old_calls} -> {new_calls}  rps {old['throughput_rps']} -> {new['throughput_rps']}{flag}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
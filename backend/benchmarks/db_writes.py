@@ -0,0 +1,136 @@
+"""
+Sustained SkillVerification inserts per second under N concurrent writers.
+
+Each configuration runs in a fresh process against its own throwaway SQLite file,
+writing through the pipeline's store_verification() (insert + skill index rows).
+
+    python -m benchmarks.db_writes --writers 1,4,16 --inserts 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .harness import BACKEND_DIR, configure_django
+
+MODES = {
+    # Default SQLite journaling, one transaction per insert
+    'rollback_journal': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'DB_BATCHED_WRITES': 'false'},
+    'wal': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL', 'DB_BATCHED_WRITES': 'false'},
+    'wal_batched': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL', 'DB_BATCHED_WRITES': 'true'},
+}
+
+SKILLS = ["Python", "Django", "React", "Docker", "PostgreSQL", "Kubernetes", "Go", "Redis", "AWS", "TypeScript"]
+
+
+def _verification_fields(writer, serial):
+    return {
+        'github_username': f"writer-{writer}",
+        'resume_file_name': f"resume-{serial}.pdf",
+        'resume_skills': SKILLS,
+        'github_skills': SKILLS[:7],
+        'verification_result': {
+            'verified_skills': [
+                {'skill': skill, 'evidence': [skill], 'reasoning': "Direct match", 'strength': 7}
+                for skill in SKILLS[:6]
+            ],
+            'unverified_skills': SKILLS[6:],
+            'additional_skills': ["Linux"],
+            'verification_percentage': 60.0,
+            'summary': "Database write benchmark.",
+        },
+        'hash_value': f"{writer:04d}{serial:060d}",
+        'proof_hash': f"{writer:04d}{serial:060d}",
+        'resume_hash': f"{serial:064d}",
+    }
+
+
+def run_child(mode, writers, inserts):
+    """Run one configuration in this process and return its result"""
+    db_dir = tempfile.TemporaryDirectory(prefix='skillverify-dbbench-')
+    configure_django({'SQLITE_PATH': os.path.join(db_dir.name, 'bench.sqlite3'), **MODES[mode]})
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+    from skill_verifier.verification_pipeline import store_verification
+
+    call_command('migrate', verbosity=0)
+    connection.close()
+
+    counts = {'ok': 0, 'locked': 0, 'errors': 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(writers)
+
+    def writer(index):
+        barrier.wait()
+        for serial in range(inserts):
+            try:
+                store_verification(**_verification_fields(index, serial))
+                outcome = 'ok'
+            except OperationalError as e:
+                outcome = 'locked' if 'locked' in str(e) else 'errors'
+            except Exception:
+                outcome = 'errors'
+            with lock:
+                counts[outcome] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    db_dir.cleanup()
+
+    return {
+        'mode': mode,
+        'writers': writers,
+        'inserts': writers * inserts,
+        **counts,
+        'duration_s': round(wall, 3),
+        'inserts_per_s': round(counts['ok'] / wall, 1) if wall else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--writers', default='1,4,16', help="Comma-separated numbers of concurrent writer threads")
+    parser.add_argument('--inserts', type=int, default=200, help="Inserts per writer")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.child, int(args.writers), args.inserts)))
+        return None
+
+    results = []
+    for mode in args.modes.split(','):
+        for writers in [int(level) for level in args.writers.split(',')]:
+            output = subprocess.check_output(
+                [sys.executable, '-m', 'benchmarks.db_writes', '--child', mode,
+                 '--writers', str(writers), '--inserts', str(args.inserts)],
+                cwd=BACKEND_DIR, text=True
+            )
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{mode:<17} writers={writers:<3} ok={result['ok']}/{result['inserts']} "
+                  f"locked={result['locked']} errors={result['errors']} inserts/s={result['inserts_per_s']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# Prompt kinds, matched against the first user message so recorded LLM responses
+# can be replayed after prompt wording or resume content changes. Order matters.
+PROMPT_KINDS = [
+    ('github_username', re.compile(r'Extract the GitHub username', re.I)),
+    ('resume_skills', re.compile(r'Extract all technical skills', re.I)),
+    ('github_skills', re.compile(r'analyzing developer profiles', re.I)),
+    ('fused_verification', re.compile(r'complete two tasks', re.I)),
+    ('verify_skills', re.compile(r'Technical Recruiter', re.I)),
+]
+
+
+def classify_prompt(body):
+    """Return the prompt kind of an OpenRouter chat request body, or None"""
+    try:
+        content = json.loads(body)['messages'][0]['content']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+    for kind, pattern in PROMPT_KINDS:
+        if pattern.search(content):
+            return kind
+    return None
+
+
+def request_key(method, path, query='', accept=None, body=b''):
+    """Exact fixture key for an upstream request"""
+    query = urlencode(sorted(parse_qsl(query)))
+    key = f"{method} {path}"
+    if query:
+        key += f"?{query}"
+    if accept and accept not in ('*/*', 'application/json'):
+        key += f" [{accept}]"
+    if body:
+        key += f" #{hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+class FixtureStore:
+    """Recorded responses of one upstream, keyed by request, plus per-kind aliases"""
+
+    def __init__(self, name, directory=FIXTURES_DIR):
+        self.name = name
+        self.path = Path(directory) / f"{name}.json"
+        self.entries = {}
+        self.aliases = {}
+
+    def exists(self):
+        return self.path.exists()
+
+    def load(self):
+        data = json.loads(self.path.read_text())
+        self.entries = data['entries']
+        self.aliases = data.get('aliases', {})
+        return self
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({'entries': self.entries, 'aliases': self.aliases}, indent=2, sort_keys=True))
+
+    def add(self, key, status, body, content_type='application/json', alias=None):
+        self.entries[key] = {'status': status, 'content_type': content_type, 'body': body}
+        if alias:
+            self.aliases[alias] = key
+
+    def lookup(self, key, alias=None):
+        if key in self.entries:
+            return self.entries[key]
+        if alias and alias in self.aliases:
+            return self.entries[self.aliases[alias]]
+        return None
+
+
+def load_manifest(directory=FIXTURES_DIR):
+    """Users and resume files the fixtures were recorded for"""
+    return json.loads((Path(directory) / 'manifest.json').read_text())
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_resume_pdf(name, github_username, skills):
+    """Build a minimal one-page text PDF that PyPDF2 can extract"""
+    lines = [name, f"https://github.com/{github_username}", "Skills: " + ", ".join(skills)]
+    text_ops = "BT /F1 12 Tf 72 720 Td " + " 0 -18 Td ".join(f"({_pdf_escape(line)}) Tj" for line in lines) + " ET"
+    stream = text_ops.encode('latin-1')
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return pdf
+
+
+def resume_variant(pdf_bytes, serial):
+    """Same resume content with a different content hash (defeats the per-PDF caches)"""
+    return pdf_bytes + f"% variant {serial}\n".encode()
+
+
+SYNTHETIC_SKILLS = ["Python", "Django", "React", "Docker", "PostgreSQL", "Kubernetes"]
+SYNTHETIC_GITHUB_SKILLS = ["Python", "Django", "JavaScript", "React", "Docker", "GitHub Actions"]
+
+
+def _chat_response(content):
+    return json.dumps({'choices': [{'message': {'role': 'assistant', 'content': content}}]})
+
+
+def synthetic_fixtures(users=4, repos_per_user=8):
+    """
+    Generate GitHub and OpenRouter fixtures plus a manifest without network access.
+    Returns (github_store, openrouter_store, manifest, resumes) where resumes maps file name to PDF bytes.
+    """
+    github = FixtureStore('github')
+    openrouter = FixtureStore('openrouter')
+    manifest = {'users': [], 'resumes': []}
+    resumes = {}
+
+    for u in range(users):
+        username = f"bench-user-{u}"
+        manifest['users'].append(username)
+        github.add(request_key('GET', f"/users/{username}"), 200, json.dumps({
+            'id': 1000 + u, 'login': username, 'name': f"Bench User {u}", 'email': None,
+            'avatar_url': f"https://avatars.example/{username}", 'bio': "Benchmark account",
+            'company': None, 'location': None, 'public_repos': repos_per_user,
+            'followers': 10, 'following': 1, 'created_at': "2020-01-01T00:00:00Z",
+        }))
+        repos = []
+        for r in range(repos_per_user):
+            repo = f"project-{r}"
+            repos.append({
+                'name': repo, 'full_name': f"{username}/{repo}", 'description': f"Benchmark project {r}",
+                'stargazers_count': r, 'forks_count': 0, 'language': 'Python',
+                'created_at': "2021-01-01T00:00:00Z", 'updated_at': "2024-01-01T00:00:00Z",
+                'pushed_at': "2024-01-01T00:00:00Z", 'topics': ['django', 'docker'],
+            })
+            base = f"/repos/{username}/{repo}"
+            github.add(request_key('GET', f"{base}/languages"), 200,
+                       json.dumps({'Python': 40000 + r, 'JavaScript': 12000, 'Dockerfile': 300}))
+            github.add(request_key('GET', f"{base}/commits", 'per_page=10'), 200, json.dumps([
+                {'sha': f"{r:04d}{c:036d}", 'commit': {'message': f"Commit {c}",
+                 'author': {'name': username, 'date': "2024-01-01T00:00:00Z"}}}
+                for c in range(10)
+            ]))
+            readme = f"# {repo}\n\nA Django + React service packaged with Docker.\n" + "Details.\n" * 200
+            if r == 0:
+                # A large generated README, to exercise the byte-range fetch
+                readme += "| generated | table |\n" * 20000
+            github.add(request_key('GET', f"{base}/readme", accept='application/vnd.github.raw'),
+                       200, readme, 'application/vnd.github.raw')
+            github.add(request_key('GET', f"{base}/topics", accept='application/vnd.github.mercy-preview+json'),
+                       200, json.dumps({'names': ['django', 'docker']}))
+        github.add(request_key('GET', f"/users/{username}/repos"), 200, json.dumps(repos))
+
+        file_name = f"{username}.pdf"
+        resumes[file_name] = make_resume_pdf(f"Bench User {u}", username, SYNTHETIC_SKILLS)
+        manifest['resumes'].append({'file': file_name, 'github_username': username})
+
+    verification = {
+        'verified_skills': [
+            {'skill': skill, 'evidence': [skill], 'reasoning': "Direct match"}
+            for skill in SYNTHETIC_SKILLS if skill in SYNTHETIC_GITHUB_SKILLS
+        ],
+        'unverified_skills': [skill for skill in SYNTHETIC_SKILLS if skill not in SYNTHETIC_GITHUB_SKILLS],
+        'additional_skills': [skill for skill in SYNTHETIC_GITHUB_SKILLS if skill not in SYNTHETIC_SKILLS],
+        'verification_percentage': 66.7,
+        'summary': "Synthetic benchmark verification.",
+    }
+    responses = {
+        'github_username': "bench-user-0",
+        'resume_skills': json.dumps(SYNTHETIC_SKILLS),
+        'github_skills': json.dumps(SYNTHETIC_GITHUB_SKILLS),
+        'verify_skills': json.dumps(verification),
+        'fused_verification': json.dumps({'github_skills': SYNTHETIC_GITHUB_SKILLS, **verification}),
+    }
+    for kind, content in responses.items():
+        openrouter.add(f"POST /chat/completions <{kind}>", 200, _chat_response(content), alias=f"prompt:{kind}")
+
+    return github, openrouter, manifest, resumes
@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def configure_django(env):
+    """
+    Point Django at the given environment overrides. Settings are read from the
+    environment, so this must run before anything else imports Django settings.
+    """
+    os.environ.update({'LOG_LEVEL': 'WARNING', 'PROFILING_SAMPLE_RATE': '0', **env})
+    # A key must be configured for the analyzer, but the stub never checks it
+    os.environ.setdefault('DEEPSEEK_API_KEY', 'benchmark')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+
+class AppServer:
+    """
+    Boot the Django app in-process on a threaded WSGI server, wired to the stub
+    upstreams and to a throwaway SQLite database.
+    """
+
+    def __init__(self, github_url, openrouter_url, extra_env=None):
+        self.db_dir = tempfile.TemporaryDirectory(prefix='skillverify-bench-')
+        configure_django({
+            'GITHUB_API_URL': github_url,
+            'OPENROUTER_BASE_URL': openrouter_url,
+            'SQLITE_PATH': os.path.join(self.db_dir.name, 'bench.sqlite3'),
+            # Every benchmark request comes from one client: measure the pipeline, not the
+            # admission limits (override with --env to benchmark those)
+            'VERIFY_CLIENT_BURST': '1000000',
+            'VERIFY_CONCURRENCY': '64',
+            'VERIFY_QUEUE_SIZE': '1024',
+            **(extra_env or {}),
+        })
+        self.server = None
+
+    def start(self):
+        import django
+        django.setup()
+
+        from django.core.management import call_command
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+        from django.core.wsgi import get_wsgi_application
+
+        call_command('migrate', verbosity=0)
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler)
+        self.server.set_app(get_wsgi_application())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def clear_cache(self):
+        """Drop cached and persisted derived data so the next scenario starts cold"""
+        from django.core.cache import cache
+        from skill_verifier.models import AccountRollup
+        cache.clear()
+        AccountRollup.objects.all().delete()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        self.db_dir.cleanup()
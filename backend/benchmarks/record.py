@@ -0,0 +1,81 @@
+"""
+Record real GitHub and OpenRouter responses into fixtures, once.
+
+Needs GITHUB_TOKEN and DEEPSEEK_API_KEY in the environment (or .env):
+
+    python -m benchmarks.record --resume path/to/resume.pdf:github-user [--resume ...] [--user extra-user]
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import requests
+
+from .fixtures import FIXTURES_DIR, FixtureStore
+from .harness import AppServer
+from .stubs import StubUpstream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resume', action='append', default=[], metavar='PDF:USERNAME',
+                        help="Resume PDF and the GitHub username it belongs to")
+    parser.add_argument('--user', action='append', default=[], help="Extra GitHub user for the account endpoints")
+    parser.add_argument('--max-repos', type=int, default=20)
+    parser.add_argument('--fixtures', default=str(FIXTURES_DIR))
+    args = parser.parse_args(argv)
+
+    if not args.resume:
+        parser.error("at least one --resume is required")
+
+    fixtures_dir = Path(args.fixtures)
+    (fixtures_dir / 'resumes').mkdir(parents=True, exist_ok=True)
+    github_store = FixtureStore('github', fixtures_dir)
+    openrouter_store = FixtureStore('openrouter', fixtures_dir)
+    github_stub = StubUpstream(github_store, mode='record', target='https://api.github.com').start()
+    openrouter_stub = StubUpstream(openrouter_store, mode='record', target='https://openrouter.ai/api/v1').start()
+    app = AppServer(github_stub.base_url, openrouter_stub.base_url).start()
+
+    manifest = {'users': [], 'resumes': []}
+    try:
+        for item in args.resume:
+            pdf_path, username = item.rsplit(':', 1)
+            pdf_path = Path(pdf_path)
+            shutil.copy(pdf_path, fixtures_dir / 'resumes' / pdf_path.name)
+            manifest['resumes'].append({'file': pdf_path.name, 'github_username': username})
+            if username not in manifest['users']:
+                manifest['users'].append(username)
+            with open(pdf_path, 'rb') as pdf:
+                response = requests.post(
+                    f"{app.base_url}/api/verify-skills/",
+                    files={'resume_pdf': (pdf_path.name, pdf, 'application/pdf')},
+                    data={'github_username': username},
+                    timeout=600,
+                )
+            print(f"verify-skills {pdf_path.name}: {response.status_code}")
+
+        for username in manifest['users'] + [user for user in args.user if user not in manifest['users']]:
+            if username not in manifest['users']:
+                manifest['users'].append(username)
+            for endpoint in ('summary', 'languages', 'technologies'):
+                response = requests.get(
+                    f"{app.base_url}/api/account/{username}/{endpoint}/",
+                    params={'max_repos': args.max_repos},
+                    timeout=600,
+                )
+                print(f"account/{username}/{endpoint}: {response.status_code}")
+    finally:
+        app.stop()
+        github_stub.stop()
+        openrouter_stub.stop()
+
+    github_store.save()
+    openrouter_store.save()
+    (fixtures_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+    print(f"Recorded {len(github_store.entries)} GitHub and {len(openrouter_store.entries)} OpenRouter responses "
+          f"into {fixtures_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+Replay recorded (or synthetic) upstream fixtures and measure the API end to end.
+
+    python -m benchmarks.run --synthetic --concurrency 1,4,16 --requests 40 --latency-ms 50
+"""
+import argparse
+import json
+import math
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from .fixtures import FIXTURES_DIR, FixtureStore, load_manifest, resume_variant, synthetic_fixtures
+from .harness import BACKEND_DIR, AppServer
+from .stubs import StubUpstream
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+SCENARIOS = ['verify_cold', 'verify_warm', 'account_summary', 'account_languages', 'account_technologies']
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def git_revision():
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain'], cwd=BACKEND_DIR, text=True).strip())
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class Benchmark:
+    def __init__(self, app, github_stub, openrouter_stub, manifest, resumes):
+        self.app = app
+        self.stubs = {'github': github_stub, 'openrouter': openrouter_stub}
+        self.manifest = manifest
+        self.resumes = resumes
+        self.serial = 0
+        self.serial_lock = threading.Lock()
+        self.local = threading.local()
+
+    def _session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _next_serial(self):
+        with self.serial_lock:
+            self.serial += 1
+            return self.serial
+
+    def _request(self, scenario, index):
+        session = self._session()
+        if scenario.startswith('verify'):
+            resume = self.manifest['resumes'][index % len(self.manifest['resumes'])]
+            pdf = resume_variant(self.resumes[resume['file']], self._next_serial())
+            return session.post(
+                f"{self.app.base_url}/api/verify-skills/",
+                files={'resume_pdf': (resume['file'], pdf, 'application/pdf')},
+                data={'github_username': resume['github_username']},
+                timeout=600,
+            )
+        username = self.manifest['users'][index % len(self.manifest['users'])]
+        endpoint = scenario.split('_', 1)[1]
+        return session.get(f"{self.app.base_url}/api/account/{username}/{endpoint}/", timeout=600)
+
+    def run_scenario(self, scenario, concurrency, total_requests):
+        if scenario != 'verify_warm':
+            self.app.clear_cache()
+        for stub in self.stubs.values():
+            stub.reset_counters()
+
+        latencies = []
+        statuses = {}
+        lock = threading.Lock()
+
+        def one(index):
+            start = time.perf_counter()
+            try:
+                status = self._request(scenario, index).status_code
+            except requests.RequestException:
+                status = 'error'
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(total_requests)))
+        wall = time.perf_counter() - wall_start
+
+        return {
+            'scenario': scenario,
+            'concurrency': concurrency,
+            'requests': total_requests,
+            'ok': statuses.get('200', 0),
+            'statuses': statuses,
+            'duration_s': round(wall, 3),
+            'throughput_rps': round(total_requests / wall, 2) if wall else None,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 2),
+                'p95': round(percentile(latencies, 95), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'mean': round(sum(latencies) / len(latencies), 2),
+                'max': round(max(latencies), 2),
+            },
+            'upstream': {name: stub.counters() for name, stub in self.stubs.items()},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', action='store_true', help="Use generated fixtures instead of recorded ones")
+    parser.add_argument('--fixtures', default=str(FIXTURES_DIR), help="Directory with recorded fixtures")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', default='1,4,16', help="Comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=40, help="Requests per scenario and concurrency level")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Injected upstream latency")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Extra random upstream latency, up to this much")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of upstream calls failing with 503")
+    parser.add_argument('--github-latency-ms', type=float, help="Override --latency-ms for GitHub only")
+    parser.add_argument('--llm-latency-ms', type=float, help="Override --latency-ms for OpenRouter only")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/<time>_<revision>.json)")
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help="Extra environment for the app, e.g. --env LLM_FUSED_VERIFICATION=true")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        github_store, openrouter_store, manifest, resumes = synthetic_fixtures()
+    else:
+        github_store = FixtureStore('github', args.fixtures).load()
+        openrouter_store = FixtureStore('openrouter', args.fixtures).load()
+        manifest = load_manifest(args.fixtures)
+        resumes = {
+            resume['file']: (Path(args.fixtures) / 'resumes' / resume['file']).read_bytes()
+            for resume in manifest['resumes']
+        }
+
+    github_latency = args.latency_ms if args.github_latency_ms is None else args.github_latency_ms
+    llm_latency = args.latency_ms if args.llm_latency_ms is None else args.llm_latency_ms
+    github_stub = StubUpstream(github_store, latency_ms=github_latency, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, seed=args.seed).start()
+    openrouter_stub = StubUpstream(openrouter_store, latency_ms=llm_latency, jitter_ms=args.jitter_ms,
+                                   error_rate=args.error_rate, seed=args.seed + 1).start()
+
+    extra_env = dict(item.split('=', 1) for item in args.env)
+    app = AppServer(github_stub.base_url, openrouter_stub.base_url, extra_env).start()
+
+    benchmark = Benchmark(app, github_stub, openrouter_stub, manifest, resumes)
+    results = []
+    try:
+        for scenario in args.scenarios.split(','):
+            for concurrency in [int(level) for level in args.concurrency.split(',')]:
+                result = benchmark.run_scenario(scenario, concurrency, args.requests)
+                results.append(result)
+                latency = result['latency_ms']
+                print(f"{scenario:<22} c={concurrency:<3} ok={result['ok']}/{result['requests']} "
+                      f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms "
+                      f"rps={result['throughput_rps']} github={result['upstream']['github']['calls']} "
+                      f"llm={result['upstream']['openrouter']['calls']}")
+    finally:
+        app.stop()
+        github_stub.stop()
+        openrouter_stub.stop()
+
+    revision = git_revision()
+    report = {
+        'revision': revision,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'config': {
+            'fixtures': 'synthetic' if args.synthetic else args.fixtures,
+            'requests': args.requests,
+            'github_latency_ms': github_latency,
+            'llm_latency_ms': llm_latency,
+            'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate,
+            'seed': args.seed,
+            'env': extra_env,
+        },
+        'results': results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{time.strftime('%Y%m%dT%H%M%S')}_{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
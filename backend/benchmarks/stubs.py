@@ -0,0 +1,133 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+from .fixtures import classify_prompt, request_key
+
+_RANGE = re.compile(r'bytes=(\d+)-(\d*)$')
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, content_type, payload = self.server.stub.respond(self.command, self.path, self.headers, body)
+        payload = payload.encode() if isinstance(payload, str) else payload
+        content_range = None
+        match = _RANGE.match(self.headers.get('Range') or '')
+        if status == 200 and match and self.server.stub.mode == 'replay':
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(payload) - 1), len(payload) - 1)
+            if start < len(payload):
+                content_range = f"bytes {start}-{end}/{len(payload)}"
+                status, payload = 206, payload[start:end + 1]
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if content_range:
+            self.send_header('Content-Range', content_range)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class StubUpstream:
+    """
+    Local HTTP server standing in for GitHub or OpenRouter.
+
+    In 'record' mode requests are forwarded to `target` and the responses saved
+    into the fixture store. In 'replay' mode responses come from the store after
+    `latency_ms` (+ up to `jitter_ms`) of delay, and `error_rate` of requests
+    fail with a 503. Unknown requests get a 404 and are counted as misses.
+    Single byte ranges (Range: bytes=a-b) are honoured with a 206 on replay.
+    """
+
+    def __init__(self, store, mode='replay', target=None, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.store = store
+        self.mode = mode
+        self.target = target.rstrip('/') if target else None
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.misses = 0
+        self.injected_errors = 0
+        self.server = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def reset_counters(self):
+        with self.lock:
+            self.calls = self.misses = self.injected_errors = 0
+
+    def counters(self):
+        with self.lock:
+            return {'calls': self.calls, 'misses': self.misses, 'injected_errors': self.injected_errors}
+
+    def respond(self, method, raw_path, headers, body):
+        parts = urlsplit(raw_path)
+        key = request_key(method, parts.path, parts.query, headers.get('Accept'), body)
+        kind = classify_prompt(body) if body else None
+        alias = f"prompt:{kind}" if kind else None
+
+        with self.lock:
+            self.calls += 1
+
+        if self.mode == 'record':
+            return self._record(method, raw_path, headers, body, key, alias)
+
+        delay = self.latency_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        if self.error_rate and self.random.random() < self.error_rate:
+            with self.lock:
+                self.injected_errors += 1
+            return 503, 'application/json', json.dumps({'message': "Injected benchmark error"})
+
+        entry = self.store.lookup(key, alias)
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            return 404, 'application/json', json.dumps({'message': f"Not Found (no fixture for {key})"})
+        return entry['status'], entry['content_type'], entry['body']
+
+    def _record(self, method, raw_path, headers, body, key, alias):
+        forwarded = {
+            name: value for name, value in headers.items()
+            if name.lower() in ('authorization', 'accept', 'content-type', 'http-referer', 'x-title', 'range')
+        }
+        response = requests.request(method, self.target + raw_path, headers=forwarded, data=body or None, timeout=120)
+        content_type = response.headers.get('Content-Type', 'application/json').split(';')[0]
+        with self.lock:
+            self.store.add(key, response.status_code, response.text, content_type, alias=alias)
+        return response.status_code, content_type, response.content
@@ -0,0 +1,152 @@
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import AccountRollup
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_account_rollup_repos_refreshed_total', 'Repositories re-applied to account rollups')
+
+
+def repo_version(repo):
+    """Version of a repository listing entry; changes on every push or edit"""
+    return f"{repo.get('pushed_at')}|{repo.get('updated_at')}"
+
+
+def _apply(rollup, stats, sign):
+    """Add (sign=1) or remove (sign=-1) one repository's contribution to the totals"""
+    for language, bytes_count in (stats.get('languages') or {}).items():
+        rollup.language_bytes[language] = rollup.language_bytes.get(language, 0) + sign * bytes_count
+        rollup.language_repo_counts[language] = rollup.language_repo_counts.get(language, 0) + sign
+        if rollup.language_repo_counts[language] <= 0:
+            del rollup.language_bytes[language]
+            del rollup.language_repo_counts[language]
+    for topic in stats.get('topics') or []:
+        rollup.topic_counts[topic] = rollup.topic_counts.get(topic, 0) + sign
+        if rollup.topic_counts[topic] <= 0:
+            del rollup.topic_counts[topic]
+
+
+def refresh_rollup(github_service, max_repos, rollup=None):
+    """
+    Bring the user's rollup up to date with the current repository listing. Only
+    repositories that were added, removed or changed version since the last refresh
+    are fetched and re-applied; the others keep their stored contribution. Repositories
+    whose fetch failed transiently are left out and retried by the next read.
+    Returns None for a user with no GitHub account.
+    """
+    repos = github_service.get_user_repos()
+    user_info = github_service.get_user_info()
+    if None in github_service.failed_fetches:
+        # The listing or profile is unknown, not empty: keep what is stored
+        logger.warning("Not refreshing account rollup for %s: GitHub listing unavailable", github_service.username)
+        return rollup
+    if user_info is None and not repos:
+        return None
+
+    if rollup is None:
+        rollup = AccountRollup(github_username=github_service.username, max_repos=max_repos)
+    current = {repo.get('name'): repo_version(repo) for repo in repos[:max_repos]}
+
+    changed = 0
+    for name in list(rollup.repo_versions):
+        if current.get(name) != rollup.repo_versions[name]:
+            _apply(rollup, rollup.repo_stats.pop(name, {}), -1)
+            del rollup.repo_versions[name]
+            changed += 1
+    for name, version in current.items():
+        if name not in rollup.repo_versions:
+            repo_data = github_service.collect_repo_data(name, ('languages', 'topics'))
+            if name in github_service.failed_fetches:
+                continue
+            stats = {'languages': repo_data['languages'] or {}, 'topics': repo_data['topics'] or []}
+            _apply(rollup, stats, 1)
+            rollup.repo_stats[name] = stats
+            rollup.repo_versions[name] = version
+            changed += 1
+
+    rollup.user_info = user_info
+    rollup.total_repositories = len(repos)
+    if github_service.failed_fetches:
+        # Stale straight away, so the next read fetches the missing repositories
+        rollup.refreshed_at = datetime.fromtimestamp(0, dt_timezone.utc)
+    else:
+        rollup.refreshed_at = timezone.now()
+    try:
+        with transaction.atomic():
+            rollup.save()
+    except IntegrityError:
+        # A concurrent request created this user's rollup first
+        return AccountRollup.objects.get(github_username=github_service.username, max_repos=max_repos)
+    metrics.inc('skillverify_account_rollup_repos_refreshed_total', value=changed)
+    logger.info("Refreshed account rollup for %s (%d repos changed)", github_service.username, changed)
+    return rollup
+
+
+def get_rollup(github_service, max_repos):
+    """
+    The user's rollup with one indexed query, refreshed incrementally first when it is
+    missing, older than ACCOUNT_ROLLUP_MAX_AGE seconds or caches are being refreshed.
+    """
+    rollup = AccountRollup.objects.filter(github_username=github_service.username, max_repos=max_repos).first()
+    max_age = getattr(settings, 'ACCOUNT_ROLLUP_MAX_AGE', 0)
+    if (rollup is not None and not metrics.refreshing_cache()
+            and rollup.refreshed_at >= timezone.now() - timedelta(seconds=max_age)):
+        return rollup
+    return refresh_rollup(github_service, max_repos, rollup)
+
+
+def expire_rollups(github_username=None):
+    """Make the next read of the user's (or every) rollup refresh it incrementally"""
+    rollups = AccountRollup.objects.all()
+    if github_username:
+        rollups = rollups.filter(github_username__iexact=github_username)
+    rollups.update(refreshed_at=datetime.fromtimestamp(0, dt_timezone.utc))
+
+
+def delete_rollups(github_username):
+    """Drop the user's rollups, so they are rebuilt from scratch"""
+    AccountRollup.objects.filter(github_username__iexact=github_username).delete()
+
+
+def rollup_languages(rollup):
+    total_bytes = sum(rollup.language_bytes.values())
+    languages = {
+        language: {
+            'bytes': bytes_count,
+            'count': rollup.language_repo_counts.get(language, 0),  # Number of repos using this language
+            'percentage': round((bytes_count / total_bytes) * 100, 2) if total_bytes else 0
+        }
+        for language, bytes_count in sorted(rollup.language_bytes.items(), key=lambda x: x[1], reverse=True)
+    }
+    return {
+        'username': rollup.github_username,
+        'total_bytes': total_bytes,
+        'languages': languages,
+        'top_languages': list(languages.keys())[:5],
+        'language_count': len(languages),
+        'repositories_analyzed': len(rollup.repo_versions)
+    }
+
+
+def rollup_technologies(rollup):
+    analysed = len(rollup.repo_versions)
+    technologies = {
+        topic: {
+            'count': count,
+            'percentage': round((count / analysed) * 100, 2) if analysed else 0
+        }
+        for topic, count in sorted(rollup.topic_counts.items(), key=lambda x: x[1], reverse=True)
+    }
+    return {
+        'username': rollup.github_username,
+        'technologies': technologies,
+        'top_technologies': list(technologies.keys())[:10],
+        'technology_count': len(technologies),
+        'repositories_analyzed': analysed
+    }
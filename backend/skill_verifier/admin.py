@@ -1,6 +1,10 @@
 from django.contrib import admin
 
-from skill_verifier.models import SkillVerification
+from skill_verifier.models import AccountRollup, BatchItem, Skill, SkillVerification, VerificationSkill
 
 # Register your models here.
-admin.site.register(SkillVerification)
\ No newline at end of file
+admin.site.register(SkillVerification)
+admin.site.register(BatchItem)
+admin.site.register(Skill)
+admin.site.register(VerificationSkill)
+admin.site.register(AccountRollup)
@@ -0,0 +1,208 @@
+import hashlib
+import math
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+metrics.describe('skillverify_admission_in_flight', 'Requests running in a bulkhead pool')
+metrics.describe('skillverify_admission_queue_depth', 'Requests waiting for a bulkhead slot')
+metrics.describe('skillverify_admission_queue_wait_seconds', 'Time admitted requests waited for a bulkhead slot')
+metrics.describe('skillverify_admission_rejected_total', 'Requests rejected by admission control, by pool and reason')
+
+# Admission state is per worker process, like the metrics: limits apply to each worker.
+
+
+class AdmissionRejected(Exception):
+    """The request was not admitted; retry after `retry_after` seconds"""
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """
+    At most `limit` requests of a pool run at once; up to `queue_size` more wait up to
+    `queue_timeout` seconds for a slot. Anything else is rejected straight away, so an
+    overloaded pool answers fast instead of tying up the workers other endpoints need.
+    """
+
+    def __init__(self, name, limit, queue_size, queue_timeout):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        # Moving average of how long an admitted request holds its slot, for Retry-After
+        self.average_seconds = 1.0
+        self._condition = threading.Condition()
+
+    def _retry_after(self):
+        return max(1, math.ceil(self.average_seconds * (self.waiting + 1) / self.limit))
+
+    def _reject(self, reason, message):
+        metrics.inc('skillverify_admission_rejected_total', {'pool': self.name, 'reason': reason})
+        raise AdmissionRejected(message, self._retry_after())
+
+    def _publish(self):
+        metrics.set_gauge('skillverify_admission_in_flight', self.active, {'pool': self.name})
+        metrics.set_gauge('skillverify_admission_queue_depth', self.waiting, {'pool': self.name})
+
+    @contextmanager
+    def admit(self):
+        """Hold a slot for the block; raises AdmissionRejected when the queue is full or the wait times out"""
+        start = time.monotonic()
+        with self._condition:
+            if self.active >= self.limit:
+                if self.waiting >= self.queue_size:
+                    self._reject('queue_full', "Server is busy, please retry later")
+                self.waiting += 1
+                self._publish()
+                try:
+                    expires = start + self.queue_timeout
+                    while self.active >= self.limit:
+                        left = expires - time.monotonic()
+                        if left <= 0:
+                            self._reject('queue_timeout', "Timed out waiting for a free slot, please retry later")
+                        self._condition.wait(left)
+                finally:
+                    self.waiting -= 1
+                    self._publish()
+            self.active += 1
+            self._publish()
+        admitted = time.monotonic()
+        metrics.observe('skillverify_admission_queue_wait_seconds', admitted - start, {'pool': self.name})
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self.average_seconds = 0.8 * self.average_seconds + 0.2 * (time.monotonic() - admitted)
+                self._publish()
+                self._condition.notify()
+
+
+class HeldStream:
+    """
+    Iterable for a streaming response that outlives the view: releases a slot taken
+    with ExitStack.enter_context(bulkhead.admit()) once the stream is exhausted or the
+    response is closed, even if iteration never started.
+    """
+
+    def __init__(self, iterable, slot):
+        self.iterable = iterable
+        self.slot = slot
+
+    def __iter__(self):
+        try:
+            yield from self.iterable
+        finally:
+            self.slot.close()
+
+    def close(self):
+        self.slot.close()
+
+
+_bulkheads = {}
+_bulkheads_lock = threading.Lock()
+
+
+def bulkhead(name):
+    """The process-wide bulkhead of a pool configured in ADMISSION_POOLS"""
+    with _bulkheads_lock:
+        if name not in _bulkheads:
+            config = settings.ADMISSION_POOLS[name]
+            _bulkheads[name] = Bulkhead(name, config['limit'], config['queue_size'], config['queue_timeout'])
+        return _bulkheads[name]
+
+
+class TokenBucket:
+    """Holds up to `burst` tokens, refilled at `rate` per second; each request takes one"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Take a token; returns 0, or the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def full(self):
+        return self.tokens + (time.monotonic() - self.updated) * self.rate >= self.burst
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+_MAX_BUCKETS = 10000
+
+
+class TokenBucketThrottle(BaseThrottle, metaclass=ABCMeta):
+    """
+    DRF throttle with one token bucket per identity and scope. Subclasses set `scope` and
+    implement get_identity. Rates come from ADMISSION_THROTTLE_RATES[scope] as (tokens per
+    second, burst), read when the throttle is created. Rejections become 429 responses
+    with Retry-After.
+    """
+    scope = None
+
+    def __init__(self):
+        self.rate, self.burst = settings.ADMISSION_THROTTLE_RATES[self.scope]
+
+    @abstractmethod
+    def get_identity(self, request):
+        """Key of the bucket to draw from, or None to let the request through"""
+
+    def allow_request(self, request, view):
+        identity = self.get_identity(request)
+        if identity is None:
+            return True
+        with _buckets_lock:
+            key = (self.scope, identity)
+            if key not in _buckets:
+                if len(_buckets) >= _MAX_BUCKETS:
+                    # Idle buckets have refilled; dropping them loses nothing
+                    for stale in [k for k, bucket in _buckets.items() if bucket.full()]:
+                        del _buckets[stale]
+                _buckets[key] = TokenBucket(self.rate, self.burst)
+            self._wait = _buckets[key].take()
+        if self._wait:
+            metrics.inc('skillverify_admission_rejected_total', {'pool': self.scope, 'reason': 'throttled'})
+            return False
+        return True
+
+    def wait(self):
+        return math.ceil(self._wait)
+
+
+class ClientRateThrottle(TokenBucketThrottle):
+    """Per client address (honouring NUM_PROXIES for X-Forwarded-For)"""
+    scope = 'client'
+
+    def get_identity(self, request):
+        return self.get_ident(request)
+
+
+class ApiKeyRateThrottle(TokenBucketThrottle):
+    """Per API key or bearer token (X-API-Key or Authorization header); unauthenticated requests pass"""
+    scope = 'api_key'
+
+    def get_identity(self, request):
+        key = request.headers.get('X-API-Key') or request.headers.get('Authorization')
+        if not key:
+            return None
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
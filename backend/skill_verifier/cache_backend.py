@@ -0,0 +1,196 @@
+import logging
+import pickle
+import zlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files import locks
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_cache_raw_bytes_total', 'Serialized size of cached values before compression, by namespace')
+metrics.describe('skillverify_cache_stored_bytes_total', 'Size of cached values as stored, by namespace')
+metrics.describe('skillverify_cache_compression_ratio', 'Stored/serialized size of compressed cache values, by namespace')
+metrics.describe('skillverify_cache_rejected_total', 'Cache writes dropped for exceeding the namespace size cap')
+
+# One-byte format tag in front of every stored value
+_RAW = b'P'
+_ZLIB = b'Z'
+
+
+class CacheCodec:
+    """
+    Binary encoding for cached values: pickle at the highest protocol, zlib-compressed
+    when the pickle is at least `compress_min_bytes`. Values whose stored size is over
+    their namespace's cap are rejected. The namespace is the longest configured
+    namespace the key starts with (keys are built as "<namespace>_<args>").
+    """
+
+    def __init__(self, compress_min_bytes=1024, compress_level=6, max_entry_bytes=None, namespace_caps=None):
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+        self.max_entry_bytes = max_entry_bytes
+        self.namespace_caps = namespace_caps or {}
+        self._prefixes = sorted(self.namespace_caps, key=len, reverse=True)
+
+    def namespace(self, key):
+        for prefix in self._prefixes:
+            if key == prefix or key.startswith(prefix + '_'):
+                return prefix
+        return 'other'
+
+    def encode(self, key, value):
+        """Return the stored bytes for value, or None when it is over the size cap"""
+        namespace = self.namespace(key)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        stored = _RAW + data
+        if len(data) >= self.compress_min_bytes:
+            compressed = zlib.compress(data, self.compress_level)
+            if len(compressed) < len(data):
+                stored = _ZLIB + compressed
+                metrics.observe('skillverify_cache_compression_ratio', len(compressed) / len(data), {'namespace': namespace})
+
+        cap = self.namespace_caps.get(namespace) or self.max_entry_bytes
+        if cap and len(stored) > cap:
+            metrics.inc('skillverify_cache_rejected_total', {'namespace': namespace})
+            logger.warning("Not caching %s: %s bytes is over the %s byte cap for %s", key, len(stored), cap, namespace)
+            return None
+
+        metrics.inc('skillverify_cache_raw_bytes_total', {'namespace': namespace}, len(data))
+        metrics.inc('skillverify_cache_stored_bytes_total', {'namespace': namespace}, len(stored))
+        return stored
+
+    def decode(self, stored):
+        tag, data = stored[:1], stored[1:]
+        if tag == _ZLIB:
+            data = zlib.decompress(data)
+        return pickle.loads(data)
+
+
+def _codec(params):
+    options = params.get('OPTIONS', {})
+    return CacheCodec(
+        compress_min_bytes=options.get('COMPRESS_MIN_BYTES', 1024),
+        compress_level=options.get('COMPRESS_LEVEL', 6),
+        max_entry_bytes=options.get('MAX_ENTRY_BYTES'),
+        namespace_caps=options.get('NAMESPACE_MAX_BYTES'),
+    )
+
+
+class CompressedLocMemCache(LocMemCache):
+    """
+    LocMemCache storing values through CacheCodec. Extra OPTIONS:
+    COMPRESS_MIN_BYTES, COMPRESS_LEVEL, MAX_ENTRY_BYTES (default cap) and
+    NAMESPACE_MAX_BYTES ({namespace: cap or None for the default}).
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self.codec = _codec(params)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        stored = self.codec.encode(key, value)
+        key = self.make_and_validate_key(key, version=version)
+        if stored is None:
+            return False
+        with self._lock:
+            if self._has_expired(key):
+                self._set(key, stored, timeout)
+                return True
+            return False
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._delete(key)
+                return default
+            stored = self._cache[key]
+            self._cache.move_to_end(key, last=False)
+        return self.codec.decode(stored)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        stored = self.codec.encode(key, value)
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if stored is None:
+                # Don't keep serving an older value for this key
+                self._delete(key)
+            else:
+                self._set(key, stored, timeout)
+
+    def incr(self, key, delta=1, version=None):
+        raw_key = key
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._delete(key)
+                raise ValueError("Key '%s' not found" % key)
+            new_value = self.codec.decode(self._cache[key]) + delta
+            self._cache[key] = self.codec.encode(raw_key, new_value)
+            self._cache.move_to_end(key, last=False)
+        return new_value
+
+
+class CompressedFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache storing values through CacheCodec (same OPTIONS as
+    CompressedLocMemCache), for a cache shared by every process on the host:
+    web workers and the prewarm_cache command. The codec bytes are written as
+    they are, in place of FileBasedCache's own pickle + zlib.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self.codec = _codec(params)
+
+    def _write_content(self, file, timeout, value):
+        file.write(pickle.dumps(self.get_backend_timeout(timeout), self.pickle_protocol))
+        file.write(value)
+
+    def get(self, key, default=None, version=None):
+        fname = self._key_to_file(key, version)
+        try:
+            with open(fname, 'rb') as f:
+                if not self._is_expired(f):
+                    return self.codec.decode(f.read())
+        except FileNotFoundError:
+            pass
+        return default
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        stored = self.codec.encode(key, value)
+        if stored is None:
+            # Don't keep serving an older value for this key
+            self.delete(key, version=version)
+        else:
+            super().set(key, stored, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if self.has_key(key, version):
+            return False
+        stored = self.codec.encode(key, value)
+        if stored is None:
+            return False
+        super().set(key, stored, timeout, version)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            with open(self._key_to_file(key, version), 'r+b') as f:
+                try:
+                    locks.lock(f, locks.LOCK_EX)
+                    if self._is_expired(f):
+                        return False
+                    stored = f.read()
+                    f.seek(0)
+                    self._write_content(f, timeout, stored)
+                    f.truncate()
+                    return True
+                finally:
+                    locks.unlock(f)
+        except FileNotFoundError:
+            return False
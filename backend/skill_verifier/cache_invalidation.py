@@ -0,0 +1,144 @@
+import logging
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+
+from . import metrics
+from .account_rollups import delete_rollups, expire_rollups
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_cache_invalidations_total', 'Targeted cache invalidations, by scope')
+
+# Cache namespaces grouped into families that can be invalidated together
+CACHE_FAMILIES = {
+    'github': (
+        'user_repos', 'repo_languages', 'repo_commits', 'repo_readme', 'repo_readme_meta',
+        'repo_topics', 'user_info', 'all_github_data',
+    ),
+    'account': ('account_languages', 'account_technologies', 'account_summary'),
+    'resume': ('github_username', 'resume_skills', 'resume_parsing'),
+    'analysis': ('github_skills_analysis', 'verify_skills_llm', 'fused_skills_verification'),
+    'verification': ('full_verification',),
+}
+
+# Per-user namespaces derived from the user's repositories: stale once any repository changes
+REPO_DEPENDENT_NAMESPACES = (
+    'user_repos', 'all_github_data', 'account_languages', 'account_technologies',
+    'account_summary', 'github_skills_analysis', 'fused_skills_verification', 'full_verification',
+)
+
+_PREFIX = 'cache_generation'
+
+# Generations already read by the request being handled, so each is fetched once per request
+_generations = ContextVar('cache_generations', default=None)
+
+
+@contextmanager
+def request_generations():
+    """
+    Remember the generations key_version reads in this block. An invalidation made
+    elsewhere during the block is seen by the next request.
+    """
+    token = _generations.set({})
+    try:
+        yield
+    finally:
+        _generations.reset(token)
+
+
+def _scope_keys(namespace, username=None, repo=None):
+    keys = [f"{_PREFIX}_ns_{namespace}"]
+    if username:
+        username = username.lower()
+        keys.append(f"{_PREFIX}_user_{username}")
+        if repo:
+            keys.append(f"{_PREFIX}_repo_{username}/{repo.lower()}")
+        elif namespace in REPO_DEPENDENT_NAMESPACES:
+            keys.append(f"{_PREFIX}_repos_{username}")
+    return keys
+
+
+def _new_generation():
+    return uuid.uuid4().hex[:8]
+
+
+def key_version(namespace, username=None, repo=None):
+    """
+    Version string to put in a cache key of the namespace. It changes whenever the
+    namespace, the user, the user's repository (for repo_* entries) or any of the user's
+    repositories (for REPO_DEPENDENT_NAMESPACES) is invalidated, so older entries are
+    never read again and expire on their own TTL. A generation evicted from the cache is
+    replaced by a new one, which can only cause misses, never stale hits.
+    Within request_generations(), each generation is read from the cache once.
+    """
+    keys = _scope_keys(namespace, username, repo)
+    generations = _generations.get()
+    if generations is None:
+        generations = {}
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        found = cache.get_many(missing)
+        for key in missing:
+            if key not in found:
+                cache.add(key, _new_generation(), None)
+                found[key] = cache.get(key)
+        generations.update(found)
+    return ".".join(str(generations[key]) for key in keys)
+
+
+def _bump(*keys):
+    bumped = {key: _new_generation() for key in keys}
+    cache.set_many(bumped, None)
+    generations = _generations.get()
+    if generations is not None:
+        generations.update(bumped)
+
+
+def invalidate_namespaces(*namespaces):
+    """Invalidate every entry of the given namespaces"""
+    unknown = set(namespaces) - {namespace for family in CACHE_FAMILIES.values() for namespace in family}
+    if unknown:
+        raise ValueError(f"Unknown cache namespaces: {', '.join(sorted(unknown))}")
+    _bump(*(f"{_PREFIX}_ns_{namespace}" for namespace in namespaces))
+    if set(namespaces) & set(CACHE_FAMILIES['account']):
+        expire_rollups()
+    metrics.inc('skillverify_cache_invalidations_total', {'scope': 'namespace'}, len(namespaces))
+    logger.info("Invalidated cache namespaces: %s", ", ".join(namespaces))
+
+
+def invalidate_family(family):
+    """Invalidate every namespace of a family in CACHE_FAMILIES"""
+    if family not in CACHE_FAMILIES:
+        raise ValueError(f"Unknown cache family '{family}' (expected one of {', '.join(CACHE_FAMILIES)})")
+    invalidate_namespaces(*CACHE_FAMILIES[family])
+
+
+def invalidate_all():
+    """Invalidate every family, without dropping unrelated entries"""
+    invalidate_namespaces(*(namespace for family in CACHE_FAMILIES.values() for namespace in family))
+
+
+def invalidate_user(username):
+    """
+    Invalidate everything cached about a GitHub user (GitHub data, account aggregates,
+    skill analyses and verifications), and rebuild their account rollups.
+    """
+    _bump(f"{_PREFIX}_user_{username.lower()}")
+    delete_rollups(username)
+    metrics.inc('skillverify_cache_invalidations_total', {'scope': 'user'})
+    logger.info("Invalidated cache entries of %s", username)
+
+
+def invalidate_repo(username, repo):
+    """
+    Invalidate one repository's entries and the user's entries aggregated over their
+    repositories. The account rollups are expired, so their next read re-fetches just
+    the repositories whose version changed.
+    """
+    _bump(f"{_PREFIX}_repo_{username.lower()}/{repo.lower()}", f"{_PREFIX}_repos_{username.lower()}")
+    expire_rollups(username)
+    metrics.inc('skillverify_cache_invalidations_total', {'scope': 'repo'})
+    logger.info("Invalidated cache entries of %s/%s", username, repo)
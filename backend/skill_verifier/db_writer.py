@@ -0,0 +1,109 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_db_write_batches_total', 'Transactions committed by the batched writer')
+metrics.describe('skillverify_db_writes_total', 'Writes committed by the batched writer, by outcome')
+
+
+class BatchedWriter:
+    """
+    Single writer thread that runs queued write functions in shared transactions.
+
+    SQLite allows one writer at a time, so concurrent request threads inserting on
+    their own connections queue up on the database lock (and fail with "database is
+    locked" once busy_timeout runs out). Funnelling writes through one thread removes
+    that contention, and grouping whatever is queued into one transaction pays for
+    one commit per group instead of one per insert. Each write runs in its own
+    savepoint, so a failing write only rolls back itself. Callers get the result
+    once the group has committed.
+    """
+
+    def __init__(self, max_batch=None, max_wait=None):
+        self.max_batch = max_batch or getattr(settings, 'DB_WRITE_BATCH_SIZE', 50)
+        self.max_wait = (getattr(settings, 'DB_WRITE_BATCH_WAIT_MS', 0) / 1000) if max_wait is None else max_wait
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def _ensure_started(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._loop, name='db-writer', daemon=True)
+                self.thread.start()
+
+    def submit(self, func):
+        """Queue func (called with no arguments on the writer thread) and return a Future"""
+        future = Future()
+        self._ensure_started()
+        self.queue.put((func, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception("Batched writer failed")
+
+    def _flush(self, batch):
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for func, future in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append((future, func(), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # The commit itself failed: nothing in this group was written
+            for _, future in batch:
+                future.set_exception(e)
+            metrics.inc('skillverify_db_writes_total', {'outcome': 'error'}, len(batch))
+            close_old_connections()
+            return
+
+        metrics.inc('skillverify_db_write_batches_total')
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+            metrics.inc('skillverify_db_writes_total', {'outcome': 'ok' if error is None else 'error'})
+
+
+_writer = BatchedWriter()
+
+
+def run_write(func):
+    """
+    Run a write function through the batched writer and return its result. Runs inline
+    when batching is disabled or the caller is already inside a transaction (the write
+    must then be part of that transaction).
+    """
+    if not getattr(settings, 'DB_BATCHED_WRITES', False) or connection.in_atomic_block:
+        with transaction.atomic():
+            return func()
+    return _writer.submit(func).result()
@@ -0,0 +1,74 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_degraded_sections_total', 'Response sections degraded to meet the request deadline, by section')
+
+# Deadline of the request being handled: (monotonic expiry, list of degraded sections)
+_deadline = ContextVar('request_deadline', default=None)
+
+
+@contextmanager
+def request_deadline(seconds):
+    """
+    Give the code in this block `seconds` to finish. Stages size their upstream timeouts
+    from remaining() and degrade (recording it with degrade()) when short of time.
+    Yields the list of degraded sections, filled as the block runs.
+    """
+    degraded = []
+    token = _deadline.set((time.monotonic() + seconds, degraded))
+    try:
+        yield degraded
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(reserve=0):
+    """Seconds left before the deadline minus `reserve` (kept for later stages), or None without a deadline"""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(0.0, current[0] - time.monotonic() - reserve)
+
+
+def timeout(default, reserve=0):
+    """An upstream call timeout: `default`, shortened to what the deadline leaves after `reserve`"""
+    left = remaining(reserve)
+    if left is None:
+        return default
+    return max(0.1, min(default, left))
+
+
+def has_time(seconds, reserve=0):
+    """True when at least `seconds` are left after `reserve` (always true without a deadline)"""
+    left = remaining(reserve)
+    return left is None or left >= seconds
+
+
+def degrade(section, reason):
+    """Record that a response section was computed in a reduced form"""
+    current = _deadline.get()
+    if current is None:
+        return
+    if section not in current[1]:
+        current[1].append(section)
+        metrics.inc('skillverify_degraded_sections_total', {'section': section})
+    logger.info("Degraded %s: %s", section, reason)
+
+
+def degraded():
+    """Sections degraded so far in this request"""
+    current = _deadline.get()
+    return list(current[1]) if current else []
+
+
+def reserve(stage):
+    """Seconds a stage leaves for the stages after it (DEADLINE_STAGE_RESERVES)"""
+    return getattr(settings, 'DEADLINE_STAGE_RESERVES', {}).get(stage, 0)
@@ -93,14 +93,15 @@ class GitHubOAuthHandler:
         except Exception as e:
             return None, str(e)
     
-    def generate_jwt_token(self, user_data):
-        """Generate JWT token for authenticated user"""
+    def generate_jwt_token(self, user_data, oauth=False):
+        """Generate JWT token for authenticated user (oauth: the user proved the account through GitHub OAuth)"""
         try:
             payload = {
                 'github_id': user_data.get('github_id'),
                 'github_username': user_data.get('github_username'),
                 'email': user_data.get('email'),
                 'name': user_data.get('name'),
+                'oauth': oauth,
                 'iat': datetime.utcnow(),
                 'exp': datetime.utcnow() + timedelta(days=30),
             }
@@ -114,3 +115,21 @@ class GitHubOAuthHandler:
             return token
         except Exception as e:
             return None
+
+    def decode_jwt_token(self, token):
+        """Payload of a valid, unexpired JWT issued by generate_jwt_token, or None"""
+        try:
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            return None
+
+
+def oauth_username(request):
+    """GitHub username of a requester whose bearer JWT was issued after GitHub OAuth, or None"""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    payload = GitHubOAuthHandler().decode_jwt_token(token.strip())
+    if not payload or not payload.get('oauth'):
+        return None
+    return payload.get('github_username')
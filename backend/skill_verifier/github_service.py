@@ -1,199 +1,491 @@
 
 
+import logging
 import requests
-import base64
+import codecs
 from django.conf import settings
 import json
 import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
 from django.core.cache import cache
+from django.db import connection
+
+from . import deadline, metrics
+from .account_rollups import get_rollup, rollup_languages, rollup_technologies
+from .cache_invalidation import key_version
+from .github_tokens import get_user_token, mark_token_invalid
+from .log import log_payload
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_github_requests_total', 'GitHub API requests by token pool (user OAuth token or shared)')
+metrics.describe('skillverify_github_negative_cache_total', 'Negative GitHub cache entries stored and read, by namespace, reason and op')
+
+
+# Rate-limit budget shared by every GitHubService instance in this process,
+# updated from the X-RateLimit-* headers of each GitHub response
+_rate_limit_lock = threading.Lock()
+_rate_limit = {'remaining': None, 'reset': None}
+# Budgets of logged-in users' own OAuth tokens: username -> {'remaining', 'reset'}
+_user_rate_limits = {}
+
+# Statuses that definitively mean the resource does not exist (unlike 5xx, 403 rate
+# limiting or network errors, which are transient and never cached)
+NOT_FOUND_STATUSES = (404, 410, 451)
+
+
+class Missing:
+    """Cached in place of a value GitHub definitively doesn't have ('not_found' or 'empty')"""
+
+    def __init__(self, reason, status):
+        self.reason = reason
+        self.status = status
+
+
+# Fields kept from each entry of the repository listing (GitHub returns ~100 per repo)
+REPO_LISTING_FIELDS = (
+    'name', 'description', 'language', 'fork', 'size',
+    'stargazers_count', 'forks_count', 'created_at', 'updated_at', 'pushed_at'
+)
+
+# Per-repository fields get_all_github_data can collect. Callers pass the ones they
+# use, and only those are fetched and cached.
+REPO_DATA_FIELDS = (
+    'languages', 'topics', 'readme', 'commits',
+    'description', 'stars', 'forks', 'created_at', 'updated_at'
+)
 
 
 class GitHubService:
-    def __init__(self, username):
+    def __init__(self, username, requester=None):
         self.username = username
-        self.headers = {'Authorization': f'token {settings.GITHUB_TOKEN}'} if settings.GITHUB_TOKEN else {}
+        # GitHub user the calls are made for, authenticated through OAuth; None for anonymous requests
+        self.requester = requester
+        self.api_url = getattr(settings, 'GITHUB_API_URL', 'https://api.github.com')
+        self._headers = None
+        # Username whose own OAuth token authenticates this service's calls; None for the shared token
+        self.token_owner = None
+        # Set when GitHub calls ran out of time, so partial aggregates aren't cached
+        self.timed_out = False
+        # Repositories (None for the user's listing and profile) whose fetch failed transiently:
+        # their answer is unknown rather than empty, so it must not be stored as final
+        self.failed_fetches = set()
+
+    @property
+    def headers(self):
+        """
+        Auth headers, resolved on the first GitHub call (cache hits never need them).
+        Calls made for a requester who logged in with GitHub use the requester's own
+        OAuth token, so they draw on the requester's quota, whoever is looked up. Anonymous
+        requests, or a token nearly out of budget, use the shared GITHUB_TOKEN.
+        """
+        if self._headers is None:
+            token = None
+            if (self.requester and getattr(settings, 'GITHUB_USE_USER_TOKENS', False)
+                    and not self._user_budget_exhausted(self.requester)):
+                token = get_user_token(self.requester)
+            if token:
+                self._headers = {'Authorization': f'token {token}'}
+                self.token_owner = self.requester
+            else:
+                self._use_shared_token()
+        return self._headers
+
+    def _use_shared_token(self):
+        self._headers = {'Authorization': f'token {settings.GITHUB_TOKEN}'} if settings.GITHUB_TOKEN else {}
+        self.token_owner = None
+
+    @staticmethod
+    def _user_budget_exhausted(username):
+        with _rate_limit_lock:
+            budget = _user_rate_limits.get(username.lower())
+        if not budget or (budget['reset'] and budget['reset'] <= time.time()):
+            return False
+        return budget['remaining'] < getattr(settings, 'GITHUB_USER_TOKEN_RESERVE', 0)
         # Generate a cache key based on method name and arguments
     def _get_cache_key(self, method_name, *args):
         """Generate a cache key based on method name and arguments"""
-        key_parts = [self.username, method_name]
+        # Namespace first, so the cache backend can tell which namespace a key belongs to.
+        # repo_* methods take the repository name first; it scopes their invalidation.
+        repo = args[0] if method_name.startswith('repo_') else None
+        key_parts = [method_name, self.username, key_version(method_name, self.username, repo)]
         key_parts.extend([str(arg) for arg in args])
         key = "_".join(key_parts)
         # Create  hash for long keys
         if len(key) > 245:
-            key = f"gh_{hashlib.md5(key.encode()).hexdigest()}"
+            key = f"{method_name}_{hashlib.md5(key.encode()).hexdigest()}"
         return key
+
+    @staticmethod
+    def _negative_hit(namespace, cached_data):
+        """True when the cached value is a Missing marker"""
+        if isinstance(cached_data, Missing):
+            metrics.inc('skillverify_github_negative_cache_total', {'namespace': namespace, 'reason': cached_data.reason, 'op': 'hit'})
+            return True
+        return False
+
+    def _cache_missing(self, namespace, cache_key, response, empty_statuses=(), repo_name=None):
+        """
+        Cache a definitive 'not found' (or, for empty_statuses, 'empty') answer under the
+        value's key with its own, shorter TTL from GITHUB_NEGATIVE_CACHE_TIMEOUTS, so the
+        missing resource costs one upstream call per TTL. Other failures, including no
+        response at all, are not cached; they are recorded in failed_fetches under repo_name.
+        """
+        if response is None:
+            self.failed_fetches.add(repo_name)
+            return
+        if response.status_code in empty_statuses:
+            reason = 'empty'
+        elif response.status_code in NOT_FOUND_STATUSES:
+            reason = 'not_found'
+        else:
+            self.failed_fetches.add(repo_name)
+            return
+        cache.set(cache_key, Missing(reason, response.status_code), settings.GITHUB_NEGATIVE_CACHE_TIMEOUTS[reason])
+        metrics.inc('skillverify_github_negative_cache_total', {'namespace': namespace, 'reason': reason, 'op': 'store'})
+
+    def _request(self, url, headers=None, params=None, stream=False):
+        """
+        GET a GitHub API url and record the remaining rate-limit budget of the token used.
+        Returns None when no response arrived (timeout, connection or other request error);
+        callers record that as a transient failure in failed_fetches.
+        """
+        headers = headers or self.headers
+        timeout = deadline.timeout(settings.GITHUB_REQUEST_TIMEOUT, deadline.reserve('github_data'))
+        try:
+            with metrics.upstream_call('github', 'github') as call:
+                response = requests.get(url, headers=headers, params=params, stream=stream, timeout=timeout)
+                call.status = response.status_code
+        except requests.Timeout:
+            # A transient failure for the callers: nothing is cached
+            logger.warning("GitHub request timed out after %.1fs: %s", timeout, url)
+            self.timed_out = True
+            return None
+        except requests.RequestException as e:
+            logger.warning("GitHub request failed: %s: %s", url, e)
+            return None
+        metrics.inc('skillverify_github_requests_total', {'token': 'user' if self.token_owner else 'shared'})
+
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            budget = {'remaining': int(remaining), 'reset': int(response.headers.get('X-RateLimit-Reset', 0))}
+            with _rate_limit_lock:
+                if self.token_owner:
+                    _user_rate_limits[self.token_owner.lower()] = budget
+                else:
+                    _rate_limit.update(budget)
+
+        if response.status_code == 401 and self.token_owner:
+            # Revoked or expired: retry once with the shared token
+            logger.warning("GitHub rejected the stored token of %s; using the shared token", self.token_owner)
+            mark_token_invalid(self.token_owner)
+            response.close()
+            headers = {name: value for name, value in headers.items() if name != 'Authorization'}
+            self._use_shared_token()
+            return self._request(url, {**headers, **self._headers}, params, stream)
+        return response
+
+    @staticmethod
+    def rate_limit_exhausted():
+        """True when the last seen GitHub budget is below GITHUB_RATE_LIMIT_RESERVE and has not reset yet"""
+        with _rate_limit_lock:
+            remaining, reset = _rate_limit['remaining'], _rate_limit['reset']
+        if remaining is None or (reset and reset <= time.time()):
+            return False
+        return remaining < getattr(settings, 'GITHUB_RATE_LIMIT_RESERVE', 0)
         # Get list of user's public repositories with caching
     def get_user_repos(self):
         """Get list of user's public repositories with caching"""
         cache_key = self._get_cache_key("user_repos")
-        cached_data = cache.get(cache_key)
-        
+        cached_data = metrics.cache_get("user_repos", cache_key)
+        if self._negative_hit("user_repos", cached_data):
+            return []
+
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
             
-        url = f"https://api.github.com/users/{self.username}/repos"
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code == 200:
-            data = response.json()
+        url = f"{self.api_url}/users/{self.username}/repos"
+        response = self._request(url)
+        
+        if response is not None and response.status_code == 200:
+            data = [
+                {field: repo.get(field) for field in REPO_LISTING_FIELDS}
+                for repo in response.json()
+            ]
             cache.set(cache_key, data, settings.GITHUB_CACHE_TIMEOUT)
             return data
 
         else:
-            print(f"Error fetching repos: {response.status_code}")
+            logger.warning("Error fetching repos for %s: %s", self.username, getattr(response, 'status_code', 'no response'))
+            self._cache_missing("user_repos", cache_key, response)
             return []
         # Get languages used in a repository with caching    
     def get_repo_languages(self, repo_name):
         """Get languages used in a repository with caching"""
         cache_key = self._get_cache_key("repo_languages", repo_name)
-        cached_data = cache.get(cache_key)
-        
+        cached_data = metrics.cache_get("repo_languages", cache_key)
+        if self._negative_hit("repo_languages", cached_data):
+            return {}
+
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
             
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}/languages"
-        response = requests.get(url, headers=self.headers)
+        url = f"{self.api_url}/repos/{self.username}/{repo_name}/languages"
+        response = self._request(url)
         
-        if response.status_code == 250:
+        if response is not None and response.status_code == 200:
             data = response.json()
             cache.set(cache_key, data, settings.GITHUB_CACHE_TIMEOUT)
             return data
         else:
+            self._cache_missing("repo_languages", cache_key, response, repo_name=repo_name)
             return {}
         # Get recent commits in a repository with caching 
     def get_repo_commits(self, repo_name, max_commits=10):
-        """Get recent commits in a repository with caching"""
+        """Get recent commits in a repository as (short sha, date, subject line) tuples, with caching"""
         cache_key = self._get_cache_key("repo_commits", repo_name, max_commits)
-        cached_data = cache.get(cache_key)
-        
+        cached_data = metrics.cache_get("repo_commits", cache_key)
+        if self._negative_hit("repo_commits", cached_data):
+            return []
+
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
             
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}/commits"
+        url = f"{self.api_url}/repos/{self.username}/{repo_name}/commits"
         params = {'per_page': max_commits}
-        response = requests.get(url, headers=self.headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
+        response = self._request(url, params=params)
+        
+        if response is not None and response.status_code == 200:
+            data = [
+                (
+                    commit.get('sha', '')[:12],
+                    ((commit.get('commit') or {}).get('author') or {}).get('date'),
+                    ((commit.get('commit') or {}).get('message') or '').split('\n', 1)[0][:120]
+                )
+                for commit in response.json()
+            ]
             cache.set(cache_key, data, settings.GITHUB_CACHE_TIMEOUT)
             return data
         else:
+            # 409: the repository has no commits yet
+            self._cache_missing("repo_commits", cache_key, response, empty_statuses=(409,), repo_name=repo_name)
             return []
         # Get repository README content with caching  
     def get_repo_readme(self, repo_name):
-        """Get repository README content with caching"""
+        """
+        Get the first GITHUB_README_MAX_BYTES of the repository README as text, with caching.
+        The raw media type is requested with a byte range, and the body is read only up to
+        the limit, so a huge README costs no more than a small one. The full size is cached
+        separately (see get_repo_readme_meta).
+        """
         cache_key = self._get_cache_key("repo_readme", repo_name)
-        cached_data = cache.get(cache_key)
-        
+        cached_data = metrics.cache_get("repo_readme", cache_key)
+        if self._negative_hit("repo_readme", cached_data):
+            return ""
+
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
             
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}/readme"
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code == 200:
-            content = response.json().get('content', '')
-            if content:
-                readme = base64.b64decode(content).decode('utf-8')
-                cache.set(cache_key, readme, settings.GITHUB_CACHE_TIMEOUT)
-                return readme
-        return ""
+        max_bytes = settings.GITHUB_README_MAX_BYTES
+        url = f"{self.api_url}/repos/{self.username}/{repo_name}/readme"
+        headers = self.headers.copy()
+        headers['Accept'] = 'application/vnd.github.raw'
+        headers['Range'] = f"bytes=0-{max_bytes - 1}"
+        response = self._request(url, headers=headers, stream=True)
+        if response is None:
+            self._cache_missing("repo_readme", cache_key, response, repo_name=repo_name)
+            return ""
+
+        try:
+            if response.status_code not in (200, 206):
+                # 404: the repository has no README
+                self._cache_missing("repo_readme", cache_key, response, empty_statuses=(404,), repo_name=repo_name)
+                return ""
+            data = b''
+            for chunk in response.iter_content(chunk_size=8192):
+                data += chunk
+                if len(data) >= max_bytes:
+                    break
+        except requests.RequestException as e:
+            # Read timeouts and dropped connections while streaming the body
+            logger.warning("Error reading README of %s/%s: %s", self.username, repo_name, e)
+            self.failed_fetches.add(repo_name)
+            return ""
+        finally:
+            response.close()
+        data = data[:max_bytes]
+
+        size = self._readme_size(response, data, max_bytes)
+        truncated = size is None or size > len(data)
+        # Incremental decode drops a multi-byte character cut off by the limit;
+        # invalid bytes (non-UTF-8 READMEs) are replaced rather than raising
+        readme = codecs.getincrementaldecoder('utf-8-sig')(errors='replace').decode(data, final=not truncated)
+
+        cache.set(cache_key, readme, settings.GITHUB_CACHE_TIMEOUT)
+        cache.set(
+            self._get_cache_key("repo_readme_meta", repo_name),
+            {'size': size, 'fetched_bytes': len(data), 'truncated': truncated},
+            settings.GITHUB_CACHE_TIMEOUT
+        )
+        return readme
+
+    @staticmethod
+    def _readme_size(response, data, max_bytes):
+        """Full README size in bytes from Content-Range or the body, or None when unknown"""
+        content_range = response.headers.get('Content-Range', '')
+        total = content_range.rpartition('/')[2]
+        if total.isdigit():
+            return int(total)
+        if len(data) < max_bytes:
+            return len(data)
+        length = response.headers.get('Content-Length')
+        if response.status_code == 200 and length and length.isdigit() and not response.headers.get('Content-Encoding'):
+            return int(length)
+        return None
+
+    def get_repo_readme_meta(self, repo_name):
+        """README size metadata: {'size', 'fetched_bytes', 'truncated'}, or None without a README"""
+        cache_key = self._get_cache_key("repo_readme_meta", repo_name)
+        cached_data = metrics.cache_get("repo_readme_meta", cache_key)
+        if cached_data is None and self.get_repo_readme(repo_name):
+            cached_data = cache.get(cache_key)
+        return cached_data
         
         # Get repository topics/tags with caching
     def get_repo_topics(self, repo_name):
         """Get repository topics/tags with caching"""
         cache_key = self._get_cache_key("repo_topics", repo_name)
-        cached_data = cache.get(cache_key)
-        
+        cached_data = metrics.cache_get("repo_topics", cache_key)
+        if self._negative_hit("repo_topics", cached_data):
+            return []
+
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
             
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}/topics"
+        url = f"{self.api_url}/repos/{self.username}/{repo_name}/topics"
         # GitHub API requires a specific media type for this endpoint
         headers = self.headers.copy()
         headers['Accept'] = 'application/vnd.github.mercy-preview+json'
-        response = requests.get(url, headers=headers)
+        response = self._request(url, headers=headers)
         
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             data = response.json().get('names', [])
             cache.set(cache_key, data, settings.GITHUB_CACHE_TIMEOUT)
             return data
         else:
+            self._cache_missing("repo_topics", cache_key, response, repo_name=repo_name)
             return []
         # Collect data for a single repository    
-    def collect_repo_data(self, repo_name):
-        """Collect all data for a single repository"""
-        languages = self.get_repo_languages(repo_name)
-        commits = self.get_repo_commits(repo_name)
-        readme = self.get_repo_readme(repo_name)
-        topics = self.get_repo_topics(repo_name)
-        
-        return {
-            'name': repo_name,
-            'languages': languages,
-            'commits': commits,
-            'readme': readme,
-            'topics': topics
+    def collect_repo_data(self, repo_name, fields=REPO_DATA_FIELDS):
+        """Collect the requested fields for a single repository"""
+        fetchers = {
+            'languages': self.get_repo_languages,
+            'commits': self.get_repo_commits,
+            'readme': self.get_repo_readme,
+            'topics': self.get_repo_topics,
         }
-        
+        repo_data = {'name': repo_name}
+        for field, fetch in fetchers.items():
+            if field in fields:
+                repo_data[field] = fetch(repo_name)
+        return repo_data
+        
+    @staticmethod
+    def _data_version(repos, max_repos):
+        """Fingerprint of the analysed repos; changes whenever one of them is pushed to or edited"""
+        fingerprint = [
+            (repo.get('name'), repo.get('pushed_at'), repo.get('updated_at'))
+            for repo in repos[:max_repos]
+        ]
+        return hashlib.sha1(json.dumps(fingerprint).encode()).hexdigest()
+
+    def get_data_version(self, max_repos=5):
+        """Current version of the data get_all_github_data(max_repos) would return (one cached repo listing)"""
+        return self._data_version(self.get_user_repos(), max_repos)
+
         # Collect all relevant GitHub data for the user
-    def get_all_github_data(self, max_repos=5):
-        """Get all relevant GitHub data for the user with caching"""
-        cache_key = self._get_cache_key("all_github_data", max_repos)
-        cached_data = cache.get(cache_key)
+    def get_all_github_data(self, max_repos=5, fields=REPO_DATA_FIELDS):
+        """
+        Get GitHub data for the user's first max_repos repositories with caching.
+        Only the per-repo `fields` (see REPO_DATA_FIELDS) are fetched and returned.
+        """
+        unknown = set(fields) - set(REPO_DATA_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown GitHub data fields: {', '.join(sorted(unknown))}")
+        fields = sorted(set(fields))
+        cache_key = self._get_cache_key("all_github_data", max_repos, "-".join(fields))
+        cached_data = metrics.cache_get("all_github_data", cache_key)
         
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
         
-        print(f"\n[GitHub Service] Fetching data for user: {self.username}")
+        logger.info("Fetching GitHub data for user: %s", self.username)
         repos = self.get_user_repos()
-        print(f"[GitHub Service] Found {len(repos)} total repositories, processing first {max_repos}")
+        logger.debug("Found %d total repositories, processing first %d", len(repos), max_repos)
         
         all_data = {
             'username': self.username,
+            'version': self._data_version(repos, max_repos),
             'repos': []
         }
         
         # Only process a limited number of repos for performance
         for idx, repo in enumerate(repos[:max_repos]):
+            if self.timed_out or deadline.remaining(deadline.reserve('github_data')) == 0:
+                # Out of time: analyse the repositories collected so far
+                self.timed_out = True
+                break
             repo_name = repo.get('name')
-            print(f"[GitHub Service] Processing repo {idx+1}/{min(len(repos), max_repos)}: {repo_name}")
-            repo_data = self.collect_repo_data(repo_name)
+            logger.debug("Processing repo %d/%d: %s", idx + 1, min(len(repos), max_repos), repo_name)
+            repo_data = self.collect_repo_data(repo_name, fields)
             # Add metadata from the repo listing
-            repo_data.update({
+            metadata = {
                 'description': repo.get('description'),
                 'stars': repo.get('stargazers_count'),
                 'forks': repo.get('forks_count'),
                 'created_at': repo.get('created_at'),
                 'updated_at': repo.get('updated_at')
-            })
+            }
+            repo_data.update({field: value for field, value in metadata.items() if field in fields})
             all_data['repos'].append(repo_data)
         
-        print(f"[GitHub Service] Successfully collected data for {len(all_data['repos'])} repositories")
-        print(f"[GitHub Service] All GitHub Data collected:\n{json.dumps(all_data, indent=2, default=str)}\n")
-        
-        cache.set(cache_key, all_data, settings.GITHUB_CACHE_TIMEOUT)    
+        logger.info("Collected data for %d repositories of %s", len(all_data['repos']), self.username)
+        log_payload(logger, "All GitHub data collected", all_data)
+
+        if self.timed_out:
+            # Some repositories are missing or incomplete
+            deadline.degrade('github_data', f"collected {len(all_data['repos'])} repositories before the deadline")
+            return all_data
+        if self.failed_fetches:
+            # Transient failures left gaps; the next call fetches them again
+            return all_data
+        cache.set(cache_key, all_data, settings.GITHUB_CACHE_TIMEOUT)
         return all_data
     
     def get_user_info(self):
         """Get user information from GitHub"""
         cache_key = self._get_cache_key("user_info")
-        cached_data = cache.get(cache_key)
-        
+        cached_data = metrics.cache_get("user_info", cache_key)
+        if self._negative_hit("user_info", cached_data):
+            return None
+
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
         
-        url = f"https://api.github.com/users/{self.username}"
-        response = requests.get(url, headers=self.headers)
+        url = f"{self.api_url}/users/{self.username}"
+        response = self._request(url)
         
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             user_data = response.json()
             # Extract relevant user information
             user_info = {
@@ -213,68 +505,58 @@ class GitHubService:
             cache.set(cache_key, user_info, settings.GITHUB_CACHE_TIMEOUT)
             return user_info
         else:
-            print(f"Error fetching user info: {response.status_code}")
+            logger.warning("Error fetching user info for %s: %s", self.username, getattr(response, 'status_code', 'no response'))
+            self._cache_missing("user_info", cache_key, response)
             return None
     
+    def aggregate_account(self, max_repos=10):
+        """
+        Account language and technology statistics for the first max_repos repositories,
+        read from the user's persisted rollup (one indexed query). A missing or stale
+        rollup is refreshed incrementally: only repositories whose version changed are
+        fetched again, through the same per-repo caches get_all_github_data uses.
+        Both results are cached for the individual endpoints.
+        """
+        rollup = get_rollup(self, max_repos)
+        if rollup is None:
+            logger.warning("No GitHub account data for %s", self.username)
+            return {
+                'user_info': None,
+                'languages': {'username': self.username, 'total_bytes': 0, 'languages': {}, 'top_languages': [],
+                              'language_count': 0, 'repositories_analyzed': 0},
+                'technologies': {'username': self.username, 'technologies': {}, 'top_technologies': [],
+                                 'technology_count': 0, 'repositories_analyzed': 0},
+                'total_repositories': 0,
+                'repositories_analyzed': 0
+            }
+
+        languages = rollup_languages(rollup)
+        technologies = rollup_technologies(rollup)
+        if not self.failed_fetches:
+            cache.set(self._get_cache_key("account_languages", max_repos), languages, settings.GITHUB_CACHE_TIMEOUT)
+            cache.set(self._get_cache_key("account_technologies", max_repos), technologies, settings.GITHUB_CACHE_TIMEOUT)
+
+        return {
+            'user_info': rollup.user_info,
+            'languages': languages,
+            'technologies': technologies,
+            'total_repositories': rollup.total_repositories,
+            'repositories_analyzed': len(rollup.repo_versions)
+        }
+
     def get_account_programming_languages(self, max_repos=10):
         """
         Analyze programming languages across all user repositories.
         Returns aggregated language statistics for the entire account.
         """
         cache_key = self._get_cache_key("account_languages", max_repos)
-        cached_data = cache.get(cache_key)
+        cached_data = metrics.cache_get("account_languages", cache_key)
         
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
         
-        repos = self.get_user_repos()
-        language_stats = {}
-        total_bytes = 0
-        
-        print(f"\n[GitHub Service] Analyzing languages across {min(len(repos), max_repos)} repositories")
-        
-        for repo in repos[:max_repos]:
-            repo_name = repo.get('name')
-            languages = self.get_repo_languages(repo_name)
-            
-            if languages:
-                for language, bytes_count in languages.items():
-                    if language not in language_stats:
-                        language_stats[language] = {
-                            'bytes': 0,
-                            'count': 0,  # Number of repos using this language
-                            'percentage': 0
-                        }
-                    language_stats[language]['bytes'] += bytes_count
-                    language_stats[language]['count'] += 1
-                    total_bytes += bytes_count
-        
-        # Calculate percentages
-        for language in language_stats:
-            if total_bytes > 0:
-                language_stats[language]['percentage'] = round(
-                    (language_stats[language]['bytes'] / total_bytes) * 100, 2
-                )
-        
-        # Sort by bytes (usage)
-        sorted_languages = dict(sorted(
-            language_stats.items(),
-            key=lambda x: x[1]['bytes'],
-            reverse=True
-        ))
-        
-        result = {
-            'username': self.username,
-            'total_bytes': total_bytes,
-            'languages': sorted_languages,
-            'top_languages': list(sorted_languages.keys())[:5],
-            'language_count': len(sorted_languages),
-            'repositories_analyzed': min(len(repos), max_repos)
-        }
-        
-        cache.set(cache_key, result, settings.GITHUB_CACHE_TIMEOUT)
-        return result
+        return self.aggregate_account(max_repos)['languages']
     
     def get_account_technologies(self, max_repos=10):
         """
@@ -282,79 +564,84 @@ class GitHubService:
         Returns a comprehensive list of technologies used in the account.
         """
         cache_key = self._get_cache_key("account_technologies", max_repos)
-        cached_data = cache.get(cache_key)
+        cached_data = metrics.cache_get("account_technologies", cache_key)
         
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
         
-        repos = self.get_user_repos()
-        technology_stats = {}
-        
-        print(f"\n[GitHub Service] Analyzing technologies across {min(len(repos), max_repos)} repositories")
-        
-        for repo in repos[:max_repos]:
-            repo_name = repo.get('name')
-            topics = self.get_repo_topics(repo_name)
-            
-            if topics:
-                for topic in topics:
-                    if topic not in technology_stats:
-                        technology_stats[topic] = {
-                            'count': 0,
-                            'percentage': 0
-                        }
-                    technology_stats[topic]['count'] += 1
-        
-        # Calculate percentages
-        total_repos = min(len(repos), max_repos)
-        for tech in technology_stats:
-            if total_repos > 0:
-                technology_stats[tech]['percentage'] = round(
-                    (technology_stats[tech]['count'] / total_repos) * 100, 2
-                )
-        
-        # Sort by count (usage frequency)
-        sorted_technologies = dict(sorted(
-            technology_stats.items(),
-            key=lambda x: x[1]['count'],
-            reverse=True
-        ))
-        
-        result = {
-            'username': self.username,
-            'technologies': sorted_technologies,
-            'top_technologies': list(sorted_technologies.keys())[:10],
-            'technology_count': len(sorted_technologies),
-            'repositories_analyzed': total_repos
-        }
-        
-        cache.set(cache_key, result, settings.GITHUB_CACHE_TIMEOUT)
-        return result
+        return self.aggregate_account(max_repos)['technologies']
     
     def get_account_summary(self, max_repos=10):
         """
         Get comprehensive account summary including languages, technologies, and user info.
         """
         cache_key = self._get_cache_key("account_summary", max_repos)
-        cached_data = cache.get(cache_key)
+        cached_data = metrics.cache_get("account_summary", cache_key)
         
         if cached_data is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_data
         
-        user_info = self.get_user_info()
-        languages = self.get_account_programming_languages(max_repos)
-        technologies = self.get_account_technologies(max_repos)
-        repos = self.get_user_repos()
+        aggregate = self.aggregate_account(max_repos)
         
         result = {
-            'user_info': user_info,
-            'programming_languages': languages,
-            'technologies': technologies,
-            'total_repositories': len(repos),
-            'repositories_analyzed': min(len(repos), max_repos)
+            'user_info': aggregate['user_info'],
+            'programming_languages': aggregate['languages'],
+            'technologies': aggregate['technologies'],
+            'total_repositories': aggregate['total_repositories'],
+            'repositories_analyzed': aggregate['repositories_analyzed']
         }
         
-        cache.set(cache_key, result, settings.GITHUB_CACHE_TIMEOUT)
+        if not self.failed_fetches:
+            cache.set(cache_key, result, settings.GITHUB_CACHE_TIMEOUT)
         return result
+
+
+def get_bulk_account_summaries(usernames, max_repos=10, requester=None):
+    """
+    Fetch account summaries for many users concurrently.
+    All workers share the process-wide rate-limit budget and the Django cache, and run
+    in the caller's context (request id, timings, deadline).
+    Returns (summaries, not_found, errors): summaries and errors are dicts keyed by
+    username, not_found lists the users GitHub does not know. A user who is
+    temporarily unavailable (GitHub errors, rate limit, slow) only produces an entry
+    in errors, so the caller can retry them.
+    """
+    summaries = {}
+    missing = set()
+    errors = {}
+
+    def fetch(username):
+        try:
+            if GitHubService.rate_limit_exhausted():
+                raise RuntimeError("GitHub rate limit budget exhausted, try again later")
+            github_service = GitHubService(username, requester)
+            if github_service.get_user_info() is None:
+                if None in github_service.failed_fetches:
+                    raise RuntimeError(f"GitHub is temporarily unavailable for '{username}', try again later")
+                raise LookupError(f"GitHub user '{username}' not found")
+            return github_service.get_account_summary(max_repos)
+        finally:
+            # Account rollups are read from the database on this short-lived thread
+            connection.close()
+
+    executor = ThreadPoolExecutor(max_workers=getattr(settings, 'BULK_SUMMARY_CONCURRENCY', 8))
+    futures = {executor.submit(copy_context().run, fetch, username): username for username in usernames}
+    done, not_done = wait(futures, timeout=getattr(settings, 'BULK_SUMMARY_TIMEOUT', 60))
+    # Don't block the response on stragglers; they keep warming the cache in the background
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        username = futures[future]
+        try:
+            summaries[username] = future.result()
+        except LookupError:
+            missing.add(username)
+        except Exception as e:
+            errors[username] = str(e)
+    for future in not_done:
+        errors[futures[future]] = "Timed out fetching account summary"
+
+    not_found = [username for username in usernames if username in missing]
+    return summaries, not_found, errors
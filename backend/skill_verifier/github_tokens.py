@@ -0,0 +1,80 @@
+import base64
+import hashlib
+import logging
+import threading
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.conf import settings
+from django.utils import timezone
+
+from .models import GitHubUserToken
+
+logger = logging.getLogger(__name__)
+
+# Decrypted tokens kept briefly in process memory, so GitHub calls don't query the
+# database each time: username -> (token or None, expiry)
+_token_cache = {}
+_token_cache_lock = threading.Lock()
+_TOKEN_CACHE_SECONDS = 60
+
+
+def _fernet():
+    """Fernet with GITHUB_TOKEN_ENCRYPTION_KEY, or a key derived from SECRET_KEY"""
+    key = getattr(settings, 'GITHUB_TOKEN_ENCRYPTION_KEY', None)
+    if not key:
+        digest = hashlib.sha256(f"github-user-token:{settings.SECRET_KEY}".encode()).digest()
+        key = base64.urlsafe_b64encode(digest)
+    return Fernet(key)
+
+
+def _forget(github_username):
+    with _token_cache_lock:
+        _token_cache.pop(github_username.lower(), None)
+
+
+def store_user_token(github_username, access_token, github_id=None):
+    """Save (or replace) a user's OAuth token, encrypted"""
+    if not github_username or not access_token:
+        return
+    GitHubUserToken.objects.update_or_create(
+        github_username=github_username.lower(),
+        defaults={
+            'github_id': github_id,
+            'encrypted_token': _fernet().encrypt(access_token.encode()).decode(),
+            'invalid_at': None,
+        }
+    )
+    _forget(github_username)
+
+
+def get_user_token(github_username):
+    """The user's valid OAuth token, or None"""
+    username = github_username.lower()
+    now = time.monotonic()
+    with _token_cache_lock:
+        cached = _token_cache.get(username)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    token = None
+    encrypted = (
+        GitHubUserToken.objects
+        .filter(github_username=username, invalid_at__isnull=True)
+        .values_list('encrypted_token', flat=True)
+        .first()
+    )
+    if encrypted:
+        try:
+            token = _fernet().decrypt(encrypted.encode()).decode()
+        except InvalidToken:
+            logger.warning("Stored GitHub token for %s cannot be decrypted (encryption key changed?)", username)
+    with _token_cache_lock:
+        _token_cache[username] = (token, now + _TOKEN_CACHE_SECONDS)
+    return token
+
+
+def mark_token_invalid(github_username):
+    """Stop using a token GitHub rejected"""
+    GitHubUserToken.objects.filter(github_username=github_username.lower()).update(invalid_at=timezone.now())
+    _forget(github_username)
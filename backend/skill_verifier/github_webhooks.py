@@ -0,0 +1,59 @@
+import hashlib
+import hmac
+import logging
+
+from django.conf import settings
+
+from . import metrics
+from .cache_invalidation import invalidate_repo
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_github_webhooks_total', 'GitHub webhook deliveries, by event and result')
+
+# repository event actions that change what is cached about the repository
+# (topics, description and visibility edits arrive as 'edited' / 'publicized' / 'privatized')
+REPOSITORY_ACTIONS = {
+    'created', 'deleted', 'archived', 'unarchived', 'edited', 'renamed',
+    'transferred', 'publicized', 'privatized',
+}
+
+
+def valid_signature(body, signature):
+    """Check X-Hub-Signature-256 against the HMAC-SHA256 of the raw body with GITHUB_WEBHOOK_SECRET"""
+    secret = getattr(settings, 'GITHUB_WEBHOOK_SECRET', '')
+    if not secret or not signature or not signature.startswith('sha256='):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len('sha256='):])
+
+
+def handle_event(event, payload):
+    """
+    Invalidate the cache entries a GitHub event makes stale. Returns the invalidated
+    repositories as "owner/name" strings (empty for events that change nothing cached).
+    """
+    repository = payload.get('repository') or {}
+    owner = (repository.get('owner') or {}).get('login')
+    name = repository.get('name')
+    invalidated = []
+
+    if event == 'push' and owner and name:
+        invalidate_repo(owner, name)
+        invalidated.append(f"{owner}/{name}")
+    elif event == 'repository' and owner and name and payload.get('action') in REPOSITORY_ACTIONS:
+        invalidate_repo(owner, name)
+        invalidated.append(f"{owner}/{name}")
+        old_name = ((payload.get('changes') or {}).get('repository') or {}).get('name', {}).get('from')
+        if old_name:
+            invalidate_repo(owner, old_name)
+            invalidated.append(f"{owner}/{old_name}")
+        old_owner = ((payload.get('changes') or {}).get('owner') or {}).get('from', {}).get('user', {}).get('login')
+        if old_owner:
+            # Transferred: the repository left the previous owner's listing
+            invalidate_repo(old_owner, name)
+            invalidated.append(f"{old_owner}/{name}")
+
+    metrics.inc('skillverify_github_webhooks_total', {'event': event, 'result': 'invalidated' if invalidated else 'ignored'})
+    logger.info("GitHub %s webhook invalidated %s", event, invalidated or "nothing")
+    return invalidated
@@ -0,0 +1,65 @@
+import json
+import logging
+import re
+import uuid
+import zlib
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# Correlation id of the request being handled, attached to every log record
+request_id_var = ContextVar('request_id', default='-')
+
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9\-_.]{1,64}$')
+
+
+def new_request_id(incoming=None):
+    """Reuse a well-formed incoming X-Request-ID, otherwise generate one"""
+    if incoming and _VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestIdFilter(logging.Filter):
+    """Add the current request id to each record as `request_id`"""
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; the message is only formatted when a handler emits it"""
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _request_sampled(rate):
+    """Sample whole requests so every payload of a sampled request is logged together"""
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    bucket = zlib.crc32(request_id_var.get().encode()) % 10000
+    return bucket < rate * 10000
+
+
+def log_payload(logger, label, payload):
+    """
+    Dump a large payload as pretty JSON at DEBUG level. Nothing is serialized unless
+    LOG_PAYLOADS is on, the logger is enabled for DEBUG and the request is sampled.
+    """
+    if not getattr(settings, 'LOG_PAYLOADS', False) or not logger.isEnabledFor(logging.DEBUG):
+        return
+    if not _request_sampled(getattr(settings, 'LOG_PAYLOAD_SAMPLE_RATE', 1.0)):
+        return
+    logger.debug("%s:\n%s", label, json.dumps(payload, indent=2, default=str))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from skill_verifier.models import SkillVerification
+from skill_verifier.skill_index import index_verification
+
+
+class Command(BaseCommand):
+    help = "Build the normalized skill index (VerificationSkill rows) for stored verifications"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Re-index verifications that already have rows")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        verifications = SkillVerification.objects.only('id', 'verification_result').order_by('id')
+        if not options['rebuild']:
+            verifications = verifications.filter(skill_entries__isnull=True)
+
+        indexed = rows = 0
+        for verification in verifications.iterator(chunk_size=options['batch_size']):
+            rows += index_verification(verification)
+            indexed += 1
+            if indexed % options['batch_size'] == 0:
+                self.stdout.write(f"Indexed {indexed} verifications...")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} verifications ({rows} skill rows)"))
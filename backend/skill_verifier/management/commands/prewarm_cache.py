@@ -0,0 +1,111 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from skill_verifier.github_service import GitHubService
+from skill_verifier.models import SkillVerification
+from skill_verifier.prewarm import prewarm_user_in_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Prefetch GitHub data, account aggregates and the GitHub skill analysis for a list of users. "
+        "Schedule it (e.g. cron every 20 minutes with --refresh --recent-days 7) to keep entries warm "
+        "before GITHUB_CACHE_TIMEOUT expires them, or pass --every to keep running. "
+        "Cached entries reach the web server only through a cache shared between processes, "
+        "so the command refuses to run unless CACHE_DIR is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help="GitHub usernames to prewarm")
+        parser.add_argument('--file', help="File with one username per line ('-' for stdin)")
+        parser.add_argument('--recent-days', type=int, help="Also prewarm users verified in the last N days")
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'PREWARM_CONCURRENCY', 4))
+        parser.add_argument('--no-analysis', action='store_true', help="Skip the LLM GitHub skill analysis")
+        parser.add_argument('--refresh', action='store_true', help="Refetch and overwrite entries that are still cached")
+        parser.add_argument('--every', type=int, metavar='SECONDS', help="Repeat every N seconds until interrupted")
+
+    def _usernames(self, options):
+        usernames = list(options['usernames'])
+        if options['file']:
+            stream = sys.stdin if options['file'] == '-' else open(options['file'])
+            with stream:
+                usernames.extend(line.strip() for line in stream if line.strip() and not line.startswith('#'))
+        if options['recent_days']:
+            since = timezone.now() - timedelta(days=options['recent_days'])
+            usernames.extend(
+                SkillVerification.objects
+                .filter(created_at__gte=since)
+                .order_by('github_username')
+                .values_list('github_username', flat=True)
+                .distinct()
+            )
+        return list(dict.fromkeys(usernames))
+
+    def handle(self, *args, **options):
+        # Entries written to this process's memory would be lost when it exits
+        if isinstance(caches['default'], LocMemCache):
+            raise CommandError(
+                "The cache is per process, so prewarmed entries would never reach the server: "
+                "set CACHE_DIR to share the cache between processes"
+            )
+        usernames = self._usernames(options)
+        if not usernames:
+            raise CommandError("No usernames given (pass usernames, --file or --recent-days)")
+
+        while True:
+            self._run(usernames, options)
+            if not options['every']:
+                break
+            time.sleep(options['every'])
+            # Pick up newly verified users on the next round
+            usernames = self._usernames(options)
+
+    def _run(self, usernames, options):
+        start = time.perf_counter()
+        done = ok = failed = skipped = 0
+        lock = threading.Lock()
+        stop = threading.Event()
+        total = len(usernames)
+
+        def work(username):
+            # Leave the remaining GitHub quota to live traffic
+            if stop.is_set() or GitHubService.rate_limit_exhausted():
+                stop.set()
+                return None
+            return prewarm_user_in_worker(
+                username,
+                analyze=not options['no_analysis'],
+                refresh=options['refresh']
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as pool:
+            futures = {pool.submit(work, username): username for username in usernames}
+            for future in as_completed(futures):
+                username = futures[future]
+                with lock:
+                    done += 1
+                    try:
+                        steps = future.result()
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"[{done}/{total}] {username}: {e}")
+                        continue
+                    if steps is None:
+                        skipped += 1
+                        self.stdout.write(f"[{done}/{total}] {username}: skipped (GitHub rate limit reserve reached)")
+                        continue
+                    ok += 1
+                    timings = ", ".join(f"{name}={seconds}s" for name, seconds in steps.items())
+                    self.stdout.write(f"[{done}/{total}] {username}: {timings}")
+
+        summary = f"Prewarmed {ok}/{total} users in {time.perf_counter() - start:.1f}s ({failed} failed, {skipped} skipped)"
+        self.stdout.write(self.style.SUCCESS(summary) if not failed else self.style.WARNING(summary))
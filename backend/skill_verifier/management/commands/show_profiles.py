@@ -0,0 +1,38 @@
+import io
+import pstats
+
+from django.core.management.base import BaseCommand
+
+from skill_verifier.profiling import _profile_dir, load_index
+
+
+class Command(BaseCommand):
+    help = "List stored request profiles (slowest first) or print the hot spots of one profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', help="Only show profiles for this endpoint (URL name or path)")
+        parser.add_argument('--limit', type=int, default=20, help="Number of profiles or functions to show")
+        parser.add_argument('--file', help="Print the top functions of this profile file")
+        parser.add_argument('--sort', default='cumulative', help="pstats sort key used with --file")
+
+    def handle(self, *args, **options):
+        if options['file']:
+            output = io.StringIO()
+            stats = pstats.Stats(str(_profile_dir() / options['file']), stream=output)
+            stats.sort_stats(options['sort']).print_stats(options['limit'])
+            self.stdout.write(output.getvalue())
+            return
+
+        entries = load_index()
+        if options['endpoint']:
+            entries = [entry for entry in entries if entry['endpoint'] == options['endpoint']]
+        if not entries:
+            self.stdout.write("No profiles stored.")
+            return
+
+        for entry in entries[:options['limit']]:
+            upstream = ", ".join(f"{stage}={ms}ms" for stage, ms in entry['upstream_ms'].items()) or "none"
+            self.stdout.write(
+                f"{entry['duration_ms']:>9}ms  cpu={entry['cpu_ms']}ms  {entry['method']} {entry['endpoint']} "
+                f"[{entry['status']}]  upstream: {upstream}  {entry['file']}"
+            )
@@ -0,0 +1,209 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+
+
+# Process-local metric registry rendered in the Prometheus text format.
+# Each worker process keeps its own counts, so scrape every worker (or run one).
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_counters = {}    # name -> {label tuple: value}
+_histograms = {}  # name -> {label tuple: [bucket counts..., sum, count]}
+_gauges = {}      # name -> {label tuple: value}
+_help = {}
+
+# Spans recorded during the current request, used for the Server-Timing header
+_request_timings = ContextVar('request_timings', default=None)
+
+# Set while refreshing caches: lookups miss so values are recomputed and overwritten
+_cache_refresh = ContextVar('cache_refresh', default=False)
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+def describe(name, help_text):
+    _help[name] = help_text
+
+
+def inc(name, labels=None, value=1):
+    """Increment a counter"""
+    key = _label_key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+
+def set_gauge(name, value, labels=None):
+    """Set a gauge to its current value"""
+    key = _label_key(labels)
+    with _lock:
+        _gauges.setdefault(name, {})[key] = value
+
+
+def observe(name, value, labels=None):
+    """Record a value in a histogram"""
+    key = _label_key(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        if key not in series:
+            series[key] = [0] * len(DEFAULT_BUCKETS) + [0.0, 0]
+        data = series[key]
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if value <= bound:
+                data[i] += 1
+        data[-2] += value
+        data[-1] += 1
+
+
+def get_counter(name, labels=None):
+    with _lock:
+        return _counters.get(name, {}).get(_label_key(labels), 0)
+
+
+describe('skillverify_stage_duration_seconds', 'Time spent in each pipeline stage')
+describe('skillverify_cache_requests_total', 'Cache lookups by namespace and result')
+describe('skillverify_upstream_responses_total', 'Upstream responses by service and status')
+describe('skillverify_upstream_request_duration_seconds', 'Upstream request latency by service')
+
+
+@contextmanager
+def timed(stage):
+    """Time a block, record it as a stage histogram and add it to the request's Server-Timing"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe('skillverify_stage_duration_seconds', elapsed, {'stage': stage})
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+class _UpstreamCall:
+    status = 'error'
+
+
+@contextmanager
+def upstream_call(service, stage):
+    """
+    Time a call to an upstream service. Set `.status` on the yielded object
+    to the HTTP status code; it stays 'error' if the block raises.
+    """
+    call = _UpstreamCall()
+    start = time.perf_counter()
+    with timed(stage):
+        try:
+            yield call
+        finally:
+            elapsed = time.perf_counter() - start
+            inc('skillverify_upstream_responses_total', {'service': service, 'status': str(call.status)})
+            observe('skillverify_upstream_request_duration_seconds', elapsed, {'service': service})
+
+
+def record_cache(namespace, hit):
+    inc('skillverify_cache_requests_total', {'namespace': namespace, 'result': 'hit' if hit else 'miss'})
+
+
+def cache_get(namespace, key):
+    """cache.get that also counts hits and misses for the namespace"""
+    if _cache_refresh.get():
+        inc('skillverify_cache_requests_total', {'namespace': namespace, 'result': 'refresh'})
+        return None
+    value = cache.get(key)
+    record_cache(namespace, value is not None)
+    return value
+
+
+@contextmanager
+def cache_refresh():
+    """Treat every cache_get in this block as a miss, so the values are fetched again and re-cached"""
+    token = _cache_refresh.set(True)
+    try:
+        yield
+    finally:
+        _cache_refresh.reset(token)
+
+
+def refreshing_cache():
+    return _cache_refresh.get()
+
+
+def current_timings():
+    """The live list of spans for the current request, or None outside a request"""
+    return _request_timings.get()
+
+
+def start_request():
+    return _request_timings.set([])
+
+
+def finish_request(token):
+    """Return the spans recorded during this request and reset the context"""
+    timings = _request_timings.get() or []
+    _request_timings.reset(token)
+    return timings
+
+
+def server_timing_header(timings, total=None):
+    """Build a Server-Timing header value, merging repeated stages into one entry"""
+    merged = {}
+    for stage, elapsed in timings:
+        duration, count = merged.get(stage, (0.0, 0))
+        merged[stage] = (duration + elapsed, count + 1)
+    parts = []
+    for stage, (duration, count) in merged.items():
+        entry = f"{stage};dur={duration * 1000:.1f}"
+        if count > 1:
+            entry += f';desc="{count} calls"'
+        parts.append(entry)
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + list(extra or [])
+    if not pairs:
+        return ""
+    escaped = ",".join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pairs
+    )
+    return "{" + escaped + "}"
+
+
+def render_prometheus():
+    """Render all metrics in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        for name in sorted(_counters):
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(_counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        for name in sorted(_gauges):
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in sorted(_gauges[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        for name in sorted(_histograms):
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, data in sorted(_histograms[name].items()):
+                for bound, count in zip(DEFAULT_BUCKETS, data):
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {data[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {data[-2]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {data[-1]}")
+    return "\n".join(lines) + "\n"
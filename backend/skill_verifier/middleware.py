@@ -0,0 +1,60 @@
+import time
+
+from . import metrics
+from .cache_invalidation import request_generations
+from .log import new_request_id, request_id_var
+
+
+class RequestIdMiddleware:
+    """
+    Tag each request with a correlation id (taken from X-Request-ID when valid)
+    that is attached to every log record and echoed back in the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = new_request_id(request.headers.get('X-Request-ID'))
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response['X-Request-ID'] = request_id
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Collect the pipeline stage spans recorded while handling a request and
+    report them in a Server-Timing response header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = metrics.finish_request(token)
+        if not response.streaming:
+            response['Server-Timing'] = metrics.server_timing_header(timings, time.perf_counter() - start)
+        return response
+
+
+class CacheGenerationMiddleware:
+    """
+    Read each cache generation (see cache_invalidation.key_version) once per request
+    instead of on every cache key the request builds.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_generations():
+            return self.get_response(request)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 06:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0002_alter_skillverification_hash_value'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillverification',
+            name='batch_id',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+        migrations.CreateModel(
+            name='BatchItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.CharField(max_length=32)),
+                ('index', models.PositiveIntegerField()),
+                ('resume_file_name', models.CharField(max_length=255)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('verification', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='batch_items', to='skill_verifier.skillverification')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('batch_id', 'index'), name='unique_batch_item')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0003_skillverification_batch_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillverification',
+            name='github_data_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='skillverification',
+            name='resume_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='skillverification',
+            index=models.Index(fields=['github_username', 'resume_hash', '-created_at'], name='verification_reuse_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 07:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0004_verification_reuse_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('display_name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VerificationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('verified', 'Verified'), ('unverified', 'Unverified'), ('additional', 'Additional')], max_length=10)),
+                ('strength', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='verification_entries', to='skill_verifier.skill')),
+                ('verification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_entries', to='skill_verifier.skillverification')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'status', 'strength'], name='skill_status_strength_idx')],
+                'constraints': [models.UniqueConstraint(fields=('verification', 'skill', 'status'), name='unique_verification_skill_status')],
+            },
+        ),
+    ]
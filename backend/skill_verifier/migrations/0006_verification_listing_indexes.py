@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-19 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0005_skill_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillverification',
+            index=models.Index(fields=['-created_at', '-id'], name='verification_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillverification',
+            index=models.Index(fields=['github_username', '-created_at', '-id'], name='verification_user_created_idx'),
+        ),
+    ]
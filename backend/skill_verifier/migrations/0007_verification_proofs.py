@@ -0,0 +1,94 @@
+import hashlib
+import hmac
+import secrets
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copy of skill_verifier.proofs.generate_proof as of this migration, so later
+# changes to the proof format don't change what the backfill writes.
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+def _verified_skill_names(verification_result):
+    names = set()
+    for verified in verification_result.get('verified_skills', []):
+        name = verified.get('skill') if isinstance(verified, dict) else verified
+        if name:
+            names.add(" ".join(str(name).split()).lower())
+    return sorted(names)
+
+
+def _leaf_salt(salt, skill):
+    return hmac.new(settings.SECRET_KEY.encode(), f"{salt}:{skill}".encode(), hashlib.sha256).digest()[:16]
+
+
+def _merkle_root(salt, skills):
+    if not skills:
+        return _sha256(b'\x03', salt.encode())
+    level = [_sha256(b'\x00', _leaf_salt(salt, skill), skill.encode()) for skill in skills]
+    while len(level) > 1:
+        parents = [_sha256(b'\x01', level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        level = parents
+    return level[0]
+
+
+def generate_proof(github_username, verification_result):
+    salt = secrets.token_hex(16)
+    root = _merkle_root(salt, _verified_skill_names(verification_result))
+    return salt, root.hex(), _sha256(b'\x02', github_username.encode(), b'\x00', root).hex()
+
+
+def backfill_proofs(apps, schema_editor):
+    SkillVerification = apps.get_model('skill_verifier', 'SkillVerification')
+    verifications = SkillVerification.objects.filter(proof_hash__isnull=True).only(
+        'id', 'github_username', 'verification_result'
+    )
+    for verification in verifications.iterator(chunk_size=500):
+        salt, root, proof_hash = generate_proof(verification.github_username, verification.verification_result or {})
+        SkillVerification.objects.filter(id=verification.id).update(
+            proof_salt=salt, merkle_root=root, proof_hash=proof_hash
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0006_verification_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skillverification',
+            name='hash_value',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='skillverification',
+            name='proof_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='skillverification',
+            name='proof_salt',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='skillverification',
+            name='merkle_root',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_proofs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='skillverification',
+            name='proof_hash',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0007_verification_proofs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('github_username', models.CharField(max_length=100)),
+                ('max_repos', models.PositiveIntegerField()),
+                ('user_info', models.JSONField(blank=True, null=True)),
+                ('total_repositories', models.PositiveIntegerField(default=0)),
+                ('language_bytes', models.JSONField(default=dict)),
+                ('language_repo_counts', models.JSONField(default=dict)),
+                ('topic_counts', models.JSONField(default=dict)),
+                ('repo_versions', models.JSONField(default=dict)),
+                ('repo_stats', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('github_username', 'max_repos'), name='unique_account_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_verifier', '0008_account_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubUserToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('github_username', models.CharField(max_length=100, unique=True)),
+                ('github_id', models.BigIntegerField(blank=True, null=True)),
+                ('encrypted_token', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('invalid_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
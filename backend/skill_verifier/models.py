@@ -7,8 +7,116 @@ class SkillVerification(models.Model):
     resume_skills = models.JSONField(default=list)
     github_skills = models.JSONField(default=list)
     verification_result = models.JSONField(default=dict)
-    hash_value = models.CharField(max_length=255)
+    hash_value = models.CharField(max_length=255, db_index=True)
+    # Salted Merkle root over the verified skills, bound to the username (see proofs.py)
+    proof_hash = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    proof_salt = models.CharField(max_length=32, blank=True, default='')
+    merkle_root = models.CharField(max_length=64, blank=True, default='')
+    batch_id = models.CharField(max_length=32, null=True, blank=True, db_index=True)
+    # Content hash of the resume PDF and version of the GitHub data the result was computed from
+    resume_hash = models.CharField(max_length=64, blank=True, default='')
+    github_data_version = models.CharField(max_length=64, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['github_username', 'resume_hash', '-created_at'], name='verification_reuse_idx'),
+            models.Index(fields=['-created_at', '-id'], name='verification_created_idx'),
+            models.Index(fields=['github_username', '-created_at', '-id'], name='verification_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Verification for {self.github_username}"
+
+
+# One submitted resume of a batch. Items answered from the cache, from a stored
+# verification or by a duplicate PDF link to a verification another request created.
+class BatchItem(models.Model):
+    batch_id = models.CharField(max_length=32)
+    index = models.PositiveIntegerField()  # position of the resume in the upload
+    resume_file_name = models.CharField(max_length=255)
+    verification = models.ForeignKey(SkillVerification, on_delete=models.SET_NULL, null=True, blank=True, related_name='batch_items')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['batch_id', 'index'], name='unique_batch_item'),
+        ]
+
+    def __str__(self):
+        return f"Batch {self.batch_id} item {self.index}"
+
+
+# Canonical skill names shared by all verifications
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)  # canonical (lowercased, normalized) name
+    display_name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.display_name
+
+
+# Normalized per-skill rows of a verification, maintained on write for indexed search
+class VerificationSkill(models.Model):
+    VERIFIED = 'verified'
+    UNVERIFIED = 'unverified'
+    ADDITIONAL = 'additional'
+    STATUS_CHOICES = [
+        (VERIFIED, 'Verified'),
+        (UNVERIFIED, 'Unverified'),
+        (ADDITIONAL, 'Additional'),
+    ]
+
+    verification = models.ForeignKey(SkillVerification, on_delete=models.CASCADE, related_name='skill_entries')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='verification_entries')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    strength = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['verification', 'skill', 'status'], name='unique_verification_skill_status'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'status', 'strength'], name='skill_status_strength_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.skill} ({self.status}) in verification {self.verification_id}"
+
+
+# Per-user account aggregates, refreshed incrementally as repositories change
+class AccountRollup(models.Model):
+    github_username = models.CharField(max_length=100)
+    max_repos = models.PositiveIntegerField()
+    user_info = models.JSONField(null=True, blank=True)
+    total_repositories = models.PositiveIntegerField(default=0)
+    language_bytes = models.JSONField(default=dict)        # language -> bytes
+    language_repo_counts = models.JSONField(default=dict)  # language -> repos using it
+    topic_counts = models.JSONField(default=dict)          # topic -> repos tagged with it
+    # repo name -> version the stats were computed from, and that repo's own contribution
+    repo_versions = models.JSONField(default=dict)
+    repo_stats = models.JSONField(default=dict)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['github_username', 'max_repos'], name='unique_account_rollup'),
+        ]
+
+    def __str__(self):
+        return f"Account rollup for {self.github_username} ({self.max_repos} repos)"
+
+
+# OAuth access tokens of logged-in users, encrypted at rest (see github_tokens.py)
+class GitHubUserToken(models.Model):
+    github_username = models.CharField(max_length=100, unique=True)
+    github_id = models.BigIntegerField(null=True, blank=True)
+    encrypted_token = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set when GitHub rejects the token; it is not used again until the user logs in again
+    invalid_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
-        return f"Verification for {self.github_username}"
\ No newline at end of file
+        return f"GitHub token for {self.github_username}"
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from . import metrics
+from .github_service import GitHubService
+from .skill_analyzer import SkillAnalyzer
+
+logger = logging.getLogger(__name__)
+
+metrics.describe('skillverify_prewarm_users_total', 'Users prewarmed, by outcome')
+metrics.describe('skillverify_login_prefetch_total', 'Login prefetch requests, by result')
+
+# Background prefetch started at login, shared by all requests of this process
+_login_pool = None
+_login_pool_lock = threading.Lock()
+_login_pending = set()
+
+
+def prewarm_user(github_username, account_max_repos=None, analyze=True, refresh=False, requester=None):
+    """
+    Fill the caches a verification and the account endpoints read for one user: the
+    verification's GitHub data, the account rollups and, with analyze, the LLM GitHub
+    skill analysis. With refresh, cached values are fetched again and overwritten, so a
+    scheduled run extends entries before they expire. GitHub calls use the requester's
+    own token when one is given. Returns the warmed steps with their durations in seconds.
+    """
+    if account_max_repos is None:
+        account_max_repos = getattr(settings, 'PREWARM_ACCOUNT_MAX_REPOS', [5, 20])
+
+    steps = {}
+
+    def step(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        steps[name] = round(time.perf_counter() - start, 3)
+        return result
+
+    github_service = GitHubService(github_username, requester)
+    with metrics.cache_refresh() if refresh else nullcontext():
+        if step('user_info', github_service.get_user_info) is None:
+            raise LookupError(f"GitHub user '{github_username}' not found")
+        github_data = step('github_data', lambda: github_service.get_all_github_data(fields=SkillAnalyzer.GITHUB_FIELDS))
+        for max_repos in account_max_repos:
+            step(f'account_summary_{max_repos}', github_service.get_account_summary, max_repos)
+        if analyze:
+            step('github_skills', SkillAnalyzer().analyze_github_skills, github_data, github_service.failed_fetches)
+    return steps
+
+
+def prewarm_user_in_worker(github_username, **kwargs):
+    """prewarm_user for a worker thread: records the outcome and closes the thread's DB connection"""
+    try:
+        steps = prewarm_user(github_username, **kwargs)
+        metrics.inc('skillverify_prewarm_users_total', {'outcome': 'ok'})
+        return steps
+    except Exception:
+        metrics.inc('skillverify_prewarm_users_total', {'outcome': 'error'})
+        raise
+    finally:
+        connection.close()
+
+
+def _login_executor():
+    global _login_pool
+    with _login_pool_lock:
+        if _login_pool is None:
+            _login_pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'LOGIN_PREFETCH_WORKERS', 2),
+                thread_name_prefix='login-prefetch'
+            )
+        return _login_pool
+
+
+def _login_prefetch(github_username, requester):
+    try:
+        steps = prewarm_user_in_worker(github_username, account_max_repos=[], requester=requester)
+        logger.info("Prefetched GitHub data for %s at login: %s", github_username, steps)
+    except Exception as e:
+        logger.warning("Login prefetch for %s failed: %s", github_username, e)
+    finally:
+        with _login_pool_lock:
+            _login_pending.discard(github_username)
+
+
+def schedule_login_prefetch(github_username, oauth=False):
+    """
+    Start fetching the user's GitHub data and GitHub skill analysis in the background,
+    so the verification that usually follows a login finds them cached. With oauth (the
+    user just proved the account through GitHub OAuth) it uses their own token. Never blocks:
+    returns False when prefetch is disabled, already running or recently done for this
+    user, or too many prefetches are queued.
+    """
+    if not github_username or not getattr(settings, 'LOGIN_PREFETCH', False):
+        return False
+
+    with _login_pool_lock:
+        if github_username in _login_pending:
+            metrics.inc('skillverify_login_prefetch_total', {'result': 'in_progress'})
+            return False
+        if len(_login_pending) >= getattr(settings, 'LOGIN_PREFETCH_MAX_PENDING', 20):
+            metrics.inc('skillverify_login_prefetch_total', {'result': 'queue_full'})
+            return False
+        # At most one prefetch per user per cooldown, across repeated logins
+        if not cache.add(f"login_prefetch_{github_username}", True, getattr(settings, 'LOGIN_PREFETCH_COOLDOWN', 300)):
+            metrics.inc('skillverify_login_prefetch_total', {'result': 'recent'})
+            return False
+        _login_pending.add(github_username)
+
+    metrics.inc('skillverify_login_prefetch_total', {'result': 'scheduled'})
+    _login_executor().submit(_login_prefetch, github_username, github_username if oauth else None)
+    return True
@@ -0,0 +1,144 @@
+import cProfile
+import json
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from . import metrics
+from .log import request_id_var
+
+logger = logging.getLogger(__name__)
+
+# cProfile can only profile one request at a time per process
+_profiler_lock = threading.Lock()
+# Guards the index file and rotation
+_index_lock = threading.Lock()
+
+INDEX_FILE = 'index.jsonl'
+
+
+def _profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def _upstream_stage(stage):
+    return stage == 'github' or stage.startswith('llm_')
+
+
+class ProfilingMiddleware:
+    """
+    Run a sample of requests under cProfile and store the stats on disk.
+
+    A request is profiled when it falls inside PROFILING_SAMPLE_RATE or sends the
+    PROFILING_HEADER header (in DEBUG, or with the value of PROFILING_TOKEN).
+    Each profile is a pstats file plus one line in index.jsonl with the endpoint,
+    total duration, CPU time of the request's thread (the one cProfile sees, so work
+    handed to worker threads is not included) and the wall-clock time spent waiting
+    on GitHub and the LLM (taken from the metrics spans). Only the newest
+    PROFILING_MAX_FILES profiles are kept.
+
+    Must run inside ServerTimingMiddleware so upstream spans are collected.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _should_profile(self, request):
+        header_value = request.headers.get(getattr(settings, 'PROFILING_HEADER', 'X-Profile'))
+        if header_value:
+            token = getattr(settings, 'PROFILING_TOKEN', '')
+            if settings.DEBUG or (token and header_value == token):
+                return True
+        return random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+
+    def __call__(self, request):
+        if not self._should_profile(request) or not _profiler_lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            timings = metrics.current_timings()
+            first_span = len(timings) if timings is not None else 0
+            profiler = cProfile.Profile()
+            start_wall = time.perf_counter()
+            # Other requests run in other threads of this process: count only this one
+            start_cpu = time.thread_time()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start_wall
+            cpu_time = time.thread_time() - start_cpu
+
+            upstream = {}
+            for stage, elapsed in (timings or [])[first_span:]:
+                if _upstream_stage(stage):
+                    upstream[stage] = upstream.get(stage, 0.0) + elapsed
+
+            try:
+                self._store(request, response, profiler, duration, cpu_time, upstream)
+            except OSError as e:
+                logger.warning("Could not store request profile: %s", e)
+            return response
+        finally:
+            _profiler_lock.release()
+
+    def _store(self, request, response, profiler, duration, cpu_time, upstream):
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.url_name if match and match.url_name else request.path
+        slug = re.sub(r'[^A-Za-z0-9_-]+', '-', endpoint).strip('-') or 'root'
+        duration_ms = round(duration * 1000, 1)
+
+        directory = _profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        file_name = f"{time.strftime('%Y%m%dT%H%M%S')}_{int(time.time() * 1000) % 1000:03d}_{slug}_{int(duration_ms)}ms.prof"
+        profiler.dump_stats(str(directory / file_name))
+
+        entry = {
+            'file': file_name,
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': duration_ms,
+            'cpu_ms': round(cpu_time * 1000, 1),
+            'upstream_ms': {stage: round(elapsed * 1000, 1) for stage, elapsed in upstream.items()},
+            'request_id': request_id_var.get(),
+            'timestamp': time.time(),
+        }
+        with _index_lock:
+            with open(directory / INDEX_FILE, 'a') as index:
+                index.write(json.dumps(entry) + "\n")
+            self._rotate(directory)
+        logger.info("Stored profile %s (%s %sms)", file_name, endpoint, duration_ms)
+
+    def _rotate(self, directory):
+        """Delete the oldest profiles beyond PROFILING_MAX_FILES and drop them from the index"""
+        max_files = getattr(settings, 'PROFILING_MAX_FILES', 200)
+        profiles = sorted(directory.glob('*.prof'))
+        if len(profiles) <= max_files:
+            return
+        removed = set()
+        for path in profiles[:len(profiles) - max_files]:
+            path.unlink(missing_ok=True)
+            removed.add(path.name)
+        index_path = directory / INDEX_FILE
+        kept = [
+            line for line in index_path.read_text().splitlines()
+            if line and json.loads(line).get('file') not in removed
+        ]
+        index_path.write_text("".join(line + "\n" for line in kept))
+
+
+def load_index(directory=None):
+    """Read the profile index, slowest requests first"""
+    index_path = Path(directory or _profile_dir()) / INDEX_FILE
+    if not index_path.exists():
+        return []
+    entries = [json.loads(line) for line in index_path.read_text().splitlines() if line]
+    return sorted(entries, key=lambda entry: entry['duration_ms'], reverse=True)
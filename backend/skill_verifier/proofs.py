@@ -0,0 +1,118 @@
+"""
+Merkle proofs over the verified skills of a verification.
+
+Each verified skill becomes a leaf:
+
+    leaf = sha256(0x00 || leaf_salt || normalized_skill)
+
+where normalized_skill is the lowercased name with whitespace collapsed and
+leaf_salt is a per-skill salt derived from the verification's random salt
+(so revealing one leaf's salt says nothing about the other skills). Leaves are
+sorted and paired as sha256(0x01 || left || right); an odd node is carried up
+unchanged. The proof hash binds the root to the GitHub username:
+
+    proof_hash = sha256(0x02 || username || 0x00 || root)
+
+A third party holding a proof_hash can check a single skill with the
+{leaf_salt, path, root} returned by /api/verify-hash/<hash>/?skill=<name>:
+recompute the leaf, fold the path into the root, then recompute proof_hash.
+"""
+import hashlib
+import hmac
+import secrets
+
+from django.conf import settings
+
+
+def normalize_skill(name):
+    return " ".join(str(name).split()).lower()
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+def leaf_salt(salt, skill):
+    """Per-skill salt derived from the verification salt and the server secret"""
+    return hmac.new(settings.SECRET_KEY.encode(), f"{salt}:{skill}".encode(), hashlib.sha256).digest()[:16]
+
+
+def leaf_hash(salt_bytes, skill):
+    return _sha256(b'\x00', salt_bytes, skill.encode())
+
+
+def node_hash(left, right):
+    return _sha256(b'\x01', left, right)
+
+
+def verified_skill_names(verification_result):
+    """Sorted, de-duplicated normalized names of the verified skills"""
+    names = set()
+    for verified in verification_result.get('verified_skills', []):
+        name = verified.get('skill') if isinstance(verified, dict) else verified
+        if name:
+            names.add(normalize_skill(name))
+    return sorted(names)
+
+
+def _levels(leaves):
+    """All tree levels, from the leaves up to the root"""
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(salt, skills):
+    if not skills:
+        return _sha256(b'\x03', salt.encode())
+    return _levels([leaf_hash(leaf_salt(salt, skill), skill) for skill in skills])[-1][0]
+
+
+def proof_hash(github_username, root):
+    return _sha256(b'\x02', github_username.encode(), b'\x00', root).hex()
+
+
+def generate_proof(github_username, verification_result):
+    """Return (salt, merkle_root hex, proof_hash) for a new verification"""
+    salt = secrets.token_hex(16)
+    root = merkle_root(salt, verified_skill_names(verification_result))
+    return salt, root.hex(), proof_hash(github_username, root)
+
+
+def skill_proof(salt, skills, skill):
+    """Inclusion proof for one skill, or None when it is not in the verified set"""
+    skill = normalize_skill(skill)
+    if skill not in skills:
+        return None
+    levels = _levels([leaf_hash(leaf_salt(salt, name), name) for name in skills])
+    index = skills.index(skill)
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append({'hash': level[sibling].hex(), 'position': 'left' if sibling < index else 'right'})
+        index //= 2
+    return {
+        'skill': skill,
+        'leaf_salt': leaf_salt(salt, skill).hex(),
+        'leaf': levels[0][skills.index(skill)].hex(),
+        'path': path,
+        'root': levels[-1][0].hex(),
+    }
+
+
+def verify_skill_proof(github_username, expected_proof_hash, proof):
+    """Check an inclusion proof the way a third party would"""
+    current = leaf_hash(bytes.fromhex(proof['leaf_salt']), normalize_skill(proof['skill']))
+    for step in proof['path']:
+        sibling = bytes.fromhex(step['hash'])
+        current = node_hash(sibling, current) if step['position'] == 'left' else node_hash(current, sibling)
+    return current.hex() == proof['root'] and proof_hash(github_username, current) == expected_proof_hash
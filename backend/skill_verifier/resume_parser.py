@@ -1,4 +1,5 @@
 
+import logging
 import PyPDF2
 import re
 import io
@@ -7,10 +8,15 @@ import requests
 import hashlib
 from django.core.cache import cache
 
+from . import deadline, metrics
+from .cache_invalidation import key_version
+
+logger = logging.getLogger(__name__)
+
 class ResumeParser:
     def __init__(self):
         self.api_key = settings.OPENROUTER_API_KEY
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.base_url = getattr(settings, 'OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
         self.model = "deepseek/deepseek-chat"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -18,33 +24,42 @@ class ResumeParser:
             "HTTP-Referer": "https://trustchain-ibriz.vercel.app",  # Optional
             "X-Title": "TrustChain Skills Verification",  # Optional
         }
+        # Sections answered by a fallback (empty skills, no username) after an LLM error
+        self.fallbacks = []
+
+    def _fall_back(self, section):
+        if section not in self.fallbacks:
+            self.fallbacks.append(section)
+
     def extract_text_from_pdf(self, pdf_file):
         """Extract text content from PDF file"""
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
+        with metrics.timed('pdf_text_extraction'):
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            text = ""
+            for page in pdf_reader.pages:
+                text += page.extract_text()
         return text
     
     def _generate_pdf_hash(self, pdf_file):
         """Generate a hash of the PDF file content for caching"""
-        # Reset file pointer to beginning 
-        pdf_file.seek(0)
-        # Read the file content 
-        pdf_content = pdf_file.read()
-        # Create a hash
-        hash_object = hashlib.md5(pdf_content)
-        # Reset file pointer again for further processing if needed
-        pdf_file.seek(0)
+        with metrics.timed('pdf_hash'):
+            # Reset file pointer to beginning 
+            pdf_file.seek(0)
+            # Read the file content 
+            pdf_content = pdf_file.read()
+            # Create a hash
+            hash_object = hashlib.md5(pdf_content)
+            # Reset file pointer again for further processing if needed
+            pdf_file.seek(0)
         return hash_object.hexdigest()
         
     def extract_github_username_using_ai(self, text, pdf_hash):
         """Extract GitHub username from resume text using AI with caching"""
-        cache_key = f"github_username_{pdf_hash}"
-        cached_username = cache.get(cache_key)
+        cache_key = f"github_username_{key_version('github_username')}_{pdf_hash}"
+        cached_username = metrics.cache_get("github_username", cache_key)
         
         if cached_username is not None:
-            print(f"Cache hit for GitHub username: {cache_key}")
+            logger.debug("Cache hit for GitHub username: %s", cache_key)
             return cached_username
         
         # First try regex patterns for common GitHub URLs
@@ -74,7 +89,11 @@ class ResumeParser:
         
         Return ONLY the username or null. Examples: "john-doe", "janedoe", "user123"
         """
-        
+
+        if not deadline.has_time(settings.DEADLINE_MIN_LLM_SECONDS, deadline.reserve('resume_parsing')):
+            deadline.degrade('github_username', "no time left for the LLM username lookup")
+            return None
+
         try:
             payload = {
                 "model": self.model,
@@ -83,12 +102,14 @@ class ResumeParser:
                 ],
                 "temperature": 0.1
             }
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            with metrics.upstream_call('openrouter', 'llm_github_username') as call:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=deadline.timeout(30, deadline.reserve('resume_parsing'))
+                )
+                call.status = response.status_code
             response.raise_for_status()
             result = response.json()
             username_text = result["choices"][0]["message"]["content"].strip().lower()
@@ -100,18 +121,23 @@ class ResumeParser:
                 cache.set(cache_key, username_text, settings.VERIFICATION_CACHE_TIMEOUT)
                 return username_text
             
+            return None
+        except requests.Timeout as e:
+            deadline.degrade('github_username', f"LLM username lookup timed out: {e}")
+            self._fall_back('github_username')
             return None
         except Exception as e:
-            print(f"Error extracting GitHub username with AI: {e}")
+            logger.warning("Error extracting GitHub username with AI: %s", e)
+            self._fall_back('github_username')
             return None
     
     def extract_skills_using_ai(self, text, pdf_hash):
         """Use AI to extract skills from resume text with caching"""
-        cache_key = f"resume_skills_{pdf_hash}"
-        cached_skills = cache.get(cache_key)
+        cache_key = f"resume_skills_{key_version('resume_skills')}_{pdf_hash}"
+        cached_skills = metrics.cache_get("resume_skills", cache_key)
         
         if cached_skills is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_skills
             
         prompt = f"""
@@ -123,7 +149,11 @@ class ResumeParser:
         
         Return ONLY a JSON array of skills like: ["Python", "Django", "React", "AWS"]
         """
-        
+
+        if not deadline.has_time(settings.DEADLINE_MIN_LLM_SECONDS, deadline.reserve('resume_parsing')):
+            deadline.degrade('resume_skills', "no time left for the LLM skill extraction")
+            return []
+
         try:
             payload = {
                 "model": self.model,
@@ -132,12 +162,14 @@ class ResumeParser:
                 ],
                 "temperature": 0.1
             }
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            with metrics.upstream_call('openrouter', 'llm_resume_skills') as call:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=deadline.timeout(30, deadline.reserve('resume_parsing'))
+                )
+                call.status = response.status_code
             response.raise_for_status()
             result = response.json()
             skills_text = result["choices"][0]["message"]["content"].strip()
@@ -155,10 +187,16 @@ class ResumeParser:
                 cache.set(cache_key, skills, settings.VERIFICATION_CACHE_TIMEOUT)
                 return skills
             except:
-                print("Error parsing AI response to JSON")
+                logger.warning("Error parsing AI response to JSON")
+                self._fall_back('resume_skills')
                 return []
+        except requests.Timeout as e:
+            deadline.degrade('resume_skills', f"LLM skill extraction timed out: {e}")
+            self._fall_back('resume_skills')
+            return []
         except Exception as e:
-            print(f"Error using DeepSeek API: {e}")
+            logger.warning("Error using DeepSeek API: %s", e)
+            self._fall_back('resume_skills')
             return []
     
     def parse_resume(self, pdf_file):
@@ -167,11 +205,11 @@ class ResumeParser:
         pdf_hash = self._generate_pdf_hash(pdf_file)
         
         # Check if we have cached results for this PDF hash
-        cache_key = f"resume_parsing_{pdf_hash}"
-        cached_result = cache.get(cache_key)
+        cache_key = f"resume_parsing_{key_version('resume_parsing')}_{pdf_hash}"
+        cached_result = metrics.cache_get("resume_parsing", cache_key)
         
         if cached_result is not None:
-            print(f"Cache hit: {cache_key}")
+            logger.debug("Cache hit: %s", cache_key)
             return cached_result
         
         # Extract text from the resume
@@ -184,9 +222,12 @@ class ResumeParser:
         result = {
             'text': text[:1000],  # Just store a preview of the text for reference
             'skills': skills,
-            'github_username': github_username
+            'github_username': github_username,
+            'fallback': list(self.fallbacks)
         }
         
-        # Cache the result for future use
-        cache.set(cache_key, result, settings.VERIFICATION_CACHE_TIMEOUT)
+        # Cache the result for future use, unless it was cut short by the request deadline
+        # or an LLM error
+        if not self.fallbacks and not {'resume_skills', 'github_username'} & set(deadline.degraded()):
+            cache.set(cache_key, result, settings.VERIFICATION_CACHE_TIMEOUT)
         return result
\ No newline at end of file
@@ -1,6 +1,7 @@
 # Place this code in a suitable location in your Django project,
 # for example: your_app/services/skill_analyzer.py
 
+import logging
 import requests
 import hashlib
 import json
@@ -8,6 +9,11 @@ import re
 from django.conf import settings
 from django.core.cache import cache
 
+from . import deadline, metrics
+from .cache_invalidation import key_version
+
+logger = logging.getLogger(__name__)
+
 # SkillAnalyzer class to analyze GitHub data and verify skills:
 class SkillAnalyzer:
     """
@@ -15,6 +21,12 @@ class SkillAnalyzer:
     and verify them against a list of skills from a resume.
     """
 
+    # Per-repo GitHub data the prompts use (see _condense_github_data); nothing else is fetched
+    GITHUB_FIELDS = ('description', 'languages', 'topics', 'readme')
+    README_SNIPPET_CHARS = 500
+
+    VERIFICATION_REQUIRED_KEYS = ['verified_skills', 'unverified_skills', 'additional_skills', 'verification_percentage', 'summary']
+
     def __init__(self):
         """Initializes the SkillAnalyzer with API credentials and configuration."""
         # It's highly recommended to store these in your Django settings.py
@@ -22,7 +34,7 @@ class SkillAnalyzer:
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY is not configured in Django settings.")
 
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.base_url = getattr(settings, 'OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
         self.model = "deepseek/deepseek-chat"  # Or another model of your choice
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -32,12 +44,18 @@ class SkillAnalyzer:
         }
         self.timeout = getattr(settings, 'AI_REQUEST_TIMEOUT', 45)
         self.cache_timeout = getattr(settings, 'VERIFICATION_CACHE_TIMEOUT', 3600) # 1 hour
+        # GitHub-only analysis lives as long as the GitHub data it was derived from
+        self.github_skills_cache_timeout = getattr(settings, 'GITHUB_CACHE_TIMEOUT', self.cache_timeout)
+        # Sections answered by a local fallback after an LLM error or malformed answer
+        self.fallbacks = []
 
-    def _get_cache_key(self, method_name: str, *args) -> str:
+    def _get_cache_key(self, method_name: str, *args, username=None) -> str:
         """
         Generates a consistent and safe cache key for a method and its arguments.
+        With username, the key also changes when the user (or, for analyses of their
+        repositories, any of them) is invalidated.
         """
-        key_parts = [method_name]
+        key_parts = [method_name, key_version(method_name, username)]
         for arg in args:
             # Hash complex data types to create a consistent, short string representation.
             if isinstance(arg, (list, dict)):
@@ -51,22 +69,12 @@ class SkillAnalyzer:
         key = "_".join(key_parts)
         # Hash the final key if it's too long for the cache backend.
         if len(key) > 250:
-            return f"skill_{hashlib.md5(key.encode()).hexdigest()}"
+            return f"{method_name}_{hashlib.md5(key.encode()).hexdigest()}"
         return key
     
-    # Analyze GitHub data to extract skills using AI, with caching
-    def analyze_github_skills(self, github_data):
-        """Use AI to analyze GitHub data and extract skills with caching"""
-        # Create cache key based on essential GitHub data
-        cache_key = self._get_cache_key("github_skills_analysis", 
-                                        github_data['username'],
-                                        [repo['name'] for repo in github_data['repos']])
-        cached_skills = cache.get(cache_key)
-        if cached_skills is not None:
-            print(f"Cache hit for GitHub skills analysis: {cache_key}")
-            return cached_skills
-
-        condensed_data = {
+    def _condense_github_data(self, github_data):
+        """Reduce raw GitHub data to the fields the prompts actually use."""
+        return {
             'username': github_data.get('username'),
             'repos': [
                 {
@@ -74,11 +82,34 @@ class SkillAnalyzer:
                     'description': repo.get('description'),
                     'languages': repo.get('languages'),
                     'topics': repo.get('topics'),
-                    'readme_snippet': (repo.get('readme') or '')[:500],
+                    'readme_snippet': (repo.get('readme') or '')[:self.README_SNIPPET_CHARS],
                     'key_files': repo.get('key_files', []) 
                 } for repo in github_data.get('repos', [])
             ]
         }
+
+    # Analyze GitHub data to extract skills using AI, with caching
+    def analyze_github_skills(self, github_data, failed_fetches=()):
+        """
+        Use AI to analyze GitHub data and extract skills with caching. With failed_fetches
+        (GitHubService.failed_fetches) the data is incomplete and the analysis is not cached.
+        """
+        # Create cache key based on essential GitHub data
+        cache_key = self._get_cache_key("github_skills_analysis",
+                                        github_data['username'],
+                                        github_data.get('version', ''),
+                                        [repo['name'] for repo in github_data['repos']],
+                                        username=github_data['username'])
+        cached_skills = metrics.cache_get("github_skills_analysis", cache_key)
+        if cached_skills is not None:
+            logger.debug("Cache hit for GitHub skills analysis: %s", cache_key)
+            return cached_skills
+
+        if not deadline.has_time(settings.DEADLINE_MIN_LLM_SECONDS, deadline.reserve('github_skills')):
+            deadline.degrade('github_skills', "no time left for the LLM analysis; using repository languages and topics")
+            return self.local_github_skills(github_data)
+
+        condensed_data = self._condense_github_data(github_data)
         
         prompt = f"""
         Act as an AI assistant specializing in analyzing developer profiles to identify technical expertise.
@@ -107,33 +138,47 @@ class SkillAnalyzer:
         
         try:
             payload = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "temperature": 0.1}
-            response = requests.post(
-                f"{self.base_url}/chat/completions", headers=self.headers, json=payload, timeout=self.timeout
-            )
+            with metrics.upstream_call('openrouter', 'llm_github_skills') as call:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions", headers=self.headers, json=payload,
+                    timeout=deadline.timeout(self.timeout, deadline.reserve('github_skills'))
+                )
+                call.status = response.status_code
             response.raise_for_status()
             
             skills_text = response.json()["choices"][0]["message"]["content"]
             skills = self._clean_and_parse_json(skills_text)
             
             if isinstance(skills, list):
-                cache.set(cache_key, skills, timeout=self.cache_timeout)
+                if not failed_fetches:
+                    cache.set(cache_key, skills, timeout=self.github_skills_cache_timeout)
                 return skills
             
-            print("Error: AI response for skill analysis was not a valid list.")
+            logger.warning("AI response for skill analysis was not a valid list.")
+            self._fall_back('github_skills')
             return []
+        except requests.Timeout as e:
+            deadline.degrade('github_skills', f"LLM analysis timed out ({e}); using repository languages and topics")
+            self._fall_back('github_skills')
+            return self.local_github_skills(github_data)
         except requests.RequestException as e:
-            print(f"Error calling AI API for skill analysis: {e}")
-            return []
+            logger.warning("Error calling AI API for skill analysis: %s; using repository languages and topics", e)
+            self._fall_back('github_skills')
+            return self.local_github_skills(github_data)
 
 # Verify skills by comparing resume skills with GitHub skills using AI, with caching
-    def verify_skills_with_llm(self, resume_skills, github_skills):
+    def verify_skills_with_llm(self, resume_skills, github_skills, github_username=None):
         """Use LLM to intelligently compare resume skills with GitHub skills, with caching"""
-        cache_key = self._get_cache_key("verify_skills_llm", resume_skills, github_skills)
-        cached_result = cache.get(cache_key)
+        cache_key = self._get_cache_key("verify_skills_llm", resume_skills, github_skills, username=github_username)
+        cached_result = metrics.cache_get("verify_skills_llm", cache_key)
         if cached_result is not None:
-            print(f"Cache hit for skill verification: {cache_key}")
+            logger.debug("Cache hit for skill verification: %s", cache_key)
             return cached_result
 
+        if not deadline.has_time(settings.DEADLINE_MIN_LLM_SECONDS):
+            deadline.degrade('verification_result', "no time left for the LLM comparison; using basic verification")
+            return self.basic_skill_verification(resume_skills, github_skills)
+
         prompt = f"""
         Act as an expert Technical Recruiter and Senior Software Engineer. Your objective is to provide a detailed, evidence-based verification of skills listed on a resume against skills demonstrated on a GitHub profile. Your analysis must be objective, precise, and structured.
 
@@ -183,27 +228,149 @@ class SkillAnalyzer:
         
         try:
             payload = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "temperature": 0.2}
-            response = requests.post(
-                f"{self.base_url}/chat/completions", headers=self.headers, json=payload, timeout=self.timeout
-            )
+            with metrics.upstream_call('openrouter', 'llm_verify_skills') as call:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions", headers=self.headers, json=payload,
+                    timeout=deadline.timeout(self.timeout)
+                )
+                call.status = response.status_code
             response.raise_for_status()
             
             result_text = response.json()["choices"][0]["message"]["content"]
             result_json = self._clean_and_parse_json(result_text)
 
-            if result_json:
-                required_keys = ['verified_skills', 'unverified_skills', 'additional_skills', 'verification_percentage', 'summary']
-                if all(key in result_json for key in required_keys):
+            if isinstance(result_json, dict):
+                if all(key in result_json for key in self.VERIFICATION_REQUIRED_KEYS):
                     cache.set(cache_key, result_json, timeout=self.cache_timeout)
                     return result_json
 
-            print("AI response for verification was missing keys or malformed. Falling back.")
+            logger.warning("AI response for verification was missing keys or malformed. Falling back.")
+            self._fall_back('verification_result')
             return self.basic_skill_verification(resume_skills, github_skills)
 
         except requests.RequestException as e:
-            print(f"Error calling AI API for verification: {e}. Falling back to basic verification.")
+            if isinstance(e, requests.Timeout):
+                deadline.degrade('verification_result', f"LLM comparison timed out ({e}); using basic verification")
+            self._fall_back('verification_result')
+            logger.warning("Error calling AI API for verification: %s. Falling back to basic verification.", e)
             return self.basic_skill_verification(resume_skills, github_skills)
     
+    # Extract GitHub skills and verify resume skills in a single LLM call, with caching
+    def analyze_and_verify_skills(self, github_data, resume_skills, failed_fetches=()):
+        """
+        Fused variant of analyze_github_skills + verify_skills_with_llm.
+        Sends the condensed GitHub data and the resume skills in one prompt and returns
+        a (github_skills, verification_result) tuple. Falls back to the two-call path
+        when the combined response is malformed or the request fails.
+        """
+        cache_key = self._get_cache_key("fused_skills_verification",
+                                        github_data['username'],
+                                        github_data.get('version', ''),
+                                        [repo['name'] for repo in github_data['repos']],
+                                        resume_skills,
+                                        username=github_data['username'])
+        cached_result = metrics.cache_get("fused_skills_verification", cache_key)
+        if cached_result is not None:
+            logger.debug("Cache hit for fused skill verification: %s", cache_key)
+            return cached_result['github_skills'], cached_result['verification_result']
+
+        if not deadline.has_time(settings.DEADLINE_MIN_LLM_SECONDS):
+            # The two-call path degrades each step to its local fallback
+            return self._two_call_verification(github_data, resume_skills, failed_fetches)
+
+        condensed_data = self._condense_github_data(github_data)
+
+        prompt = f"""
+        Act as an expert Technical Recruiter and Senior Software Engineer. You will complete two tasks in order
+        and return both results in a single JSON object.
+
+        **GitHub Data:**```json
+        {json.dumps(condensed_data, indent=2)}
+        ```
+
+        **Resume Skills:** `{json.dumps(resume_skills)}`
+
+        **Task 1 - Extract GitHub Skills:**
+        Analyze the GitHub data and produce a flat list of unique technical skills. Identify languages, frameworks
+        and libraries from `languages`, `topics` and `description`; use `key_files` as strong evidence (e.g.
+        `package.json` indicates Node.js, `requirements.txt` indicates Python, `Dockerfile` indicates Docker).
+        Normalize aliases ("React.js" -> "React", "NodeJS" -> "Node.js") and prefer specific skills over vague
+        terms like "API" or "Database".
+
+        **Task 2 - Verify Resume Skills:**
+        Compare the resume skills against the GitHub skills from Task 1. A skill is verified by a direct match,
+        an alias match, or a hierarchical match (e.g. "Express" verifies "Node.js", "AWS S3" verifies "AWS",
+        "Django" verifies "Python"). Categorize every resume skill, list significant GitHub skills missing from
+        the resume, and compute the percentage of resume skills that were verified.
+
+        **Mandatory Output Format:**
+        Your entire response MUST be a single, raw JSON object without any surrounding text, explanations, or markdown:
+
+        ```json
+        {{
+            "github_skills": ["Skill extracted from GitHub in Task 1"],
+            "verified_skills": [
+                {{
+                    "skill": "The skill from the resume",
+                    "evidence": ["The skill(s) from GitHub that prove it"],
+                    "reasoning": "A brief explanation of why the evidence verifies the skill."
+                }}
+            ],
+            "unverified_skills": ["Skill from the resume that could not be substantiated"],
+            "additional_skills": ["Skill discovered on GitHub but not listed on the resume"],
+            "verification_percentage": 0,
+            "summary": "A concise, professional summary of the findings."
+        }}
+        ```
+        """
+
+        try:
+            payload = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "temperature": 0.1}
+            with metrics.upstream_call('openrouter', 'llm_fused_verification') as call:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions", headers=self.headers, json=payload,
+                    timeout=deadline.timeout(self.timeout)
+                )
+                call.status = response.status_code
+            response.raise_for_status()
+
+            result_text = response.json()["choices"][0]["message"]["content"]
+            result_json = self._clean_and_parse_json(result_text)
+
+            if isinstance(result_json, dict) and isinstance(result_json.get('github_skills'), list):
+                if all(key in result_json for key in self.VERIFICATION_REQUIRED_KEYS):
+                    github_skills = result_json.pop('github_skills')
+                    if not failed_fetches:
+                        cache.set(cache_key, {
+                            'github_skills': github_skills,
+                            'verification_result': result_json
+                        }, timeout=self.cache_timeout)
+                    return github_skills, result_json
+
+            logger.warning("AI response for fused verification was missing keys or malformed. Falling back to two-call path.")
+        except (requests.RequestException, KeyError, IndexError, ValueError) as e:
+            logger.warning("Error calling AI API for fused verification: %s. Falling back to two-call path.", e)
+
+        return self._two_call_verification(github_data, resume_skills, failed_fetches)
+
+    def _fall_back(self, section):
+        if section not in self.fallbacks:
+            self.fallbacks.append(section)
+
+    def _two_call_verification(self, github_data, resume_skills, failed_fetches=()):
+        github_skills = self.analyze_github_skills(github_data, failed_fetches)
+        return github_skills, self.verify_skills_with_llm(resume_skills, github_skills, github_data['username'])
+
+    def local_github_skills(self, github_data):
+        """GitHub skills without the LLM: each analysed repository's languages and topics"""
+        skills = {}
+        for repo in github_data.get('repos', []):
+            for language in repo.get('languages') or {}:
+                skills.setdefault(language.lower(), language)
+            for topic in repo.get('topics') or []:
+                skills.setdefault(topic.lower(), topic)
+        return list(skills.values())
+
     def _clean_and_parse_json(self, text: str):
         """
         Clean and parse JSON from LLM response.
@@ -230,7 +397,7 @@ class SkillAnalyzer:
                 except json.JSONDecodeError:
                     pass
             
-            print(f"Failed to parse JSON from: {text[:100]}")
+            logger.warning("Failed to parse JSON from: %.100s", text)
             return None
 
     def calculate_strength_metrics(self, verification_result, total_resume_skills):
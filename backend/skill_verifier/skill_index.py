@@ -0,0 +1,75 @@
+import re
+
+from django.db import transaction
+
+from .models import Skill, VerificationSkill
+
+# Common spellings folded into one canonical name
+SKILL_ALIASES = {
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'js': 'javascript',
+    'ts': 'typescript',
+}
+
+
+def canonical_skill_name(name):
+    """Lowercase, collapse whitespace, fold known aliases and cut to the Skill.name length"""
+    canonical = re.sub(r'\s+', ' ', str(name)).strip().lower()
+    return SKILL_ALIASES.get(canonical, canonical)[:100]
+
+
+def _skill_entries(verification):
+    """(display name, status, strength) for every skill mentioned in a verification result"""
+    result = verification.verification_result or {}
+    strength_per_skill = result.get('strength_per_skill', {})
+    entries = []
+    for verified in result.get('verified_skills', []):
+        name = verified.get('skill') if isinstance(verified, dict) else verified
+        if name:
+            entries.append((name, VerificationSkill.VERIFIED, strength_per_skill.get(name)))
+    for name in result.get('unverified_skills', []):
+        entries.append((name, VerificationSkill.UNVERIFIED, None))
+    for name in result.get('additional_skills', []):
+        entries.append((name, VerificationSkill.ADDITIONAL, None))
+    return entries
+
+
+def get_skills(names):
+    """Map canonical name -> Skill for the given display names, creating missing ones in bulk"""
+    display_names = {}
+    for name in names:
+        display_names.setdefault(canonical_skill_name(name), str(name).strip()[:100])
+    display_names.pop('', None)
+
+    skills = {skill.name: skill for skill in Skill.objects.filter(name__in=display_names)}
+    missing = [Skill(name=canonical, display_name=display) for canonical, display in display_names.items()
+               if canonical not in skills]
+    if missing:
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        skills = {skill.name: skill for skill in Skill.objects.filter(name__in=display_names)}
+    return skills
+
+
+def index_verification(verification):
+    """(Re)build the VerificationSkill rows of one verification"""
+    entries = _skill_entries(verification)
+    with transaction.atomic():
+        VerificationSkill.objects.filter(verification=verification).delete()
+        skills = get_skills(name for name, _, _ in entries)
+        rows = {}
+        for name, status, strength in entries:
+            skill = skills.get(canonical_skill_name(name))
+            if skill is not None:
+                rows[(skill.id, status)] = VerificationSkill(
+                    verification=verification, skill=skill, status=status, strength=strength
+                )
+        VerificationSkill.objects.bulk_create(rows.values())
+    return len(rows)
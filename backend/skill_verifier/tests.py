@@ -1,3 +1,1104 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here. you can add test cases for SkillAnalyzer methods here.
+import requests
+from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from . import admission, metrics, prewarm, verification_pipeline
+from .account_rollups import refresh_rollup
+from .cache_backend import CacheCodec, CompressedFileBasedCache, CompressedLocMemCache
+from .cache_invalidation import invalidate_repo, key_version, request_generations
+from .db_writer import BatchedWriter, run_write
+from .github_oauth import GitHubOAuthHandler, oauth_username
+from .github_service import REPO_LISTING_FIELDS, GitHubService, Missing
+from .github_tokens import store_user_token
+from .log import JsonFormatter, RequestIdFilter, log_payload, new_request_id, request_id_var
+from .profiling import load_index
+from .proofs import generate_proof, verify_skill_proof
+from .skill_analyzer import SkillAnalyzer
+from .models import SkillVerification
+from .resume_parser import ResumeParser
+from .skill_index import get_skills
+from .verification_pipeline import (
+    BatchVerification, VerificationError, collect_batch_files, get_stored_verification, verify_and_store
+)
+
+
+def _response(status, body=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode() if body is not None else b''
+    response.raw = io.BytesIO(response._content)
+    return response
+
+
+def _zip(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return SimpleUploadedFile('resumes.zip', buffer.getvalue(), content_type='application/zip')
+
+
+class CollectBatchFilesTests(TestCase):
+    @override_settings(BATCH_MAX_ITEMS=2)
+    def test_rejects_too_many_zip_entries_before_extracting(self):
+        archive = _zip({f'{i}.pdf': b'%PDF' for i in range(3)})
+        with self.assertRaises(VerificationError):
+            collect_batch_files([], archive)
+
+    @override_settings(BATCH_MAX_ZIP_BYTES=1024)
+    def test_rejects_zip_over_uncompressed_size_cap(self):
+        # Compresses to a few bytes, expands past the cap
+        archive = _zip({'bomb.pdf': b'\0' * 4096})
+        with self.assertRaises(VerificationError) as raised:
+            collect_batch_files([], archive)
+        self.assertEqual(raised.exception.status_code, 413)
+
+    def test_extracts_pdf_entries(self):
+        archive = _zip({'a/one.pdf': b'%PDF-1', 'notes.txt': b'x'})
+        files = collect_batch_files([], archive)
+        self.assertEqual([f.name for f in files], ['one.pdf'])
+
+
+class BatchMembershipTests(TestCase):
+    def test_batch_listing_covers_cache_hits_and_duplicates(self):
+        verification = SkillVerification.objects.create(
+            github_username='octocat', resume_file_name='cv.pdf', verification_result={'verification_percentage': 50},
+            hash_value='h'
+        )
+        parsed = {'skills': ['Python'], 'github_username': 'octocat', 'pdf_hash': 'x', 'fallback': []}
+        cached = {'github_username': 'octocat', 'verification_id': verification.id}
+        with mock.patch.object(verification_pipeline, 'parse_resume', return_value=parsed), \
+                mock.patch.object(verification_pipeline, 'get_cached_verification', return_value=cached):
+            batch = BatchVerification([ContentFile(b'%PDF', name='a.pdf'), ContentFile(b'%PDF', name='b.pdf')])
+            results = list(batch.run())
+        self.assertEqual(len(results), 2)
+
+        response = self.client.get(f'/api/verify-skills/batch/{batch.batch_id}/')
+        self.assertEqual(response.status_code, 200)
+        listed = response.json()['results']
+        self.assertEqual([item['index'] for item in listed], [0, 1])
+        self.assertEqual({item['verification_id'] for item in listed}, {verification.id})
+
+
+class CompressedFileBasedCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = CompressedFileBasedCache(directory.name, {
+            'OPTIONS': {'COMPRESS_MIN_BYTES': 16, 'NAMESPACE_MAX_BYTES': {'user_repos': 64}}
+        })
+
+    def test_round_trip_through_codec(self):
+        value = {'readme': 'x' * 4096}
+        self.cache.set('repo_readme_octocat', value)
+        self.assertEqual(self.cache.get('repo_readme_octocat'), value)
+        self.assertFalse(self.cache.add('repo_readme_octocat', {}))
+        self.cache.set('cache_generation_all', 1)
+        self.assertEqual(self.cache.incr('cache_generation_all'), 2)
+
+    def test_value_over_namespace_cap_replaces_the_stored_one(self):
+        self.cache.set('user_repos_octocat', ['small'])
+        self.cache.set('user_repos_octocat', [str(i) for i in range(100)])
+        self.assertIsNone(self.cache.get('user_repos_octocat'))
+
+
+class CompressedLocMemCacheTests(TestCase):
+    def setUp(self):
+        self.cache = CompressedLocMemCache('codec-tests', {
+            'OPTIONS': {'COMPRESS_MIN_BYTES': 16, 'MAX_ENTRY_BYTES': 1024,
+                        'NAMESPACE_MAX_BYTES': {'repo_readme': None, 'user_repos': 64}}
+        })
+        self.addCleanup(self.cache.clear)
+
+    def _stored(self, key):
+        return self.cache._cache[self.cache.make_and_validate_key(key)]
+
+    def test_round_trip_through_codec(self):
+        large, small = {'readme': 'x' * 4096}, [1]
+        self.cache.set('repo_readme_octocat', large)
+        self.cache.set('repo_readme_hubot', small)
+        self.assertEqual(self.cache.get('repo_readme_octocat'), large)
+        self.assertEqual(self.cache.get('repo_readme_hubot'), small)
+        # Large values are stored compressed, small ones as a plain pickle
+        self.assertTrue(self._stored('repo_readme_octocat').startswith(b'Z'))
+        self.assertTrue(self._stored('repo_readme_hubot').startswith(b'P'))
+        self.assertLess(len(self._stored('repo_readme_octocat')), 4096)
+
+        self.cache.set('cache_generation_all', 1)
+        self.assertEqual(self.cache.incr('cache_generation_all'), 2)
+        self.assertEqual(self.cache.get('cache_generation_all'), 2)
+
+    def test_values_over_the_cap_are_rejected(self):
+        rejected = metrics.get_counter('skillverify_cache_rejected_total', {'namespace': 'user_repos'})
+        self.cache.set('user_repos_octocat', ['small'])
+        self.cache.set('user_repos_octocat', [str(i) for i in range(100)])
+        self.assertIsNone(self.cache.get('user_repos_octocat'))
+        self.assertFalse(self.cache.add('user_repos_hubot', [str(i) for i in range(100)]))
+        self.assertEqual(metrics.get_counter('skillverify_cache_rejected_total', {'namespace': 'user_repos'}),
+                         rejected + 2)
+        # Namespaces without their own cap use MAX_ENTRY_BYTES
+        self.cache.set('repo_readme_octocat', os.urandom(2048))
+        self.assertIsNone(self.cache.get('repo_readme_octocat'))
+
+    def test_longest_namespace_prefix_wins(self):
+        codec = CacheCodec(namespace_caps={'repo_readme': None, 'repo_readme_meta': None})
+        self.assertEqual(codec.namespace('repo_readme_meta_octocat_hello'), 'repo_readme_meta')
+        self.assertEqual(codec.namespace('repo_readme_octocat_hello'), 'repo_readme')
+        self.assertEqual(codec.namespace('repo_readmeish'), 'other')
+
+
+class PrewarmCacheCommandTests(TestCase):
+    def test_refuses_to_run_with_a_per_process_cache(self):
+        with mock.patch('skill_verifier.management.commands.prewarm_cache.prewarm_user_in_worker') as prewarm:
+            with self.assertRaisesMessage(CommandError, 'CACHE_DIR'):
+                call_command('prewarm_cache', 'octocat')
+        prewarm.assert_not_called()
+
+
+@override_settings(GITHUB_USE_USER_TOKENS=True, GITHUB_TOKEN='shared')
+class UserTokenSelectionTests(TestCase):
+    def setUp(self):
+        store_user_token('octocat', 'octocat-token')
+        store_user_token('alice', 'alice-token')
+
+    def _request(self, user_info, oauth):
+        token = GitHubOAuthHandler().generate_jwt_token(user_info, oauth=oauth)
+        return RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_anonymous_lookup_uses_the_shared_token(self):
+        service = GitHubService('octocat')
+        self.assertEqual(service.headers, {'Authorization': 'token shared'})
+        self.assertIsNone(service.token_owner)
+
+    def test_requester_token_is_used_whoever_is_looked_up(self):
+        requester = oauth_username(self._request({'github_username': 'alice'}, oauth=True))
+        service = GitHubService('octocat', requester)
+        self.assertEqual(service.headers, {'Authorization': 'token alice-token'})
+        self.assertEqual(service.token_owner, 'alice')
+
+    def test_jwt_without_oauth_is_not_a_requester(self):
+        self.assertIsNone(oauth_username(self._request({'github_username': 'octocat'}, oauth=False)))
+        self.assertIsNone(oauth_username(RequestFactory().get('/', HTTP_AUTHORIZATION='Bearer nonsense')))
+
+
+@override_settings(GITHUB_WEBHOOK_SECRET='secret', OPENROUTER_API_KEY='test', GITHUB_USE_USER_TOKENS=False)
+class WebhookInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.answers = {
+            '/users/octocat/repos': _response(200, [{'name': 'hello', 'pushed_at': '1', 'updated_at': '1'}]),
+            '/repos/octocat/hello/languages': _response(200, {'Python': 10}),
+            '/repos/octocat/hello/topics': _response(200, {'names': []}),
+            '/repos/octocat/hello/readme': _response(404),
+        }
+        patcher = mock.patch.object(GitHubService, '_request', side_effect=self._github)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _github(self, url, *args, **kwargs):
+        return self.answers[url.split('api.github.com', 1)[1]]
+
+    def _analyze(self, llm):
+        github_data = GitHubService('octocat').get_all_github_data(fields=SkillAnalyzer.GITHUB_FIELDS)
+        with mock.patch('skill_verifier.skill_analyzer.requests.post', return_value=llm) as post:
+            skills = SkillAnalyzer().analyze_github_skills(github_data)
+        return skills, post.call_count
+
+    def test_push_webhook_recomputes_the_analysis(self):
+        self.assertEqual(self._analyze(_response(200, {'choices': [{'message': {'content': '["Python"]'}}]})), (['Python'], 1))
+        self.assertEqual(self._analyze(_response(500)), (['Python'], 0))
+
+        body = json.dumps({'repository': {'name': 'hello', 'owner': {'login': 'octocat'}}}).encode()
+        signature = 'sha256=' + hmac.new(b'secret', body, hashlib.sha256).hexdigest()
+        response = self.client.post('/api/webhooks/github/', body, content_type='application/json',
+                                    HTTP_X_GITHUB_EVENT='push', HTTP_X_HUB_SIGNATURE_256=signature)
+        self.assertEqual(response.status_code, 200)
+
+        self.answers['/repos/octocat/hello/languages'] = _response(200, {'Go': 10})
+        self.assertEqual(self._analyze(_response(200, {'choices': [{'message': {'content': '["Go"]'}}]})), (['Go'], 1))
+
+
+class CacheGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_generations_are_read_once_per_request(self):
+        with request_generations(), mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            version = key_version('repo_languages', 'octocat', 'hello')
+            self.assertEqual(key_version('repo_languages', 'octocat', 'hello'), version)
+            key_version('repo_topics', 'octocat', 'hello')
+            self.assertEqual(get_many.call_count, 2)
+
+            invalidate_repo('octocat', 'hello')
+            self.assertNotEqual(key_version('repo_languages', 'octocat', 'hello'), version)
+            self.assertEqual(get_many.call_count, 2)
+
+        with request_generations():
+            self.assertNotEqual(key_version('repo_languages', 'octocat', 'hello'), version)
+
+
+@override_settings(OPENROUTER_API_KEY='test', GITHUB_USE_USER_TOKENS=False, VERIFICATION_REUSE_MAX_AGE=0)
+class GitHubTimeoutTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, readme):
+        answers = {
+            '/users/octocat/repos': _response(200, [{'name': 'hello', 'pushed_at': '1', 'updated_at': '1'}]),
+            '/repos/octocat/hello/languages': _response(200, {'Python': 10}),
+            '/repos/octocat/hello/topics': _response(200, {'names': ['django']}),
+        }
+
+        def get(url, *args, **kwargs):
+            path = url.split('api.github.com', 1)[1]
+            if path == '/repos/octocat/hello/readme':
+                return readme()
+            return answers[path]
+        return get
+
+    def _verify(self, readme):
+        parsed = {'skills': ['Python'], 'github_username': 'octocat', 'pdf_hash': 'pdfhash', 'fallback': []}
+        llm = _response(200, {'choices': [{'message': {'content': '["Python"]'}}]})
+        with mock.patch('skill_verifier.github_service.requests.get', side_effect=self._get(readme)), \
+                mock.patch('skill_verifier.skill_analyzer.requests.post', return_value=llm), \
+                mock.patch.object(verification_pipeline, 'parse_resume', return_value=parsed):
+            return self.client.post('/api/verify-skills/', {'resume_pdf': SimpleUploadedFile('cv.pdf', b'%PDF')})
+
+    def test_github_timeout_degrades_instead_of_failing(self):
+        def readme():
+            raise requests.Timeout('read timed out')
+        response = self._verify(readme)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('github_data', response.json()['degraded'])
+
+    def test_streaming_read_error_skips_the_readme(self):
+        def readme():
+            response = _response(200)
+            response.raw = mock.Mock(stream=mock.Mock(side_effect=requests.ConnectionError('read timed out')))
+            return response
+        response = self._verify(readme)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['github_username'], 'octocat')
+
+    def test_request_error_is_a_transient_failure(self):
+        error = requests.TooManyRedirects('Exceeded 30 redirects.')
+        with mock.patch('skill_verifier.github_service.requests.get', side_effect=error) as get:
+            service = GitHubService('octocat')
+            self.assertIsNone(service.get_user_info())
+            self.assertEqual(service.get_repo_languages('hello'), {})
+            self.assertEqual(service.failed_fetches, {None, 'hello'})
+            self.assertIsNone(GitHubService('octocat').get_user_info())
+        self.assertEqual(get.call_count, 3)
+
+
+@override_settings(ADMISSION_POOLS={'batch': {'limit': 1, 'queue_size': 0, 'queue_timeout': 0}})
+class BatchAdmissionTests(TestCase):
+    def setUp(self):
+        for state in (admission._bulkheads, admission._buckets):
+            patcher = mock.patch.dict(state, clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _post(self, query=''):
+        verification = SkillVerification.objects.create(github_username='octocat', resume_file_name='cv.pdf',
+                                                        verification_result={}, hash_value='h')
+        parsed = {'skills': [], 'github_username': 'octocat', 'pdf_hash': 'x', 'fallback': []}
+        with mock.patch.object(verification_pipeline, 'parse_resume', return_value=parsed), \
+                mock.patch.object(verification_pipeline, 'get_cached_verification',
+                                  return_value={'verification_id': verification.id}):
+            response = self.client.post(f'/api/verify-skills/batch/{query}',
+                                        {'resume_pdfs': [SimpleUploadedFile('a.pdf', b'%PDF')]})
+            if response.streaming:
+                b''.join(response.streaming_content)
+                response.close()
+        return response
+
+    def test_busy_batch_pool_rejects_with_retry_after(self):
+        with admission.bulkhead('batch').admit():
+            response = self._post()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    def test_streamed_batch_holds_the_slot_until_finished(self):
+        response = self._post('?stream=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(admission.bulkhead('batch').active, 0)
+        self.assertEqual(self._post().status_code, 200)
+
+
+class TokenBucketThrottleTests(TestCase):
+    def test_subclass_must_define_its_identity_and_scope(self):
+        class NoIdentity(admission.TokenBucketThrottle):
+            scope = 'client'
+
+        class NoScope(admission.TokenBucketThrottle):
+            def get_identity(self, request):
+                return 'everyone'
+
+        with self.assertRaises(TypeError):
+            NoIdentity()
+        with self.assertRaises(KeyError):
+            NoScope()
+
+
+@override_settings(OPENROUTER_API_KEY='test', VERIFICATION_REUSE_MAX_AGE=3600, VERIFICATION_REUSE_CHECK_GITHUB_VERSION=False)
+class FallbackReuseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_llm_error_fallback_is_not_reused(self):
+        github_data = {'username': 'octocat', 'repos': [{'name': 'hello', 'languages': {'Python': 10}}], 'version': 'v1'}
+        with mock.patch('skill_verifier.skill_analyzer.requests.post', side_effect=requests.ConnectionError('down')):
+            response = verify_and_store('octocat', 'cv.pdf', ['Python'], 'pdfhash', github_data)
+
+        self.assertEqual(response['verification_result']['fallback'], ['github_skills', 'verification_result'])
+        self.assertIsNone(get_stored_verification('octocat', 'pdfhash'))
+
+    def test_resume_parse_error_is_flagged_and_not_reused(self):
+        with mock.patch.object(ResumeParser, 'extract_text_from_pdf', return_value='github.com/octocat'), \
+                mock.patch('skill_verifier.resume_parser.requests.post', side_effect=requests.ConnectionError('down')) as post:
+            parsed = verification_pipeline.parse_resume(SimpleUploadedFile('cv.pdf', b'%PDF'))
+            verification_pipeline.parse_resume(SimpleUploadedFile('cv.pdf', b'%PDF'))
+        self.assertEqual(parsed['fallback'], ['resume_skills'])
+        self.assertEqual(post.call_count, 2)
+
+        github_data = {'username': 'octocat', 'repos': [], 'version': 'v1'}
+        with mock.patch.object(SkillAnalyzer, 'analyze_github_skills', return_value=['Python']), \
+                mock.patch.object(SkillAnalyzer, 'verify_skills_with_llm',
+                                  side_effect=lambda resume, github, username=None: SkillAnalyzer().basic_skill_verification(resume, github)):
+            response = verify_and_store('octocat', 'cv.pdf', parsed['skills'], parsed['pdf_hash'], github_data,
+                                        resume_fallbacks=parsed['fallback'])
+
+        self.assertEqual(response['verification_result']['fallback'], ['resume_skills'])
+        self.assertIsNone(get_stored_verification('octocat', parsed['pdf_hash']))
+
+    def test_failed_repo_fetch_is_refetched_by_the_next_request(self):
+        languages = [_response(503), _response(200, {'Python': 10})]
+        answers = {
+            '/users/octocat/repos': lambda: _response(200, [{'name': 'hello', 'pushed_at': '1', 'updated_at': '1'}]),
+            '/repos/octocat/hello/languages': lambda: languages.pop(0),
+            '/repos/octocat/hello/topics': lambda: _response(200, {'names': []}),
+            '/repos/octocat/hello/readme': lambda: _response(404),
+        }
+
+        def get(url, *args, **kwargs):
+            return answers[url.split('api.github.com', 1)[1]]()
+
+        parsed = {'skills': ['Python'], 'github_username': 'octocat', 'pdf_hash': 'pdfhash', 'fallback': []}
+        llm = _response(200, {'choices': [{'message': {'content': '["Python"]'}}]})
+        with override_settings(GITHUB_USE_USER_TOKENS=False), \
+                mock.patch('skill_verifier.github_service.requests.get', side_effect=get), \
+                mock.patch('skill_verifier.skill_analyzer.requests.post', return_value=llm), \
+                mock.patch.object(verification_pipeline, 'parse_resume', return_value=parsed):
+            first = self.client.post('/api/verify-skills/', {'resume_pdf': SimpleUploadedFile('cv.pdf', b'%PDF')})
+            second = self.client.post('/api/verify-skills/', {'resume_pdf': SimpleUploadedFile('cv.pdf', b'%PDF')})
+
+        self.assertEqual(first.json()['degraded'], ['github_data'])
+        self.assertEqual(first.json()['verification_result']['degraded'], ['github_data'])
+        self.assertEqual(languages, [])
+        self.assertEqual(second.json()['degraded'], [])
+        self.assertNotIn('reused', second.json())
+
+
+class SkillIndexTests(TestCase):
+    def test_long_skill_name_resolves_to_the_created_skill(self):
+        name = 'x' * 150
+        created = get_skills([name])
+        self.assertEqual(list(created), [name[:100]])
+        self.assertEqual(get_skills([name]), created)
+
+
+class AccountRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_transient_failure_is_retried_not_stored(self):
+        repos = [{'name': 'one', 'pushed_at': '1'}, {'name': 'two', 'pushed_at': '1'}]
+        answers = {
+            '/users/octocat/repos': _response(200, repos),
+            '/users/octocat': _response(200, {'login': 'octocat'}),
+            '/repos/octocat/one/languages': _response(200, {'Python': 10}),
+            '/repos/octocat/one/topics': _response(200, {'names': []}),
+            '/repos/octocat/two/languages': _response(503),
+            '/repos/octocat/two/topics': _response(200, {'names': []}),
+        }
+
+        def request(url, *args, **kwargs):
+            return answers[url.split('api.github.com', 1)[1]]
+
+        with mock.patch.object(GitHubService, '_request', side_effect=request):
+            rollup = refresh_rollup(GitHubService('octocat'), 5)
+            self.assertEqual(set(rollup.repo_versions), {'one'})
+
+            answers['/repos/octocat/two/languages'] = _response(200, {'Go': 5})
+            rollup = refresh_rollup(GitHubService('octocat'), 5, rollup)
+        self.assertEqual(set(rollup.repo_versions), {'one', 'two'})
+        self.assertEqual(rollup.language_bytes, {'Python': 10, 'Go': 5})
+
+
+@override_settings(OPENROUTER_API_KEY='test')
+class SkillAnalyzerFallbackTests(TestCase):
+    github_data = {
+        'username': 'octocat', 'version': 'v1',
+        'repos': [{'name': 'hello', 'languages': {'Python': 10}, 'topics': ['django']}],
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def test_llm_request_error_falls_back_to_repository_languages(self):
+        analyzer = SkillAnalyzer()
+        with mock.patch('skill_verifier.skill_analyzer.requests.post', side_effect=requests.HTTPError('502')):
+            skills = analyzer.analyze_github_skills(self.github_data)
+        self.assertEqual(skills, analyzer.local_github_skills(self.github_data))
+        self.assertIn('Python', skills)
+        self.assertEqual(analyzer.fallbacks, ['github_skills'])
+
+
+def _llm(content):
+    """Chat completion response whose message is content (JSON-encoded unless a string)"""
+    if not isinstance(content, str):
+        content = json.dumps(content)
+    return _response(200, {'choices': [{'message': {'content': content}}]})
+
+
+@override_settings(OPENROUTER_API_KEY='test')
+class FusedVerificationTests(TestCase):
+    github_data = SkillAnalyzerFallbackTests.github_data
+    verification = {
+        'verified_skills': [{'skill': 'Python', 'evidence': ['Python'], 'reasoning': 'Direct match'}],
+        'unverified_skills': ['Rust'],
+        'additional_skills': ['Django'],
+        'verification_percentage': 50,
+        'summary': 'Half verified',
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def test_one_call_returns_skills_and_verification(self):
+        with mock.patch('skill_verifier.skill_analyzer.requests.post',
+                        return_value=_llm({'github_skills': ['Python', 'Django'], **self.verification})) as post:
+            github_skills, result = SkillAnalyzer().analyze_and_verify_skills(self.github_data, ['Python', 'Rust'])
+            self.assertEqual(SkillAnalyzer().analyze_and_verify_skills(self.github_data, ['Python', 'Rust']),
+                             (github_skills, result))
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(github_skills, ['Python', 'Django'])
+        self.assertEqual(result, self.verification)
+
+    def test_malformed_answer_falls_back_to_two_calls(self):
+        answers = [_llm({'github_skills': ['Python']}), _llm(['Python', 'Django']), _llm(self.verification)]
+        analyzer = SkillAnalyzer()
+        with mock.patch('skill_verifier.skill_analyzer.requests.post', side_effect=answers) as post:
+            github_skills, result = analyzer.analyze_and_verify_skills(self.github_data, ['Python', 'Rust'])
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual(github_skills, ['Python', 'Django'])
+        self.assertEqual(result, self.verification)
+        self.assertEqual(analyzer.fallbacks, [])
+
+    @override_settings(LLM_FUSED_VERIFICATION=True)
+    def test_pipeline_uses_the_fused_call_when_enabled(self):
+        with mock.patch('skill_verifier.skill_analyzer.requests.post',
+                        return_value=_llm({'github_skills': ['Python', 'Django'], **self.verification})) as post:
+            response = verify_and_store('octocat', 'cv.pdf', ['Python', 'Rust'], 'pdfhash', self.github_data)
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(response['github_skills'], ['Python', 'Django'])
+        self.assertEqual(response['verification_result']['verified_skills'], self.verification['verified_skills'])
+
+
+@override_settings(OPENROUTER_API_KEY='test')
+class IncompleteGitHubDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_analysis_of_incomplete_data_is_not_cached(self):
+        github_data = {'username': 'octocat', 'repos': [{'name': 'hello', 'languages': {'Python': 10}}], 'version': 'v1'}
+        llm = _response(200, {'choices': [{'message': {'content': '["Python"]'}}]})
+        with mock.patch('skill_verifier.skill_analyzer.requests.post', return_value=llm) as post:
+            SkillAnalyzer().analyze_github_skills(github_data, {'hello'})
+            SkillAnalyzer().analyze_github_skills(github_data, {'hello'})
+            self.assertEqual(post.call_count, 2)
+
+            SkillAnalyzer().analyze_github_skills(github_data)
+            SkillAnalyzer().analyze_github_skills(github_data)
+        self.assertEqual(post.call_count, 3)
+
+
+@override_settings(GITHUB_USE_USER_TOKENS=False)
+class BulkAccountSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unknown_users_are_told_apart_from_unavailable_ones(self):
+        answers = {
+            '/users/octocat': _response(200, {'login': 'octocat'}),
+            '/users/ghost': _response(404),
+            '/users/busy': _response(503),
+        }
+
+        def request(url, *args, **kwargs):
+            return answers[url.split('api.github.com', 1)[1]]
+
+        request_ids = []
+
+        def summary(max_repos):
+            request_ids.append(request_id_var.get())
+            return {'total_repositories': 0}
+
+        with mock.patch.object(GitHubService, '_request', side_effect=request), \
+                mock.patch.object(GitHubService, 'get_account_summary', side_effect=summary):
+            response = self.client.post('/api/account/summaries/', {'usernames': ['octocat', 'ghost', 'busy']},
+                                        content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['summaries'], {'octocat': {'total_repositories': 0}})
+        self.assertEqual(response.json()['not_found'], ['ghost'])
+        self.assertEqual(list(response.json()['errors']), ['busy'])
+        self.assertEqual(response.json()['succeeded'], 1)
+        # Workers run in the request's context
+        self.assertEqual(request_ids, [response['X-Request-ID']])
+
+
+
+class MetricsTests(TestCase):
+    def test_request_stages_are_reported_in_server_timing(self):
+        def summary(max_repos):
+            for _ in range(2):
+                with metrics.timed('github'):
+                    pass
+            return {'total_repositories': 0}
+
+        with mock.patch.object(GitHubService, 'get_account_summary', side_effect=summary):
+            response = self.client.get('/api/account/octocat/summary/')
+
+        self.assertEqual(response.status_code, 200)
+        entries = [entry.strip() for entry in response['Server-Timing'].split(',')]
+        self.assertRegex(entries[0], r'^github;dur=\d+\.\d;desc="2 calls"$')
+        self.assertRegex(entries[-1], r'^total;dur=\d+\.\d$')
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        metrics.inc('skillverify_cache_requests_total', {'namespace': 'test', 'result': 'hit'})
+        with metrics.timed('test_stage'):
+            pass
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE skillverify_cache_requests_total counter', body)
+        self.assertIn('skillverify_cache_requests_total{namespace="test",result="hit"}', body)
+        self.assertIn('# TYPE skillverify_stage_duration_seconds histogram', body)
+        self.assertIn('skillverify_stage_duration_seconds_bucket{stage="test_stage",le="+Inf"}', body)
+        self.assertIn('skillverify_stage_duration_seconds_count{stage="test_stage"}', body)
+
+
+class LoggingTests(TestCase):
+    logger = logging.getLogger('skill_verifier.tests.payloads')
+
+    def setUp(self):
+        self.logger.setLevel(logging.DEBUG)
+        self.addCleanup(self.logger.setLevel, logging.NOTSET)
+
+    @override_settings(LOG_PAYLOADS=False)
+    def test_payload_is_not_serialized_when_disabled(self):
+        with mock.patch('skill_verifier.log.json.dumps') as dumps, \
+                mock.patch.object(self.logger, 'debug') as debug:
+            log_payload(self.logger, 'GitHub data', {'repos': []})
+        dumps.assert_not_called()
+        debug.assert_not_called()
+
+    @override_settings(LOG_PAYLOADS=True, LOG_PAYLOAD_SAMPLE_RATE=1.0)
+    def test_payload_is_logged_when_enabled(self):
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            log_payload(self.logger, 'GitHub data', {'repos': []})
+        self.assertIn('GitHub data:\n{\n  "repos": []\n}', logs.output[0])
+
+    @override_settings(LOG_PAYLOADS=True, LOG_PAYLOAD_SAMPLE_RATE=0)
+    def test_unsampled_request_skips_the_payload(self):
+        with mock.patch('skill_verifier.log.json.dumps') as dumps:
+            log_payload(self.logger, 'GitHub data', {'repos': []})
+        dumps.assert_not_called()
+
+    def test_records_are_json_lines_with_the_request_id(self):
+        record = logging.LogRecord('skill_verifier', logging.INFO, __file__, 1, 'Fetched %d repos', (3,), None)
+        token = request_id_var.set('abc-123')
+        try:
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry['request_id'], 'abc-123')
+        self.assertEqual(entry['message'], 'Fetched 3 repos')
+        self.assertEqual(entry['level'], 'INFO')
+
+    def test_request_id_is_reused_only_when_well_formed(self):
+        self.assertEqual(new_request_id('abc-123'), 'abc-123')
+        self.assertNotEqual(new_request_id('bad id\n'), 'bad id\n')
+        response = self.client.get('/api/verifications/', HTTP_X_REQUEST_ID='abc-123')
+        self.assertEqual(response['X-Request-ID'], 'abc-123')
+
+
+@override_settings(PROFILING_TOKEN='secret', PROFILING_SAMPLE_RATE=0.0)
+class ProfilingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(PROFILING_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _summary(self, max_repos):
+        # CPU-bound work on another thread while this one waits on it, plus a GitHub span
+        def spin():
+            end = time.perf_counter() + 0.1
+            while time.perf_counter() < end:
+                pass
+
+        worker = threading.Thread(target=spin)
+        with metrics.timed('github'):
+            worker.start()
+            worker.join()
+        return {'total_repositories': 0}
+
+    def test_profiled_request_is_indexed(self):
+        with mock.patch.object(GitHubService, 'get_account_summary', side_effect=self._summary):
+            self.client.get('/api/account/octocat/summary/', HTTP_X_PROFILE='secret')
+
+        [entry] = load_index(self.directory)
+        self.assertEqual(entry['endpoint'], 'account_summary')
+        self.assertEqual(entry['status'], 200)
+        self.assertTrue((self.directory / entry['file']).exists())
+        self.assertGreaterEqual(entry['upstream_ms']['github'], 100)
+        # Only the request's own thread is counted, not the worker it waited on
+        self.assertLess(entry['cpu_ms'], 50)
+
+    def test_wrong_token_is_not_profiled(self):
+        with mock.patch.object(GitHubService, 'get_account_summary', return_value={}):
+            self.client.get('/api/account/octocat/summary/', HTTP_X_PROFILE='guess')
+        self.assertEqual(load_index(self.directory), [])
+
+    @override_settings(PROFILING_MAX_FILES=1)
+    def test_oldest_profiles_are_rotated_out(self):
+        with mock.patch.object(GitHubService, 'get_account_summary', return_value={}):
+            for _ in range(3):
+                self.client.get('/api/account/octocat/summary/', HTTP_X_PROFILE='secret')
+                time.sleep(0.002)
+        [entry] = load_index(self.directory)
+        self.assertEqual([path.name for path in self.directory.glob('*.prof')], [entry['file']])
+
+
+class ListVerificationsTests(TestCase):
+    def setUp(self):
+        self.verifications = [
+            SkillVerification.objects.create(
+                github_username=username, resume_file_name='cv.pdf', hash_value=f'h{i}',
+                verification_result={'verification_percentage': i * 10, 'summary': 'x' * 1000},
+            )
+            for i, username in enumerate(['octocat', 'octocat', 'hubot'])
+        ]
+
+    def test_cursor_pages_through_every_verification_once(self):
+        first = self.client.get('/api/verifications/', {'limit': 2}).json()
+        second = self.client.get('/api/verifications/', {'limit': 2, 'cursor': first['next_cursor']}).json()
+
+        ids = [item['verification_id'] for item in first['results'] + second['results']]
+        self.assertEqual(ids, [verification.id for verification in reversed(self.verifications)])
+        self.assertIsNotNone(first['next_cursor'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_fields_projection(self):
+        response = self.client.get('/api/verifications/', {'github_username': 'octocat',
+                                                          'fields': 'github_username,verification_percentage'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [
+            {'github_username': 'octocat', 'verification_percentage': 10},
+            {'github_username': 'octocat', 'verification_percentage': 0},
+        ])
+
+        detail = self.client.get(f'/api/verification/{self.verifications[0].id}/', {'fields': 'hash'})
+        self.assertEqual(detail.json(), {'hash': 'h0'})
+
+    def test_bad_parameters_are_rejected(self):
+        self.assertEqual(self.client.get('/api/verifications/', {'fields': 'hash,secret'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/verifications/', {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/verifications/', {'created_after': 'yesterday'}).status_code, 400)
+
+
+class VerificationConditionalGetTests(TestCase):
+    def setUp(self):
+        self.verification = SkillVerification.objects.create(
+            github_username='octocat', resume_file_name='cv.pdf', hash_value='abc',
+            verification_result={'verification_percentage': 50},
+        )
+        self.url = f'/api/verification/{self.verification.id}/'
+
+    def test_etag_round_trip(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['ETag'], '"abc"')
+        self.assertIn('immutable', first['Cache-Control'])
+
+        # Answered from the validator columns alone
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        since = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_projection_has_its_own_etag(self):
+        full = self.client.get(self.url)
+        projected = self.client.get(self.url, {'fields': 'hash'})
+        self.assertNotEqual(projected['ETag'], full['ETag'])
+        stale = self.client.get(self.url, {'fields': 'hash'}, HTTP_IF_NONE_MATCH=full['ETag'])
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.json(), {'hash': 'abc'})
+
+
+class SkillProofTests(TestCase):
+    def setUp(self):
+        result = {'verified_skills': [{'skill': name} for name in ['Python', 'Django', 'Machine  Learning']]}
+        salt, root, self.proof_hash = generate_proof('octocat', result)
+        SkillVerification.objects.create(
+            github_username='octocat', resume_file_name='cv.pdf', hash_value='h', verification_result=result,
+            proof_salt=salt, merkle_root=root, proof_hash=self.proof_hash,
+        )
+
+    def _proof(self, skill):
+        response = self.client.get(f'/api/verify-hash/{self.proof_hash}/', {'skill': skill})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_proof_checks_out_for_each_verified_skill(self):
+        for skill in ['python', 'Django', 'machine learning']:
+            data = self._proof(skill)
+            self.assertTrue(data['skill_verified'])
+            self.assertTrue(verify_skill_proof('octocat', self.proof_hash, data['skill_proof']))
+
+    def test_tampered_proof_is_rejected(self):
+        proof = self._proof('Python')['skill_proof']
+        self.assertFalse(verify_skill_proof('octocat', self.proof_hash, {**proof, 'skill': 'rust'}))
+        self.assertFalse(verify_skill_proof('hubot', self.proof_hash, proof))
+        sibling = proof['path'][0]
+        forged_path = [{**sibling, 'hash': '00' * 32}] + proof['path'][1:]
+        self.assertFalse(verify_skill_proof('octocat', self.proof_hash, {**proof, 'path': forged_path}))
+
+    def test_unverified_skill_has_no_proof(self):
+        data = self._proof('Rust')
+        self.assertFalse(data['skill_verified'])
+        self.assertIsNone(data['skill_proof'])
+
+
+class BatchedWriterTests(TestCase):
+    def _create(self, hash_value, fail=False):
+        def write():
+            verification = SkillVerification.objects.create(github_username='octocat', resume_file_name='cv.pdf',
+                                                            verification_result={}, hash_value=hash_value)
+            if fail:
+                raise ValueError('bad write')
+            return verification.id
+        return write
+
+    def test_failing_write_only_rolls_back_itself(self):
+        writer = BatchedWriter()
+        batch = [(self._create(name, fail=name == 'b'), Future()) for name in ['a', 'b', 'c']]
+        writer._flush(batch)
+
+        self.assertIsInstance(batch[0][1].result(), int)
+        with self.assertRaisesMessage(ValueError, 'bad write'):
+            batch[1][1].result()
+        self.assertIsInstance(batch[2][1].result(), int)
+        self.assertEqual(sorted(SkillVerification.objects.values_list('hash_value', flat=True)), ['a', 'c'])
+
+    @override_settings(DB_BATCHED_WRITES=True)
+    def test_writes_inside_a_transaction_run_inline(self):
+        # TestCase wraps each test in a transaction, which the write must join
+        with mock.patch.object(BatchedWriter, 'submit') as submit:
+            verification_id = run_write(self._create('a'))
+        submit.assert_not_called()
+        self.assertTrue(SkillVerification.objects.filter(id=verification_id).exists())
+
+
+@override_settings(DB_BATCHED_WRITES=True)
+class BatchedWriterThreadTests(TransactionTestCase):
+    def test_concurrent_writes_are_committed_by_the_writer_thread(self):
+        writer = BatchedWriter(max_wait=0.05)
+
+        def write(hash_value):
+            return SkillVerification.objects.create(github_username='octocat', resume_file_name='cv.pdf',
+                                                    verification_result={}, hash_value=hash_value).id
+
+        futures = [writer.submit(lambda name=name: write(name)) for name in ['a', 'b', 'c']]
+        ids = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(SkillVerification.objects.count(), 3)
+        self.assertEqual(writer.thread.name, 'db-writer')
+
+
+@override_settings(GITHUB_USE_USER_TOKENS=False)
+class GitHubFieldProjectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        listing = {field: None for field in REPO_LISTING_FIELDS}
+        self.answers = {
+            '/users/octocat/repos': _response(200, [{
+                **listing, 'name': 'hello', 'description': 'Greeter', 'stargazers_count': 3,
+                'owner': {'login': 'octocat'}, 'permissions': {'admin': True}, 'clone_url': 'https://x',
+            }]),
+            '/repos/octocat/hello/languages': _response(200, {'Python': 10}),
+            '/repos/octocat/hello/commits': _response(200, [{
+                'sha': 'a' * 40, 'url': 'https://x', 'author': {'login': 'octocat'},
+                'commit': {'message': 'Add greeting\n\nLong body', 'author': {'date': '2024-01-01T00:00:00Z'},
+                           'tree': {'sha': 'b' * 40}},
+            }]),
+        }
+        self.requested = []
+        patcher = mock.patch.object(GitHubService, '_request', side_effect=self._github)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _github(self, url, *args, **kwargs):
+        path = url.split('api.github.com', 1)[1]
+        self.requested.append(path)
+        return self.answers[path]
+
+    def test_only_requested_fields_are_fetched(self):
+        data = GitHubService('octocat').get_all_github_data(fields=('languages', 'stars'))
+        self.assertEqual(data['repos'], [{'name': 'hello', 'languages': {'Python': 10}, 'stars': 3}])
+        self.assertEqual(self.requested, ['/users/octocat/repos', '/repos/octocat/hello/languages'])
+
+    def test_listing_and_commits_are_trimmed_before_caching(self):
+        service = GitHubService('octocat')
+        self.assertEqual(set(service.get_user_repos()[0]), set(REPO_LISTING_FIELDS))
+        self.assertEqual(service.get_repo_commits('hello'),
+                         [('a' * 12, '2024-01-01T00:00:00Z', 'Add greeting')])
+        self.assertEqual(set(cache.get(service._get_cache_key('user_repos'))[0]), set(REPO_LISTING_FIELDS))
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'followers'):
+            GitHubService('octocat').get_all_github_data(fields=('languages', 'followers'))
+        self.assertEqual(self.requested, [])
+
+
+def _raw_response(status, body, headers=None):
+    """Streamed response with a raw (non-JSON) body"""
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@override_settings(GITHUB_USE_USER_TOKENS=False, GITHUB_README_MAX_BYTES=2048)
+class ReadmeRangeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _readme(self, response):
+        service = GitHubService('octocat')
+        with mock.patch('skill_verifier.github_service.requests.get', return_value=response) as get:
+            readme = service.get_repo_readme('hello')
+        return readme, service.get_repo_readme_meta('hello'), get
+
+    def test_range_request_is_truncated_on_a_character_boundary(self):
+        body = ('a' * 2047 + 'é' * 100).encode()
+        readme, meta, get = self._readme(_raw_response(206, body[:2048], {'Content-Range': f'bytes 0-2047/{len(body)}'}))
+
+        headers = get.call_args.kwargs['headers']
+        self.assertEqual(headers['Range'], 'bytes=0-2047')
+        self.assertEqual(headers['Accept'], 'application/vnd.github.raw')
+        self.assertTrue(get.call_args.kwargs['stream'])
+        # The first byte of 'é' is cut off by the range and dropped
+        self.assertEqual(readme, 'a' * 2047)
+        self.assertEqual(meta, {'size': len(body), 'fetched_bytes': 2048, 'truncated': True})
+
+    def test_range_ignored_by_the_server_reads_only_the_limit(self):
+        body = b'x' * 10000
+        readme, meta, _ = self._readme(_raw_response(200, body, {'Content-Length': str(len(body))}))
+        self.assertEqual(readme, 'x' * 2048)
+        self.assertEqual(meta, {'size': 10000, 'fetched_bytes': 2048, 'truncated': True})
+
+    def test_small_readme_is_decoded_leniently(self):
+        readme, meta, _ = self._readme(_raw_response(200, '\ufeffcafé '.encode() + b'caf\xe9'))
+        self.assertEqual(readme, 'café caf\ufffd')
+        self.assertEqual(meta, {'size': 13, 'fetched_bytes': 13, 'truncated': False})
+
+    def test_missing_readme_has_no_meta(self):
+        readme, meta, get = self._readme(_raw_response(404, b''))
+        self.assertEqual(readme, '')
+        self.assertIsNone(meta)
+        self.assertEqual(get.call_count, 1)
+
+
+@override_settings(GITHUB_USE_USER_TOKENS=False)
+class AccountAggregationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # path -> _response arguments; a fresh response is built for every call
+        self.answers = {
+            '/users/octocat/repos': (200, [{'name': 'one', 'pushed_at': '1'}, {'name': 'two', 'pushed_at': '1'}]),
+            '/users/octocat': (200, {'login': 'octocat'}),
+            '/repos/octocat/one/languages': (200, {'Python': 30, 'Shell': 10}),
+            '/repos/octocat/one/topics': (200, {'names': ['django']}),
+            '/repos/octocat/two/languages': (200, {'Python': 60}),
+            '/repos/octocat/two/topics': (200, {'names': ['django', 'api']}),
+        }
+        self.requested = []
+        patcher = mock.patch.object(GitHubService, '_request', side_effect=self._github)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _github(self, url, *args, **kwargs):
+        path = url.split('api.github.com', 1)[1]
+        self.requested.append(path)
+        return _response(*self.answers[path])
+
+    def test_summary_fetches_each_resource_once(self):
+        summary = self.client.get('/api/account/octocat/summary/', {'max_repos': 5}).json()
+
+        self.assertEqual(sorted(self.requested), sorted(self.answers))
+        self.assertEqual(summary['programming_languages']['languages'], {
+            'Python': {'bytes': 90, 'count': 2, 'percentage': 90.0},
+            'Shell': {'bytes': 10, 'count': 1, 'percentage': 10.0},
+        })
+        self.assertEqual(summary['technologies']['technologies'], {
+            'django': {'count': 2, 'percentage': 100.0},
+            'api': {'count': 1, 'percentage': 50.0},
+        })
+        self.assertEqual(summary['repositories_analyzed'], 2)
+
+        # The single pass also fills the per-endpoint caches
+        languages = self.client.get('/api/account/octocat/languages/', {'max_repos': 5}).json()
+        technologies = self.client.get('/api/account/octocat/technologies/', {'max_repos': 5}).json()
+        self.assertEqual(languages, summary['programming_languages'])
+        self.assertEqual(technologies, summary['technologies'])
+        self.assertEqual(len(self.requested), len(self.answers))
+
+    def test_verification_data_warms_the_account_endpoints(self):
+        self.answers.update({'/repos/octocat/one/readme': (404,), '/repos/octocat/two/readme': (404,)})
+        GitHubService('octocat').get_all_github_data(max_repos=5, fields=SkillAnalyzer.GITHUB_FIELDS)
+        self.requested.clear()
+
+        self.client.get('/api/account/octocat/summary/', {'max_repos': 5})
+        self.assertEqual(self.requested, ['/users/octocat'])
+
+
+@override_settings(LOGIN_PREFETCH=True, LOGIN_PREFETCH_COOLDOWN=300, LOGIN_PREFETCH_MAX_PENDING=20)
+class LoginPrefetchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.executor = mock.Mock()
+        for patcher in (mock.patch.object(prewarm, '_login_executor', return_value=self.executor),
+                        mock.patch.object(prewarm, '_login_pending', set())):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_login_starts_a_background_prefetch(self):
+        with mock.patch.object(GitHubService, 'get_user_info', return_value={'id': 1}):
+            response = self.client.post('/api/auth/github/authenticate/', {'github_username': 'octocat'},
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        # Anonymous login: the shared token is used
+        self.executor.submit.assert_called_once_with(prewarm._login_prefetch, 'octocat', None)
+
+    def test_repeated_logins_prefetch_once(self):
+        self.assertTrue(prewarm.schedule_login_prefetch('octocat', oauth=True))
+        self.assertFalse(prewarm.schedule_login_prefetch('octocat', oauth=True))
+        self.executor.submit.assert_called_once_with(prewarm._login_prefetch, 'octocat', 'octocat')
+
+        # Finished: the cooldown still holds back the next one
+        with mock.patch.object(prewarm, 'prewarm_user_in_worker', return_value={}) as warm:
+            prewarm._login_prefetch('octocat', 'octocat')
+        warm.assert_called_once_with('octocat', account_max_repos=[], requester='octocat')
+        self.assertFalse(prewarm.schedule_login_prefetch('octocat'))
+        self.assertEqual(self.executor.submit.call_count, 1)
+
+    @override_settings(LOGIN_PREFETCH_MAX_PENDING=1)
+    def test_full_queue_is_skipped(self):
+        self.assertTrue(prewarm.schedule_login_prefetch('octocat'))
+        self.assertFalse(prewarm.schedule_login_prefetch('hubot'))
+
+    @override_settings(LOGIN_PREFETCH=False)
+    def test_disabled(self):
+        self.assertFalse(prewarm.schedule_login_prefetch('octocat'))
+        self.executor.submit.assert_not_called()
+
+    def test_failed_prefetch_is_only_logged(self):
+        prewarm._login_pending.add('ghost')
+        with mock.patch.object(prewarm, 'prewarm_user_in_worker', side_effect=LookupError('not found')), \
+                self.assertLogs('skill_verifier.prewarm', logging.WARNING):
+            prewarm._login_prefetch('ghost', None)
+        self.assertNotIn('ghost', prewarm._login_pending)
+
+
+@override_settings(GITHUB_USE_USER_TOKENS=False, GITHUB_NEGATIVE_CACHE_TIMEOUTS={'not_found': 7, 'empty': 11})
+class NegativeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.answers = {}
+        self.requested = []
+        patcher = mock.patch.object(GitHubService, '_request', side_effect=self._github)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _github(self, url, *args, **kwargs):
+        path = url.split('api.github.com', 1)[1]
+        self.requested.append(path)
+        return _response(*self.answers[path])
+
+    def test_not_found_is_cached_and_skips_the_next_call(self):
+        self.answers['/users/ghost'] = (404,)
+        hits = metrics.get_counter('skillverify_github_negative_cache_total',
+                                   {'namespace': 'user_info', 'reason': 'not_found', 'op': 'hit'})
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.assertIsNone(GitHubService('ghost').get_user_info())
+        key, marker, timeout = cache_set.call_args.args
+        self.assertIsInstance(marker, Missing)
+        self.assertEqual((marker.reason, marker.status, timeout), ('not_found', 404, 7))
+
+        self.assertIsNone(GitHubService('ghost').get_user_info())
+        self.assertEqual(self.requested, ['/users/ghost'])
+        self.assertEqual(metrics.get_counter('skillverify_github_negative_cache_total',
+                                             {'namespace': 'user_info', 'reason': 'not_found', 'op': 'hit'}), hits + 1)
+
+    def test_empty_repository_is_cached_with_its_own_ttl(self):
+        self.answers['/repos/octocat/new/commits'] = (409,)
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.assertEqual(GitHubService('octocat').get_repo_commits('new'), [])
+        self.assertEqual(cache_set.call_args.args[1].reason, 'empty')
+        self.assertEqual(cache_set.call_args.args[2], 11)
+
+        self.assertEqual(GitHubService('octocat').get_repo_commits('new'), [])
+        self.assertEqual(len(self.requested), 1)
+
+    def test_transient_errors_are_not_cached(self):
+        self.answers['/repos/octocat/hello/languages'] = (503,)
+        service = GitHubService('octocat')
+        self.assertEqual(service.get_repo_languages('hello'), {})
+        self.assertEqual(service.failed_fetches, {'hello'})
+
+        self.answers['/repos/octocat/hello/languages'] = (200, {'Python': 10})
+        self.assertEqual(GitHubService('octocat').get_repo_languages('hello'), {'Python': 10})
+        self.assertEqual(len(self.requested), 2)
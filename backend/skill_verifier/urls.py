@@ -2,24 +2,38 @@
 from django.urls import path
 from .views import (
     VerifySkillsView,
+    BatchVerifySkillsView,
+    GetBatchVerificationView,
     GetVerificationView,
+    VerifyHashView,
+    ListVerificationsView,
     ClearCacheView,
+    GitHubWebhookView,
     GitHubOAuthAuthorizeView,
     GitHubOAuthCallbackView,
     GitHubAuthenticateView,
     GetAccountLanguagesView,
     GetAccountTechnologiesView,
-    GetAccountSummaryView
+    GetAccountSummaryView,
+    BulkAccountSummaryView,
+    SkillSearchView
 )
 
 # basic url patterns for skill_verifier app:
 urlpatterns = [
     path('verify-skills/', VerifySkillsView.as_view(), name='verify_skills'),
+    path('verify-skills/batch/', BatchVerifySkillsView.as_view(), name='verify_skills_batch'),
+    path('verify-skills/batch/<str:batch_id>/', GetBatchVerificationView.as_view(), name='get_batch_verification'),
+    path('verify-hash/<str:hash_value>/', VerifyHashView.as_view(), name='verify_hash'),
+    path('verifications/', ListVerificationsView.as_view(), name='list_verifications'),
     path('verification/<int:verification_id>/', GetVerificationView.as_view(), name='get_verification'),
+    path('skills/search/', SkillSearchView.as_view(), name='skill_search'),
     path('clear-cache/', ClearCacheView.as_view(), name='clear_cache'),
+    path('webhooks/github/', GitHubWebhookView.as_view(), name='github_webhook'),
     path('auth/github/authorize/', GitHubOAuthAuthorizeView.as_view(), name='github_authorize'),
     path('auth/github/callback/', GitHubOAuthCallbackView.as_view(), name='github_callback'),
     path('auth/github/authenticate/', GitHubAuthenticateView.as_view(), name='github_authenticate'),
+    path('account/summaries/', BulkAccountSummaryView.as_view(), name='bulk_account_summary'),
     path('account/<str:username>/languages/', GetAccountLanguagesView.as_view(), name='account_languages'),
     path('account/<str:username>/technologies/', GetAccountTechnologiesView.as_view(), name='account_technologies'),
     path('account/<str:username>/summary/', GetAccountSummaryView.as_view(), name='account_summary'),
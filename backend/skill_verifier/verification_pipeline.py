@@ -0,0 +1,451 @@
+import io
+import logging
+import uuid
+import zipfile
+from datetime import timedelta
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from django.utils import timezone
+
+from . import deadline, metrics
+from .cache_invalidation import key_version
+from .log import log_payload
+from .github_service import GitHubService
+from .resume_parser import ResumeParser
+from .skill_analyzer import SkillAnalyzer
+from .db_writer import run_write
+from .models import BatchItem, SkillVerification
+from .proofs import generate_proof
+from .skill_index import index_verification
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationError(Exception):
+    """Raised when a resume cannot be verified because of bad input"""
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _full_cache_key(github_username, pdf_hash):
+    return f"full_verification_{github_username}_{key_version('full_verification', github_username)}_{pdf_hash}"
+
+
+# Step 1: parse the resume PDF
+def parse_resume(resume_file):
+    """
+    Parse a resume and return its skills, GitHub username and content hash, plus the
+    sections the parser had to fall back on after an LLM error
+    """
+    parser = ResumeParser()
+    resume_data = parser.parse_resume(resume_file)
+    logger.info("Extracted %d skills and GitHub username %s from resume",
+                len(resume_data['skills']), resume_data.get('github_username'))
+    logger.debug("Resume skills: %s", resume_data['skills'])
+    return {
+        'skills': resume_data['skills'],
+        'github_username': resume_data.get('github_username'),
+        'pdf_hash': parser._generate_pdf_hash(resume_file),
+        'fallback': resume_data.get('fallback', []),
+    }
+
+
+def get_cached_verification(github_username, pdf_hash):
+    """Return the cached full response for this username/resume combination, if any"""
+    full_cache_key = _full_cache_key(github_username, pdf_hash)
+    cached_response = metrics.cache_get("full_verification", full_cache_key)
+    if cached_response is not None:
+        logger.info("Cache hit for full verification: %s", full_cache_key)
+    return cached_response
+
+
+def get_stored_verification(github_username, pdf_hash, requester=None):
+    """
+    Return a stored verification of this exact resume for this user when it is fresh enough,
+    so the pipeline doesn't recompute it. Freshness: younger than VERIFICATION_REUSE_MAX_AGE
+    seconds (0 disables reuse) and, when VERIFICATION_REUSE_CHECK_GITHUB_VERSION is set,
+    computed from the same GitHub data version as the user's repos have now.
+    """
+    max_age = getattr(settings, 'VERIFICATION_REUSE_MAX_AGE', 0)
+    if not max_age:
+        return None
+
+    verification = (
+        SkillVerification.objects
+        .filter(
+            github_username=github_username,
+            resume_hash=pdf_hash,
+            created_at__gte=timezone.now() - timedelta(seconds=max_age)
+        )
+        .order_by('-created_at')
+        .first()
+    )
+    if verification is None:
+        return None
+    if verification.verification_result.get('degraded') or verification.verification_result.get('fallback'):
+        return None
+
+    if getattr(settings, 'VERIFICATION_REUSE_CHECK_GITHUB_VERSION', True):
+        current_version = GitHubService(github_username, requester).get_data_version()
+        if verification.github_data_version != current_version:
+            logger.info("Stored verification %s is stale (GitHub data changed)", verification.id)
+            return None
+
+    logger.info("Reusing stored verification %s for %s", verification.id, github_username)
+    response_data = {
+        "github_username": verification.github_username,
+        "resume_skills": verification.resume_skills,
+        "github_skills": verification.github_skills,
+        "verification_result": verification.verification_result,
+        "hash": verification.hash_value,
+        "proof_hash": verification.proof_hash,
+        "merkle_root": verification.merkle_root,
+        "verification_id": verification.id,
+        "degraded": [],
+        "reused": True
+    }
+    cache.set(_full_cache_key(github_username, pdf_hash), response_data, settings.VERIFICATION_CACHE_TIMEOUT)
+    return response_data
+
+
+# Step 2: fetch GitHub data
+def fetch_github_data(github_username, requester=None):
+    """
+    Fetch all GitHub data needed for verification. Short of time for the request deadline,
+    fewer repositories are fetched, without READMEs. Returns the data and the repositories
+    (None for the listing and profile) whose fetch failed transiently.
+    """
+    github_service = GitHubService(github_username, requester)
+    max_repos, fields = 5, SkillAnalyzer.GITHUB_FIELDS
+    if not deadline.has_time(settings.DEADLINE_FULL_GITHUB_SECONDS, deadline.reserve('github_data')):
+        max_repos = settings.DEADLINE_REDUCED_MAX_REPOS
+        fields = tuple(field for field in fields if field != 'readme')
+        deadline.degrade('github_data', f"fetching {max_repos} repositories without READMEs")
+    github_data = github_service.get_all_github_data(max_repos, fields)
+    log_payload(logger, f"GitHub data for user {github_username}", github_data)
+    return github_data, github_service.failed_fetches
+
+
+def store_verification(**fields):
+    """Insert a SkillVerification and its skill index rows in one transaction"""
+    def write():
+        verification = SkillVerification.objects.create(**fields)
+        index_verification(verification)
+        return verification
+
+    with metrics.timed('db_write'):
+        return run_write(write)
+
+
+# Steps 3-6: analyze, verify, hash and store
+def verify_and_store(github_username, resume_file_name, resume_skills, pdf_hash, github_data, batch_id=None,
+                     failed_fetches=(), resume_fallbacks=()):
+    """
+    Run the LLM analysis on prepared inputs, persist the SkillVerification and cache the response.
+    failed_fetches (from fetch_github_data) and resume_fallbacks (from parse_resume) mark the
+    result as incomplete, like the deadline and the analyzer's own fallbacks do.
+    """
+    analyzer = SkillAnalyzer()
+    if getattr(settings, 'LLM_FUSED_VERIFICATION', False):
+        # Steps 3+4 in one LLM round trip (falls back to two calls on malformed output)
+        github_skills, verification_result = analyzer.analyze_and_verify_skills(github_data, resume_skills, failed_fetches)
+        logger.debug("GitHub skills extracted (fused): %s", github_skills)
+    else:
+        # Step 3: Analyze GitHub skills
+        github_skills = analyzer.analyze_github_skills(github_data, failed_fetches)
+        logger.debug("GitHub skills extracted: %s", github_skills)
+
+        # Step 4: Verify skills using LLM for intelligent comparison
+        verification_result = analyzer.verify_skills_with_llm(resume_skills, github_skills, github_username)
+    log_payload(logger, "LLM verification result", verification_result)
+
+    # Step 4b: Calculate professional strength metrics and enhance results
+    verification_result = analyzer.calculate_strength_metrics(
+        verification_result,
+        len(resume_skills)
+    )
+    logger.info("Verified %s%% of resume skills for %s (average strength %s/10, experience level %s%%)",
+                verification_result.get('verification_percentage'), github_username,
+                verification_result.get('average_strength'), verification_result.get('experience_level'))
+
+    # Sections computed in reduced form to meet the request deadline; kept with the
+    # stored result so it is never reused or cached as a complete verification
+    degraded = deadline.degraded()
+    if failed_fetches and 'github_data' not in degraded:
+        # GitHub answered some calls with errors; those repositories are missing or partial
+        logger.info("Degraded github_data: %d GitHub fetches failed for %s", len(failed_fetches), github_username)
+        degraded.append('github_data')
+    if degraded:
+        verification_result['degraded'] = degraded
+    # Same for sections answered by a local fallback after an LLM error
+    fallbacks = list(resume_fallbacks) + analyzer.fallbacks
+    if fallbacks:
+        verification_result['fallback'] = fallbacks
+
+    # Step 5: Generate verification hash based on the verification result
+    # Pass the full verification_result dict; the generator will extract the
+    # 'verified_skills' list internally. Previously we passed the list which
+    # caused a "'list' object has no attribute 'get'" error.
+    hash_value = analyzer.generate_verification_hash(
+        github_username,
+        verification_result
+    )
+    # Per-verification proof hash: salted Merkle root over the verified skills
+    proof_salt, merkle_root, proof_hash = generate_proof(github_username, verification_result)
+
+    # Step 6: Save results to database
+    verification = store_verification(
+        github_username=github_username,
+        resume_file_name=resume_file_name,
+        resume_skills=resume_skills,
+        github_skills=github_skills,
+        verification_result=verification_result,
+        hash_value=hash_value,
+        proof_hash=proof_hash,
+        proof_salt=proof_salt,
+        merkle_root=merkle_root,
+        batch_id=batch_id,
+        resume_hash=pdf_hash,
+        github_data_version=github_data.get('version', '')
+    )
+
+    # Prepare response
+    response_data = {
+        "github_username": github_username,
+        "resume_skills": resume_skills,
+        "github_skills": github_skills,
+        "verification_result": verification_result,
+        "hash": hash_value,
+        "proof_hash": proof_hash,
+        "merkle_root": merkle_root,
+        "verification_id": verification.id,
+        "degraded": degraded
+    }
+
+    # Cache the full response
+    if not degraded and not fallbacks:
+        cache.set(_full_cache_key(github_username, pdf_hash), response_data, settings.VERIFICATION_CACHE_TIMEOUT)
+    return response_data
+
+
+def verify_resume(resume_file, github_username=None, requester=None):
+    """
+    Run the full verification pipeline for a single uploaded resume. GitHub calls use
+    the requester's own token when one is given (see GitHubService).
+    """
+    resume_data = parse_resume(resume_file)
+
+    # Prefer the GitHub username found in the resume, then the one provided in the request
+    github_username = resume_data['github_username'] or github_username
+    if not github_username:
+        raise VerificationError("GitHub username not found in resume and not provided in request")
+
+    # Check if we already have a cached full response for this combination
+    cached_response = get_cached_verification(github_username, resume_data['pdf_hash'])
+    if cached_response is not None:
+        return cached_response
+
+    # Then for a fresh-enough stored result of the same resume
+    stored_response = get_stored_verification(github_username, resume_data['pdf_hash'], requester)
+    if stored_response is not None:
+        return stored_response
+
+    github_data, failed_fetches = fetch_github_data(github_username, requester)
+    return verify_and_store(
+        github_username,
+        resume_file.name,
+        resume_data['skills'],
+        resume_data['pdf_hash'],
+        github_data,
+        failed_fetches=failed_fetches,
+        resume_fallbacks=resume_data['fallback']
+    )
+
+
+def collect_batch_files(files, zip_file=None):
+    """
+    Flatten uploaded PDFs and the PDFs inside an optional zip archive
+    into a single list of file objects. The archive's entry count and total
+    uncompressed size are checked against BATCH_MAX_ITEMS and BATCH_MAX_ZIP_BYTES
+    before anything is extracted.
+    """
+    resume_files = list(files)
+    max_items = getattr(settings, 'BATCH_MAX_ITEMS', 200)
+    if len(resume_files) > max_items:
+        raise VerificationError(f"A batch may contain at most {max_items} resumes")
+    if zip_file is not None:
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(zip_file.read()))
+        except zipfile.BadZipFile:
+            raise VerificationError("resume_zip is not a valid zip archive")
+        entries = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith('.pdf')
+        ]
+        if len(resume_files) + len(entries) > max_items:
+            raise VerificationError(f"A batch may contain at most {max_items} resumes")
+        # Reads stop at each entry's declared size, so the headers bound the memory used
+        max_bytes = getattr(settings, 'BATCH_MAX_ZIP_BYTES', 100 * 1024 * 1024)
+        if sum(info.file_size for info in entries) > max_bytes:
+            raise VerificationError(f"resume_zip may contain at most {max_bytes} bytes of PDFs", status_code=413)
+        for info in entries:
+            name = info.filename.rsplit('/', 1)[-1]
+            resume_files.append(ContentFile(archive.read(info), name=name))
+    return resume_files
+
+
+def _run_in_worker(func, *args):
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def _submit(pool, func, *args):
+    """
+    Submit func to a worker pool, carrying over the caller's context (request id, timings)
+    and releasing the worker's DB connection afterwards.
+    """
+    return pool.submit(copy_context().run, _run_in_worker, func, *args)
+
+
+class BatchVerification:
+    """
+    Verify many resumes at once. Identical PDFs (by content hash) are parsed once,
+    each GitHub user is fetched once, and the GitHub and LLM stages run in separate
+    bounded thread pools. Results are yielded per item as they complete.
+    """
+
+    def __init__(self, resume_files, github_usernames=None, batch_id=None, requester=None):
+        self.resume_files = resume_files
+        self.github_usernames = list(github_usernames or [])
+        self.batch_id = batch_id or uuid.uuid4().hex
+        self.requester = requester
+        self.github_workers = getattr(settings, 'BATCH_GITHUB_CONCURRENCY', 4)
+        self.llm_workers = getattr(settings, 'BATCH_LLM_CONCURRENCY', 4)
+
+    def _username_override(self, index):
+        if index < len(self.github_usernames):
+            return self.github_usernames[index] or None
+        return None
+
+    def _item_error(self, index, message):
+        return {
+            "index": index,
+            "resume_file_name": self.resume_files[index].name,
+            "error": message
+        }
+
+    def run(self):
+        """
+        Generator yielding one result dict per uploaded resume, in completion order.
+        Each item is recorded as a BatchItem as it is yielded, so the batch listing
+        covers every submitted resume, including cache hits, duplicates and errors.
+        """
+        for item in self._run():
+            self._record(item)
+            yield item
+
+    def _record(self, item):
+        def write():
+            BatchItem.objects.create(
+                batch_id=self.batch_id,
+                index=item['index'],
+                resume_file_name=item['resume_file_name'],
+                verification_id=item.get('verification_id'),
+                error=item.get('error', '')
+            )
+        run_write(write)
+
+    def _run(self):
+        parser = ResumeParser()
+
+        # Dedupe identical PDFs by content hash
+        items_by_hash = {}
+        for index, resume_file in enumerate(self.resume_files):
+            items_by_hash.setdefault(parser._generate_pdf_hash(resume_file), []).append(index)
+
+        with ThreadPoolExecutor(max_workers=self.github_workers) as github_pool, \
+                ThreadPoolExecutor(max_workers=self.llm_workers) as llm_pool:
+            # Stage 1: parse each unique resume (LLM-bound)
+            parse_futures = {
+                _submit(llm_pool, parse_resume, self.resume_files[indexes[0]]): pdf_hash
+                for pdf_hash, indexes in items_by_hash.items()
+            }
+            parsed = {}
+            for future in as_completed(parse_futures):
+                pdf_hash = parse_futures[future]
+                try:
+                    parsed[pdf_hash] = future.result()
+                except Exception as e:
+                    for index in items_by_hash[pdf_hash]:
+                        yield self._item_error(index, str(e))
+
+            # Group items by (username, pdf_hash); answer cache hits immediately
+            items_by_key = {}
+            for pdf_hash, resume_data in parsed.items():
+                for index in items_by_hash[pdf_hash]:
+                    github_username = resume_data['github_username'] or self._username_override(index)
+                    if not github_username:
+                        yield self._item_error(index, "GitHub username not found in resume and not provided in request")
+                        continue
+                    items_by_key.setdefault((github_username, pdf_hash), []).append(index)
+
+            pending_keys = {}
+            for key, indexes in items_by_key.items():
+                cached_response = get_cached_verification(*key) or get_stored_verification(*key, self.requester)
+                if cached_response is not None:
+                    for index in indexes:
+                        yield {"index": index, "resume_file_name": self.resume_files[index].name, **cached_response}
+                else:
+                    pending_keys.setdefault(key[0], []).append(key)
+
+            # Stage 2: fetch each GitHub user once (GitHub-bound)
+            github_futures = {
+                _submit(github_pool, fetch_github_data, github_username, self.requester): github_username
+                for github_username in pending_keys
+            }
+
+            # Stage 3: verify and store each unique (username, resume) as its GitHub data arrives
+            verify_futures = {}
+            for future in as_completed(github_futures):
+                github_username = github_futures[future]
+                try:
+                    github_data, failed_fetches = future.result()
+                except Exception as e:
+                    for key in pending_keys[github_username]:
+                        for index in items_by_key[key]:
+                            yield self._item_error(index, str(e))
+                    continue
+                for key in pending_keys[github_username]:
+                    pdf_hash = key[1]
+                    first_index = items_by_key[key][0]
+                    verify_futures[_submit(
+                        llm_pool,
+                        verify_and_store,
+                        github_username,
+                        self.resume_files[first_index].name,
+                        parsed[pdf_hash]['skills'],
+                        pdf_hash,
+                        github_data,
+                        self.batch_id,
+                        failed_fetches,
+                        parsed[pdf_hash]['fallback']
+                    )] = key
+
+            for future in as_completed(verify_futures):
+                key = verify_futures[future]
+                try:
+                    response_data = future.result()
+                except Exception as e:
+                    for index in items_by_key[key]:
+                        yield self._item_error(index, str(e))
+                    continue
+                for index in items_by_key[key]:
+                    yield {"index": index, "resume_file_name": self.resume_files[index].name, **response_data}
@@ -2,18 +2,47 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
+import base64
+import binascii
 import json
 import hashlib
-from django.core.cache import cache
-from django.http import JsonResponse
+from contextlib import ExitStack
+from datetime import datetime, time, timezone as dt_timezone
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date, quote_etag
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 
-from .github_service import GitHubService
-from .resume_parser import ResumeParser
-from .skill_analyzer import SkillAnalyzer
-from .models import SkillVerification
-from .github_oauth import GitHubOAuthHandler
+from . import metrics
+
+from .github_service import GitHubService, get_bulk_account_summaries
+from .models import BatchItem, SkillVerification, VerificationSkill
+from .proofs import skill_proof, verified_skill_names
+from .skill_index import canonical_skill_name
+from .admission import AdmissionRejected, ApiKeyRateThrottle, ClientRateThrottle, HeldStream, bulkhead
+from .cache_invalidation import invalidate_all, invalidate_family, invalidate_namespaces, invalidate_repo, invalidate_user
+from .deadline import request_deadline
+from .github_oauth import GitHubOAuthHandler, oauth_username
+from .github_tokens import store_user_token
+from .github_webhooks import handle_event, valid_signature
+from .prewarm import schedule_login_prefetch
+from .verification_pipeline import (
+    BatchVerification,
+    VerificationError,
+    collect_batch_files,
+    verify_resume
+)
 
 class VerifySkillsView(APIView):
+    """
+    Verify one resume. Admission control keeps bursts of these expensive requests from
+    starving the cheap endpoints: per-client and per-key token buckets (429), then the
+    'verify' bulkhead with its bounded wait queue (503), both with Retry-After.
+    """
+    throttle_classes = [ClientRateThrottle, ApiKeyRateThrottle]
+
     def post(self, request):
         # Check if resume file is provided
         if 'resume_pdf' not in request.FILES:
@@ -22,123 +51,387 @@ class VerifySkillsView(APIView):
         resume_file = request.FILES['resume_pdf']
         
         try:
-            # Step 1: Parse resume PDF to extract skills and GitHub username
-            parser = ResumeParser()
-            resume_data = parser.parse_resume(resume_file)
-            resume_skills = resume_data['skills']
-            print(f"\n[Resume Parser] Extracted skills from resume: {resume_skills}")
-            
-            # Extract GitHub username from resume
-            github_username = resume_data.get('github_username')
-            print(f"[Resume Parser] Extracted GitHub username: {github_username}")
-            
-            # If GitHub username is not found in resume, check if it's provided in the request
-            if not github_username:
-                github_username = request.data.get('github_username')
-            
-            # If still no GitHub username, return error
-            if not github_username:
-                return Response({"error": "GitHub username not found in resume and not provided in request"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Check if we already have a cached full response for this combination
-            pdf_hash = parser._generate_pdf_hash(resume_file)
-            full_cache_key = f"full_verification_{github_username}_{pdf_hash}"
-            cached_response = cache.get(full_cache_key)
-            
-            if cached_response is not None:
-                print(f"Cache hit for full verification: {full_cache_key}")
-                return Response(cached_response, status=status.HTTP_200_OK)
-            
-            # Step 2: Get GitHub data
-            github_service = GitHubService(github_username)
-            github_data = github_service.get_all_github_data()
-            print(f"\n{'='*60}")
-            print(f"GITHUB DATA FOR USER: {github_username}")
-            print(f"{'='*60}")
-            print(f"GitHub Data: {json.dumps(github_data, indent=2, default=str)}")
-            print(f"{'='*60}\n")
-            
-            # Step 3: Analyze GitHub skills
-            analyzer = SkillAnalyzer()
-            github_skills = analyzer.analyze_github_skills(github_data)
-            print(f"\nGitHub Skills Extracted: {github_skills}\n")
-            
-            # Step 4: Verify skills using LLM for intelligent comparison
-            verification_result = analyzer.verify_skills_with_llm(resume_skills, github_skills)
-            print(f"\n[Skill Analyzer] LLM Verification Result:")
-            print(f"Verified Skills: {json.dumps(verification_result.get('verified_skills', []), indent=2)}")
-            print(f"Unverified Skills: {verification_result.get('unverified_skills', [])}")
-            print(f"Additional Skills: {verification_result.get('additional_skills', [])}")
-            print(f"Verification Percentage: {verification_result.get('verification_percentage')}%\n")
-            
-            # Step 4b: Calculate professional strength metrics and enhance results
-            verification_result = analyzer.calculate_strength_metrics(
-                verification_result,
-                len(resume_skills)
+            # Time spent queued for a slot counts against the deadline
+            with request_deadline(settings.VERIFY_DEADLINE), bulkhead('verify').admit():
+                response_data = verify_resume(resume_file, request.data.get('github_username'), oauth_username(request))
+            return Response(response_data, status=status.HTTP_200_OK)
+        except AdmissionRejected as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(e.retry_after)}
             )
-            print(f"[Skill Analyzer] Enhanced with strength metrics:")
-            print(f"Strength per Skill: {json.dumps(verification_result.get('strength_per_skill', {}), indent=2)}")
-            print(f"Average Strength: {verification_result.get('average_strength')}/10")
-            print(f"Experience Level: {verification_result.get('experience_level')}%\n")
-            
-            # Step 5: Generate verification hash based on the verification result
-            # Pass the full verification_result dict; the generator will extract the
-            # 'verified_skills' list internally. Previously we passed the list which
-            # caused a "'list' object has no attribute 'get'" error.
-            hash_value = analyzer.generate_verification_hash(
-                github_username,
-                verification_result
+        except VerificationError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BatchVerifySkillsView(APIView):
+    """
+    Verify many resumes (multiple PDFs and/or a zip archive) in one request. Admitted
+    like VerifySkillsView: the same token buckets (429), then the 'batch' bulkhead (503),
+    held until a streamed response is finished.
+    """
+    throttle_classes = [ClientRateThrottle, ApiKeyRateThrottle]
+
+    def post(self, request):
+        try:
+            resume_files = collect_batch_files(
+                request.FILES.getlist('resume_pdfs'),
+                request.FILES.get('resume_zip')
             )
-            
-            # Step 6: Save results to database
-            verification = SkillVerification.objects.create(
-                github_username=github_username,
-                resume_file_name=resume_file.name,
-                resume_skills=resume_skills,
-                github_skills=github_skills,
-                verification_result=verification_result,
-                hash_value=hash_value
+        except VerificationError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+
+        if not resume_files:
+            return Response({"error": "At least one resume PDF (resume_pdfs) or a zip archive (resume_zip) is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Optional usernames, matched to resumes by position
+        if hasattr(request.data, 'getlist'):
+            github_usernames = request.data.getlist('github_usernames')
+        else:
+            github_usernames = request.data.get('github_usernames', [])
+
+        batch = BatchVerification(resume_files, github_usernames, requester=oauth_username(request))
+
+        slot = ExitStack()
+        try:
+            slot.enter_context(bulkhead('batch').admit())
+        except AdmissionRejected as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(e.retry_after)}
             )
-            
-            # Prepare response
-            response_data = {
-                "github_username": github_username,
-                "resume_skills": resume_skills,
-                "github_skills": github_skills,
-                "verification_result": verification_result,
-                "hash": hash_value,
-                "verification_id": verification.id
-            }
-            
-            # Cache the full response
-            cache.set(full_cache_key, response_data, settings.VERIFICATION_CACHE_TIMEOUT)
-            
-            # Return results
-            return Response(response_data, status=status.HTTP_200_OK)
-            
+
+        if request.query_params.get('stream', '').lower() in ('true', '1', 'yes'):
+            # Stream one JSON document per line as each item finishes
+            response = StreamingHttpResponse(
+                HeldStream((json.dumps(item, default=str) + "\n" for item in batch.run()), slot),
+                content_type='application/x-ndjson'
+            )
+            response['X-Batch-Id'] = batch.batch_id
+            return response
+
+        try:
+            with slot:
+                results = sorted(batch.run(), key=lambda item: item['index'])
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        return Response({
+            "batch_id": batch.batch_id,
+            "total": len(results),
+            "failed": sum(1 for item in results if 'error' in item),
+            "results": results
+        }, status=status.HTTP_200_OK)
+
+
+class GetBatchVerificationView(APIView):
+    """List every item of a batch with its stored verification (or error)"""
+    def get(self, request, batch_id):
+        items = BatchItem.objects.filter(batch_id=batch_id).select_related('verification').order_by('index')
+        results = []
+        for item in items:
+            result = {"index": item.index, "resume_file_name": item.resume_file_name}
+            verification = item.verification
+            if verification is not None:
+                result.update({
+                    "verification_id": verification.id,
+                    "github_username": verification.github_username,
+                    "verification_percentage": verification.verification_result.get('verification_percentage'),
+                    "hash": verification.hash_value,
+                    "created_at": verification.created_at
+                })
+            else:
+                result["error"] = item.error or "Verification no longer exists"
+            results.append(result)
+
+        if not results:
+            return Response({"error": "Batch not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "batch_id": batch_id,
+            "total": len(results),
+            "failed": sum(1 for result in results if 'error' in result),
+            "results": results
+        }, status=status.HTTP_200_OK)
+
+def metrics_view(request):
+    """Expose pipeline timings, cache and upstream counters in the Prometheus text format"""
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# API field name -> model field, used for fields= projection
+VERIFICATION_FIELDS = {
+    'verification_id': 'id',
+    'github_username': 'github_username',
+    'resume_file_name': 'resume_file_name',
+    'resume_skills': 'resume_skills',
+    'github_skills': 'github_skills',
+    'verification_result': 'verification_result',
+    'hash': 'hash_value',
+    'proof_hash': 'proof_hash',
+    'merkle_root': 'merkle_root',
+    'batch_id': 'batch_id',
+    'created_at': 'created_at',
+    # Read from inside the JSON column by the database, without loading the blob
+    'verification_percentage': None,
+}
+DETAIL_FIELDS = ['github_username', 'resume_skills', 'github_skills', 'verification_result', 'hash', 'proof_hash', 'created_at']
+LIST_FIELDS = ['verification_id', 'github_username', 'resume_file_name', 'hash', 'verification_percentage', 'created_at']
+
+
+def _parse_fields(request, default):
+    """Return the requested fields= projection, or raise ValueError naming the unknown fields"""
+    value = request.query_params.get('fields')
+    if not value:
+        return list(default)
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in VERIFICATION_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(VERIFICATION_FIELDS)}")
+    return fields
+
+
+def _project(queryset, fields):
+    """Load only the columns needed for the requested fields"""
+    queryset = queryset.only(*{'id'} | {VERIFICATION_FIELDS[field] for field in fields if VERIFICATION_FIELDS[field]})
+    if 'verification_percentage' in fields:
+        queryset = queryset.annotate(verification_percentage=F('verification_result__verification_percentage'))
+    return queryset
+
+
+def _serialize_verification(verification, fields):
+    data = {}
+    for field in fields:
+        model_field = VERIFICATION_FIELDS[field]
+        data[field] = getattr(verification, model_field or field)
+    return data
+
+
+def _encode_cursor(created_at, verification_id):
+    raw = json.dumps([created_at.isoformat(), verification_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, verification_id = json.loads(raw)
+        parsed = parse_datetime(created_at)
+        if parsed is None:
+            raise ValueError
+        return parsed, int(verification_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+
+def _parse_date_param(value, end_of_day=False):
+    """Accept an ISO datetime or a plain date"""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
 class GetVerificationView(APIView):
     def get(self, request, verification_id):
         try:
-            verification = SkillVerification.objects.get(id=verification_id)
-            return Response({
-                "github_username": verification.github_username,
-                "resume_skills": verification.resume_skills,
-                "github_skills": verification.github_skills,
-                "verification_result": verification.verification_result,
-                "hash": verification.hash_value,
-                "created_at": verification.created_at
-            }, status=status.HTTP_200_OK)
-        except SkillVerification.DoesNotExist:
+            fields = _parse_fields(request, DETAIL_FIELDS)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Stored verifications never change, so validators come from two small columns
+        # and a conditional GET is answered without loading or decoding the JSON blobs
+        validators = (
+            SkillVerification.objects
+            .filter(id=verification_id)
+            .values_list('hash_value', 'created_at')
+            .first()
+        )
+        if validators is None:
             return Response({"error": "Verification not found"}, status=status.HTTP_404_NOT_FOUND)
 
-# Add a new view to clear the cache for testing purposes
+        hash_value, created_at = validators
+        etag = hash_value
+        if request.query_params.get('fields'):
+            etag += '.' + hashlib.md5(",".join(fields).encode()).hexdigest()[:8]
+        etag = quote_etag(etag)
+        last_modified = int(created_at.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            verification = _project(SkillVerification.objects.all(), fields).get(id=verification_id)
+            response = Response(_serialize_verification(verification, fields), status=status.HTTP_200_OK)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = f"public, max-age={settings.VERIFICATION_HTTP_MAX_AGE}, immutable"
+        return response
+
+
+class VerifyHashView(APIView):
+    """
+    Check a verification hash with one indexed lookup. Accepts a proof hash (unique)
+    or a legacy report hash. With ?skill=<name>, also returns a Merkle inclusion proof
+    for that skill so a third party can check it without the full report.
+    """
+    def get(self, request, hash_value):
+        skill = request.query_params.get('skill', '').strip()
+        columns = ['id', 'github_username', 'hash_value', 'proof_hash', 'merkle_root', 'created_at']
+        if skill:
+            columns += ['proof_salt', 'verification_result']
+
+        verification = SkillVerification.objects.filter(proof_hash=hash_value).values(*columns).first()
+        if verification is None:
+            verification = (
+                SkillVerification.objects
+                .filter(hash_value=hash_value)
+                .order_by('-created_at')
+                .values(*columns)
+                .first()
+            )
+        if verification is None:
+            return Response({"valid": False, "error": "Unknown verification hash"}, status=status.HTTP_404_NOT_FOUND)
+
+        response_data = {
+            "valid": True,
+            "verification_id": verification['id'],
+            "github_username": verification['github_username'],
+            "hash": verification['hash_value'],
+            "proof_hash": verification['proof_hash'],
+            "merkle_root": verification['merkle_root'],
+            "created_at": verification['created_at']
+        }
+        if skill:
+            proof = None
+            if verification['proof_hash']:
+                proof = skill_proof(
+                    verification['proof_salt'],
+                    verified_skill_names(verification['verification_result']),
+                    skill
+                )
+            response_data["skill_verified"] = proof is not None
+            response_data["skill_proof"] = proof
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class ListVerificationsView(APIView):
+    """
+    List stored verifications, newest first, with keyset pagination on (created_at, id).
+    Pass the returned next_cursor as ?cursor= to fetch the following page.
+    """
+    def get(self, request):
+        try:
+            fields = _parse_fields(request, LIST_FIELDS)
+            limit = min(200, max(1, int(request.query_params.get('limit', 50))))
+
+            verifications = SkillVerification.objects.all()
+            github_username = request.query_params.get('github_username')
+            if github_username:
+                verifications = verifications.filter(github_username=github_username)
+            if request.query_params.get('created_after'):
+                verifications = verifications.filter(created_at__gte=_parse_date_param(request.query_params['created_after']))
+            if request.query_params.get('created_before'):
+                verifications = verifications.filter(created_at__lte=_parse_date_param(request.query_params['created_before'], end_of_day=True))
+
+            cursor = request.query_params.get('cursor')
+            if cursor:
+                cursor_created_at, cursor_id = _decode_cursor(cursor)
+                verifications = verifications.filter(
+                    Q(created_at__lt=cursor_created_at) | Q(created_at=cursor_created_at, id__lt=cursor_id)
+                )
+        except (ValueError, TypeError) as e:
+            return Response({"error": str(e) or "Invalid query parameters"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # created_at is always loaded because the cursor is built from it
+        page = list(
+            _project(verifications, fields + ['created_at'])
+            .order_by('-created_at', '-id')[:limit + 1]
+        )
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = _encode_cursor(page[-1].created_at, page[-1].id)
+
+        return Response({
+            "results": [_serialize_verification(verification, fields) for verification in page],
+            "next_cursor": next_cursor
+        }, status=status.HTTP_200_OK)
+
 class ClearCacheView(APIView):
+    """
+    Invalidate cached data. JSON body (all optional): username, repo (needs username),
+    family (one of CACHE_FAMILIES) and namespaces (list). Without any of them every
+    family is invalidated. Entries are versioned out rather than deleted, so other
+    users' data stays cached.
+    """
     def post(self, request):
-        cache.clear()
-        return Response({"message": "Cache cleared successfully"}, status=status.HTTP_200_OK)
+        username = request.data.get('username')
+        repo = request.data.get('repo')
+        family = request.data.get('family')
+        namespaces = request.data.get('namespaces') or []
+        if repo and not username:
+            return Response({"error": "repo requires username"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(namespaces, list):
+            return Response({"error": "namespaces must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            invalidated = []
+            if family:
+                invalidate_family(family)
+                invalidated.append(f"family:{family}")
+            if namespaces:
+                invalidate_namespaces(*namespaces)
+                invalidated.extend(f"namespace:{namespace}" for namespace in namespaces)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if repo:
+            invalidate_repo(username, repo)
+            invalidated.append(f"repo:{username}/{repo}")
+        elif username:
+            invalidate_user(username)
+            invalidated.append(f"user:{username}")
+        if not invalidated:
+            invalidate_all()
+            invalidated.append("all")
+
+        return Response({"message": "Cache invalidated", "invalidated": invalidated}, status=status.HTTP_200_OK)
+
+
+class GitHubWebhookView(APIView):
+    """
+    GitHub push and repository webhooks, signed with GITHUB_WEBHOOK_SECRET: invalidates
+    the changed repository's entries and the owner's account aggregates.
+    """
+    authentication_classes = []
+
+    def post(self, request):
+        if not getattr(settings, 'GITHUB_WEBHOOK_SECRET', ''):
+            return Response({"error": "Webhooks are not configured"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        # Signed over the exact bytes GitHub sent, so read the raw body before parsing
+        body = request.body
+        if not valid_signature(body, request.headers.get('X-Hub-Signature-256')):
+            metrics.inc('skillverify_github_webhooks_total', {'event': 'unknown', 'result': 'bad_signature'})
+            return Response({"error": "Invalid signature"}, status=status.HTTP_403_FORBIDDEN)
+
+        event = request.headers.get('X-GitHub-Event', '')
+        if event == 'ping':
+            return Response({"message": "pong"}, status=status.HTTP_200_OK)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return Response({"error": "Invalid JSON payload"}, status=status.HTTP_400_BAD_REQUEST)
+
+        invalidated = handle_event(event, payload)
+        return Response({"event": event, "invalidated": invalidated}, status=status.HTTP_200_OK)
 
 
 class GitHubOAuthAuthorizeView(APIView):
@@ -186,13 +479,19 @@ class GitHubOAuthCallbackView(APIView):
                 }, status=400)
             
             # Generate JWT token
-            jwt_token = oauth_handler.generate_jwt_token(user_info)
+            jwt_token = oauth_handler.generate_jwt_token(user_info, oauth=True)
             if not jwt_token:
                 return JsonResponse({
                     "error": "Failed to generate token",
                     "code": None
                 }, status=500)
             
+            # GitHub calls about this user can now use their own quota
+            store_user_token(user_info.get('github_username'), access_token, user_info.get('github_id'))
+
+            # The upload page comes next: start warming the user's GitHub data now
+            schedule_login_prefetch(user_info.get('github_username'), oauth=True)
+
             # Store token and user data in session, then redirect to upload page
             from django.http import HttpResponseRedirect
             
@@ -224,10 +523,13 @@ class GitHubOAuthCallbackView(APIView):
                 return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
             
             # Generate JWT token
-            jwt_token = oauth_handler.generate_jwt_token(user_info)
+            jwt_token = oauth_handler.generate_jwt_token(user_info, oauth=True)
             if not jwt_token:
                 return Response({"error": "Failed to generate token"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
+            store_user_token(user_info.get('github_username'), access_token, user_info.get('github_id'))
+            schedule_login_prefetch(user_info.get('github_username'), oauth=True)
+
             # Return user info and token
             return Response({
                 "token": jwt_token,
@@ -267,6 +569,8 @@ class GitHubAuthenticateView(APIView):
             oauth_handler = GitHubOAuthHandler()
             jwt_token = oauth_handler.generate_jwt_token(user_info)
             
+            schedule_login_prefetch(github_username)
+
             return Response({
                 "token": jwt_token,
                 "user": user_info
@@ -286,7 +590,7 @@ class GetAccountLanguagesView(APIView):
             except (ValueError, TypeError):
                 max_repos = 5
             
-            github_service = GitHubService(username)
+            github_service = GitHubService(username, oauth_username(request))
             languages = github_service.get_account_programming_languages(max_repos)
             
             return Response(languages, status=status.HTTP_200_OK)
@@ -305,7 +609,7 @@ class GetAccountTechnologiesView(APIView):
             except (ValueError, TypeError):
                 max_repos = 20
             
-            github_service = GitHubService(username)
+            github_service = GitHubService(username, oauth_username(request))
             technologies = github_service.get_account_technologies(max_repos)
             
             return Response(technologies, status=status.HTTP_200_OK)
@@ -324,10 +628,121 @@ class GetAccountSummaryView(APIView):
             except (ValueError, TypeError):
                 max_repos = 20
             
-            github_service = GitHubService(username)
+            github_service = GitHubService(username, oauth_username(request))
             summary = github_service.get_account_summary(max_repos)
             
             return Response(summary, status=status.HTTP_200_OK)
         
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkAccountSummaryView(APIView):
+    """
+    Get account summaries for many GitHub users in one request. Unknown users are
+    listed in not_found; users GitHub could not answer for right now are in errors.
+    """
+    def post(self, request):
+        usernames = request.data.get('usernames')
+        if not isinstance(usernames, list) or not usernames:
+            return Response({"error": "usernames must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Drop duplicates while keeping the caller's order
+        usernames = list(dict.fromkeys(str(username).strip() for username in usernames if str(username).strip()))
+        max_usernames = getattr(settings, 'BULK_SUMMARY_MAX_USERNAMES', 50)
+        if len(usernames) > max_usernames:
+            return Response({"error": f"At most {max_usernames} usernames are allowed per request"}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_repos = request.data.get('max_repos', 20)
+        try:
+            max_repos = int(max_repos)
+        except (ValueError, TypeError):
+            max_repos = 20
+
+        try:
+            summaries, not_found, errors = get_bulk_account_summaries(usernames, max_repos, oauth_username(request))
+            return Response({
+                "summaries": summaries,
+                "not_found": not_found,
+                "errors": errors,
+                "requested": len(usernames),
+                "succeeded": len(summaries)
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class SkillSearchView(APIView):
+    """Find verifications by skill using the normalized skill index"""
+    def get(self, request):
+        skills = []
+        for value in request.query_params.getlist('skill'):
+            skills.extend(name for name in value.split(',') if name.strip())
+        canonical_names = list(dict.fromkeys(canonical_skill_name(name) for name in skills))
+        if not canonical_names:
+            return Response({"error": "At least one skill parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        skill_status = request.query_params.get('status', VerificationSkill.VERIFIED)
+        valid_statuses = [choice for choice, _ in VerificationSkill.STATUS_CHOICES]
+        if skill_status != 'any' and skill_status not in valid_statuses:
+            return Response({"error": f"status must be one of {valid_statuses + ['any']}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            min_strength = int(request.query_params.get('min_strength', 0))
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(100, max(1, int(request.query_params.get('page_size', 20))))
+        except (ValueError, TypeError):
+            return Response({"error": "min_strength, page and page_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # One indexed subquery per requested skill; a verification must match all of them
+        verifications = SkillVerification.objects.all()
+        for name in canonical_names:
+            entries = VerificationSkill.objects.filter(skill__name=name)
+            if skill_status != 'any':
+                entries = entries.filter(status=skill_status)
+            if min_strength:
+                entries = entries.filter(strength__gte=min_strength)
+            verifications = verifications.filter(id__in=entries.values('verification_id'))
+
+        github_username = request.query_params.get('github_username')
+        if github_username:
+            verifications = verifications.filter(github_username=github_username)
+
+        offset = (page - 1) * page_size
+        rows = list(
+            verifications
+            .order_by('-created_at', '-id')
+            .values('id', 'github_username', 'resume_file_name', 'hash_value', 'created_at')
+            [offset:offset + page_size + 1]
+        )
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        matched = {}
+        for entry in (
+            VerificationSkill.objects
+            .filter(verification_id__in=[row['id'] for row in rows], skill__name__in=canonical_names)
+            .values('verification_id', 'skill__display_name', 'status', 'strength')
+        ):
+            matched.setdefault(entry['verification_id'], []).append({
+                "skill": entry['skill__display_name'],
+                "status": entry['status'],
+                "strength": entry['strength']
+            })
+
+        return Response({
+            "skills": canonical_names,
+            "status": skill_status,
+            "page": page,
+            "page_size": page_size,
+            "has_next": has_next,
+            "results": [{
+                "verification_id": row['id'],
+                "github_username": row['github_username'],
+                "resume_file_name": row['resume_file_name'],
+                "hash": row['hash_value'],
+                "created_at": row['created_at'],
+                "matched_skills": matched.get(row['id'], [])
+            } for row in rows]
+        }, status=status.HTTP_200_OK)